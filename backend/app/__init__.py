@@ -2,7 +2,10 @@ from flask import Flask
 from flask_cors import CORS
 from flasgger import Swagger
 
+from .utils.json_provider import FastJSONProvider
+
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 CORS(app, resources={
     r"/*": {
         "origins": [
@@ -21,6 +24,8 @@ CORS(app, resources={
 
 app.config['SWAGGER'] = {
     'title': 'Loan Stats API',
+    'description': 'Responses are JSON. Missing and non-finite numbers (NaN, Infinity) are written as null; '
+                   'with JSON_NAN=raise such responses fail with 400 instead.',
     'uiversion': 3
 }
 swagger = Swagger(app)
@@ -36,3 +41,7 @@ app.register_blueprint(DataBlueprint)
 app.register_blueprint(StatsBlueprint)
 app.register_blueprint(ChartsBlueprint)
 app.register_blueprint(ChernoffBlueprint)
+
+from .controllers.FilesController import FilesControllerInstance
+
+FilesControllerInstance.start()
@@ -1,11 +1,17 @@
 from flask import Blueprint
-from flask import request
+from flask import request, jsonify
 from app.controllers.RequestResponseController import RequestResponseController
 from app.controllers.ChartsController import ChartsController
 
 ChartsBlueprint = Blueprint("charts", __name__)
 
 ChartsController = ChartsController()
+
+
+@ChartsBlueprint.errorhandler(ValueError)
+def handle_value_error(e: ValueError):
+    # e.g. an unknown dataset, or a row-level chart requested for a streaming-ingested dataset
+    return jsonify({"success": False, "error": str(e)}), 400
 @ChartsBlueprint.route("/quantiles-distance")
 def quantiles_distance():
     """
@@ -32,6 +38,11 @@ def quantiles_distance():
         default: 'normal'
         enum: ['normal', 'prognosis']
         description: Dataset mode to use.
+      - name: dataset
+        in: query
+        type: string
+        required: false
+        description: Name of a registered dataset (see /datasets); defaults to the primary dataset.
       - name: compare
         in: query
         type: boolean
@@ -43,6 +54,18 @@ def quantiles_distance():
         type: string
         required: false
         description: Comma-separated list of columns to display (currently ignored).
+      - name: approx
+        in: query
+        type: boolean
+        required: false
+        default: false
+        description: Take the quartiles from per-column KLL sketches instead of sorting the column (rank error at most eps).
+      - name: eps
+        in: query
+        type: number
+        required: false
+        default: 0.01
+        description: Normalized rank error bound for approx=true, between 0.0001 and 0.5.
     responses:
       200:
         description: A PNG image of the chart.
@@ -59,7 +82,10 @@ def quantiles_distance():
     language, err, code = RequestResponseController.validate_language_request()
     if err:
         return err, code
-    return ChartsController.plot_quantiles_distance(language)
+    eps, err, code = RequestResponseController.validate_approx_request()
+    if err:
+        return err, code
+    return ChartsController.plot_quantiles_distance(language, eps)
 @ChartsBlueprint.route("/dist-normal")
 def dist_normal():
     """
@@ -27,6 +27,11 @@ def get_chernoff_faces() -> Any:
         required: false
         default: normal
         description: Dataset mode (normal, prognosis, or merged).
+      - name: dataset
+        in: query
+        type: string
+        required: false
+        description: Name of a registered dataset (see /datasets); defaults to the primary dataset.
       - name: face
         in: query
         type: string
@@ -37,6 +42,18 @@ def get_chernoff_faces() -> Any:
         type: string
         required: false
         description: Comma-separated list of columns to display (e.g., 'credit_score,income,loan_amount').
+      - name: approx
+        in: query
+        type: boolean
+        required: false
+        default: false
+        description: Take the quartiles from per-column KLL sketches instead of sorting the column (rank error at most eps).
+      - name: eps
+        in: query
+        type: number
+        required: false
+        default: 0.01
+        description: Normalized rank error bound for approx=true, between 0.0001 and 0.5.
     responses:
       200:
         description: A PNG image of Chernoff faces.
@@ -51,15 +68,19 @@ def get_chernoff_faces() -> Any:
       - Chernoff Faces
     """
     language, err, code = RequestResponseController.validate_language_request()
+    if err:
+        return err, code
+    eps, err, code = RequestResponseController.validate_approx_request()
     if err:
         return err, code
     mode = request.args.get('mode', 'normal')
     face = request.args.get('face')
     columns = request.args.get('columns')
+    dataset = request.args.get('dataset')
 
     language = language if isinstance(language, str) else "en"
 
-    response = ChernoffControllerInstance.generate_chernoff_faces(language, mode=mode, single_face=face, selected_columns=columns)
+    response = ChernoffControllerInstance.generate_chernoff_faces(language, mode=mode, single_face=face, selected_columns=columns, dataset=dataset, eps=eps)
 
     response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
     response.headers['Pragma'] = 'no-cache'
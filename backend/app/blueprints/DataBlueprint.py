@@ -1,6 +1,7 @@
-from flask import Blueprint, request
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 from app.controllers.RequestResponseController import RequestResponseController
 from app.controllers.DataController import DataController
+from app.controllers.AggregationController import AggregationControllerInstance
 
 DataBlueprint = Blueprint("data", __name__)
 
@@ -20,7 +21,8 @@ def get_headers():
     tags:
       - Data
     """
-    return RequestResponseController.make_data_response(DataController.get_data_headers)
+    dataset = request.args.get("dataset")
+    return RequestResponseController.make_data_response(lambda: DataController.get_data_headers(dataset))
 
 
 @DataBlueprint.route("/data")
@@ -34,7 +36,40 @@ def get_data():
         type: integer
         required: false
         default: 1
-        description: The page number to retrieve.
+        description: The page number to retrieve (ignored when a cursor is given).
+      - name: per_page
+        in: query
+        type: integer
+        required: false
+        default: 10
+        description: Records per page; capped at DATA_MAX_PER_PAGE (default 1000).
+      - name: cursor
+        in: query
+        type: string
+        required: false
+        description: Opaque token from `next_cursor` / `prev_cursor` of a previous response. Reads the page after/before the row it points to, independent of how deep it is. Tokens expire when the dataset is reloaded (400).
+      - name: sort
+        in: query
+        type: string
+        required: false
+        description: "Sort column with optional direction, e.g. `income:desc` (default `asc`). Ties keep file order; missing values come last."
+      - name: filter
+        in: query
+        type: string
+        required: false
+        description: "Repeatable, AND-combined filter, e.g. `credit_score>=700`, `loan_approved=true`, `city in (Berlin,Warsaw)`."
+      - name: columns
+        in: query
+        type: string
+        required: false
+        description: "Comma-separated columns to return, e.g. `income,credit_score,loan_approved`; `dataset` (and `dataset_code`) only when listed. All columns by default."
+      - name: format
+        in: query
+        type: string
+        required: false
+        default: records
+        enum: ['records', 'columnar']
+        description: "`columnar` returns `data` as `{column: [values]}` instead of a list of objects."
       - name: mode
         in: query
         type: string
@@ -46,6 +81,11 @@ def get_data():
         type: string
         required: false
         description: The language code for value localization (e.g., 'pl', 'en').
+      - name: dataset
+        in: query
+        type: string
+        required: false
+        description: Name of a registered dataset (see /datasets); defaults to the primary dataset.
     responses:
       200:
         description: A paginated list of records.
@@ -72,17 +112,264 @@ def get_data():
               type: integer
             total:
               type: integer
+            next_cursor:
+              type: string
+            prev_cursor:
+              type: string
+      304:
+        description: Not modified; the `If-None-Match` header matched the page's ETag.
       400:
-        description: Invalid page number.
+        description: Invalid page number, per_page or cursor.
     tags:
       - Data
     """
     page, err, code = RequestResponseController.validate_data_request()
+    if err:
+        return err, code
+    per_page, err, code = RequestResponseController.validate_per_page_request()
+    if err:
+        return err, code
+    fmt, err, code = RequestResponseController.validate_format_request()
     if err:
         return err, code
     language = request.args.get("language")
     mode = request.args.get("mode", "normal")
-    return RequestResponseController.make_data_response(lambda: DataController.get_data(page, language, mode))
+    dataset = request.args.get("dataset")
+    cursor = request.args.get("cursor")
+    sort = request.args.get("sort")
+    filters = request.args.getlist("filter")
+    columns = request.args.get("columns")
+    try:
+        cached = DataController.get_data_response(page, language, mode, dataset, per_page, cursor, sort, filters, columns, fmt)
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    return RequestResponseController.make_conditional_response(cached.body, cached.etag)
+
+
+@DataBlueprint.route("/data/search")
+def search_data():
+    """
+    Find records by name or city (case-insensitive prefix or substring).
+    ---
+    parameters:
+      - name: q
+        in: query
+        type: string
+        required: true
+        description: Text to look for.
+      - name: match
+        in: query
+        type: string
+        required: false
+        default: substring
+        enum: ['substring', 'prefix']
+        description: Whether the value must contain or start with the query.
+      - name: field
+        in: query
+        type: string
+        required: false
+        description: "Repeatable; restricts the search to `name` or `city` (both by default)."
+      - name: mode
+        in: query
+        type: string
+        required: false
+        default: 'normal'
+        description: "Dataset mode to use; one of 'normal', 'prognosis' or 'merged'."
+      - name: dataset
+        in: query
+        type: string
+        required: false
+        description: Name of a registered dataset (see /datasets); defaults to the primary dataset.
+      - name: page
+        in: query
+        type: integer
+        required: false
+        default: 1
+      - name: per_page
+        in: query
+        type: integer
+        required: false
+        default: 10
+        description: Ids per page; capped at DATA_MAX_PER_PAGE.
+    responses:
+      200:
+        description: Matching record ids (row positions in the frame served for the mode), in file order.
+        schema:
+          type: object
+          properties:
+            ids:
+              type: array
+              items:
+                type: integer
+            has_next:
+              type: boolean
+            has_prev:
+              type: boolean
+            total:
+              type: integer
+            page:
+              type: integer
+            per_page:
+              type: integer
+            version:
+              type: integer
+      400:
+        description: Missing query, invalid paging parameters or unknown field.
+    tags:
+      - Data
+    """
+    page, err, code = RequestResponseController.validate_data_request()
+    if err:
+        return err, code
+    per_page, err, code = RequestResponseController.validate_per_page_request()
+    if err:
+        return err, code
+    query = request.args.get("q", "")
+    mode = request.args.get("mode", "normal")
+    dataset = request.args.get("dataset")
+    match = request.args.get("match", "substring")
+    fields = request.args.getlist("field")
+    return RequestResponseController.make_data_response(
+        lambda: DataController.search_data(query, mode, dataset, page, per_page, match, fields)
+    )
+
+
+@DataBlueprint.route("/data/aggregate")
+def aggregate_data():
+    """
+    Group the records and aggregate numeric columns per group.
+    ---
+    parameters:
+      - name: by
+        in: query
+        type: string
+        required: true
+        description: "Comma-separated grouping columns, e.g. `city,loan_approved`."
+      - name: metrics
+        in: query
+        type: string
+        required: true
+        description: "Comma-separated `column:mean|sum|min|max|count` or `count` (rows per group), e.g. `income:mean,loan_amount:sum,count`."
+      - name: filter
+        in: query
+        type: string
+        required: false
+        description: "Repeatable predicate applied before grouping, e.g. `credit_score>=700`."
+      - name: mode
+        in: query
+        type: string
+        required: false
+        default: 'normal'
+        description: "Dataset mode to use; one of 'normal', 'prognosis' or 'merged'."
+      - name: dataset
+        in: query
+        type: string
+        required: false
+        description: Name of a registered dataset (see /datasets); defaults to the primary dataset.
+      - name: format
+        in: query
+        type: string
+        required: false
+        default: records
+        enum: ['records', 'columnar']
+    responses:
+      200:
+        description: One row per group (in group key order) with the grouping columns and one field per metric.
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+            result:
+              type: array
+              items:
+                type: object
+      400:
+        description: Missing or invalid grouping, metric or filter.
+    tags:
+      - Data
+    """
+    fmt, err, code = RequestResponseController.validate_format_request()
+    if err:
+        return err, code
+    by = (request.args.get("by") or "").split(",")
+    metrics = (request.args.get("metrics") or "").split(",")
+    filters = request.args.getlist("filter")
+    mode = request.args.get("mode", "normal")
+    dataset = request.args.get("dataset")
+    if fmt == "columnar":
+        return RequestResponseController.make_data_response(
+            lambda: RequestResponseController.to_columnar(AggregationControllerInstance.aggregate(by, metrics, mode, dataset, filters))
+        )
+    return RequestResponseController.make_data_response(
+        lambda: AggregationControllerInstance.aggregate(by, metrics, mode, dataset, filters)
+    )
+
+
+@DataBlueprint.route("/data/export")
+def export_data():
+    """
+    Stream the whole dataset as CSV, NDJSON or Arrow IPC.
+    Rows are serialized in chunks while the response is sent, with the same localization as /data.
+    ---
+    parameters:
+      - name: format
+        in: query
+        type: string
+        required: false
+        default: csv
+        enum: ['csv', 'ndjson', 'arrow']
+        description: "Output format; `arrow` is an Arrow IPC stream (pyarrow, from requirements.txt)."
+      - name: mode
+        in: query
+        type: string
+        required: false
+        default: 'normal'
+        description: "Dataset mode to use; one of 'normal', 'prognosis' or 'merged'."
+      - name: language
+        in: query
+        type: string
+        required: false
+        description: The language code for value localization (e.g., 'pl', 'en').
+      - name: dataset
+        in: query
+        type: string
+        required: false
+        description: Name of a registered dataset (see /datasets); defaults to the primary dataset.
+      - name: sort
+        in: query
+        type: string
+        required: false
+        description: Sort column with optional direction, as for /data.
+      - name: filter
+        in: query
+        type: string
+        required: false
+        description: Repeatable, AND-combined filter, as for /data.
+      - name: columns
+        in: query
+        type: string
+        required: false
+        description: "Comma-separated columns to export, e.g. `income,credit_score,loan_approved`; `dataset` (and `dataset_code`) only when listed. All columns by default."
+    responses:
+      200:
+        description: The exported rows (`;`-separated CSV with header, one JSON object per line, or an Arrow IPC stream).
+      400:
+        description: Unknown format, pyarrow not installed for `arrow`, or invalid sort/filter.
+    tags:
+      - Data
+    """
+    fmt = request.args.get("format", "csv")
+    try:
+        body, mimetype = DataController.export_data(
+            fmt, request.args.get("language"), request.args.get("mode", "normal"), request.args.get("dataset"),
+            request.args.get("sort"), request.args.getlist("filter"), request.args.get("columns")
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    extension = {"ndjson": "ndjson", "arrow": "arrow"}.get(fmt.strip().lower(), "csv")
+    headers = {"Content-Disposition": f"attachment; filename=export.{extension}"}
+    return Response(stream_with_context(body), mimetype=mimetype, headers=headers)
 
 
 @DataBlueprint.route("/headers-localized")
@@ -109,7 +396,8 @@ def get_headers_localized():
     language, err, code = RequestResponseController.validate_language_request()
     if err:
         return err, code
-    return RequestResponseController.make_data_response(lambda: DataController.get_data_headers_localized(language))
+    dataset = request.args.get("dataset")
+    return RequestResponseController.make_data_response(lambda: DataController.get_data_headers_localized(language, dataset))
 
 
 @DataBlueprint.route("/prognosis-process")
@@ -125,4 +413,134 @@ def get_prognosis_process():
     tags:
       - Data
     """
-    return RequestResponseController.make_data_response(DataController.get_prognosis_process_details)
+    dataset = request.args.get("dataset")
+    return RequestResponseController.make_data_response(lambda: DataController.get_prognosis_process_details(dataset))
+
+
+@DataBlueprint.route("/datasets")
+def get_datasets():
+    """
+    List the registered datasets and their load state.
+    ---
+    parameters:
+      - name: format
+        in: query
+        type: string
+        required: false
+        default: records
+        enum: ['records', 'columnar']
+        description: "`columnar` returns the list as `{column: [values]}` instead of a list of objects."
+    responses:
+      200:
+        description: One entry per registered dataset.
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              name:
+                type: string
+              default:
+                type: boolean
+              loaded:
+                type: boolean
+              version:
+                type: integer
+              rows:
+                type: integer
+              memory_bytes:
+                type: integer
+    tags:
+      - Data
+    """
+    fmt, err, code = RequestResponseController.validate_format_request()
+    if err:
+        return err, code
+    if fmt == "columnar":
+        return RequestResponseController.make_data_response(lambda: RequestResponseController.to_columnar(DataController.get_datasets()))
+    return RequestResponseController.make_data_response(DataController.get_datasets)
+
+
+@DataBlueprint.route("/datasets", methods=["POST"])
+def upload_dataset():
+    """
+    Upload a ';'-separated loan CSV as a new dataset.
+    The request body is the raw CSV (not multipart); it is parsed and validated while it streams in,
+    so a malformed file is rejected at the first bad row.
+    ---
+    consumes:
+      - text/csv
+    parameters:
+      - name: body
+        in: body
+        required: true
+        description: "CSV with the columns name;city;income;credit_score;loan_amount;years_employed;points;loan_approved."
+        schema:
+          type: string
+      - name: storage
+        in: query
+        type: string
+        required: false
+        description: "'memory' or 'sqlite'; defaults to DATASET_STORAGE."
+    responses:
+      201:
+        description: The dataset was registered; pass `id` as the `dataset` parameter of the data, stats and chart endpoints.
+        schema:
+          type: object
+          properties:
+            id:
+              type: string
+            rows:
+              type: integer
+            storage:
+              type: string
+            streaming:
+              type: boolean
+            version:
+              type: integer
+      400:
+        description: Invalid CSV, schema mismatch or upload above UPLOAD_MAX_MB.
+    tags:
+      - Data
+    """
+    storage = request.args.get("storage")
+    response, code = RequestResponseController.make_data_response(
+        lambda: DataController.upload_dataset(request.stream, request.content_length, storage)
+    )
+    return response, 201 if code == 200 else code
+
+
+@DataBlueprint.route("/datasets/memory")
+def get_datasets_memory():
+    """
+    Memory report of the loaded datasets: dtype and bytes per column.
+    ---
+    responses:
+      200:
+        description: One entry per registered dataset. `frames` holds the base frame (`data`) and the derived `prognosis`/`merged` frames once built.
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              name:
+                type: string
+              loaded:
+                type: boolean
+              total_bytes:
+                type: integer
+              frames:
+                type: object
+                additionalProperties:
+                  type: object
+                  additionalProperties:
+                    type: object
+                    properties:
+                      dtype:
+                        type: string
+                      bytes:
+                        type: integer
+    tags:
+      - Data
+    """
+    return RequestResponseController.make_data_response(DataController.get_memory_report)
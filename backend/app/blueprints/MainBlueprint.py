@@ -1,9 +1,28 @@
-from flask import Blueprint, Response, jsonify
+import os
+from flask import Blueprint, Response, jsonify, request
 
 from app import app
+from app.controllers.FilesController import FilesControllerInstance
 
 MainBlueprint = Blueprint("main", __name__)
 
+# Endpoints that need a loaded dataset wait this long for the startup load, then answer 503
+DATA_READY_WAIT = float(os.environ.get('DATA_READY_WAIT', '10'))
+DATA_BLUEPRINTS = {"data", "stats", "charts", "chernoff"}
+READINESS_EXEMPT_ENDPOINTS = {"data.get_datasets", "data.get_datasets_memory", "data.upload_dataset", "stats.get_stats_cache", "charts.chart_description", "chernoff.get_chernoff_legend"}
+
+
+@MainBlueprint.before_app_request
+def wait_for_data():
+    if request.blueprint not in DATA_BLUEPRINTS or request.endpoint in READINESS_EXEMPT_ENDPOINTS:
+        return None
+    if FilesControllerInstance.wait_until_ready(DATA_READY_WAIT):
+        return None
+    response = jsonify({"success": False, "error": "Dataset is still loading, retry shortly"})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(max(1, int(DATA_READY_WAIT)))
+    return response
+
 
 @MainBlueprint.route('/')
 def index():
@@ -50,3 +69,31 @@ def index():
         'api_docs': '/apidocs',
         'endpoints': sorted(routes, key=lambda x: x['path'])
     })
+
+
+@MainBlueprint.route('/ready')
+def ready():
+    """
+    Readiness of the backend: 200 once the default dataset is loaded, 503 while it loads or when it failed to load.
+    ---
+    responses:
+      200:
+        description: The default dataset is loaded.
+        schema:
+          type: object
+          properties:
+            ready:
+              type: boolean
+            error:
+              type: string
+            datasets:
+              type: array
+              items:
+                type: object
+      503:
+        description: The default dataset is still loading (`error` is null) or could not be loaded (`error` says why).
+    tags:
+      - Main
+    """
+    status = FilesControllerInstance.get_status()
+    return jsonify(status), 200 if status["ready"] else 503
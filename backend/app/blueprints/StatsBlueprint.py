@@ -1,7 +1,6 @@
 from flask import Blueprint, request
 from app.controllers.RequestResponseController import RequestResponseController
 from app.controllers.StatsCalculatorController import StatsCalculatorController
-from flask import jsonify
 
 StatsBlueprint = Blueprint("stats", __name__)
 
@@ -45,7 +44,9 @@ def get_columns_mean():
     if err:
       return err, code
     mode = request.args.get("mode", "normal")
-    return RequestResponseController.make_stats_response(StatsCalculatorController.calculate_mean, column_name, mode)
+    dataset = request.args.get("dataset")
+    filters = request.args.getlist("filter")
+    return RequestResponseController.make_stats_response(StatsCalculatorController.calculate_mean, column_name, mode, dataset, filters)
 
 
 @StatsBlueprint.route("/sum")
@@ -85,7 +86,9 @@ def get_columns_sum():
     if err:
       return err, code
     mode = request.args.get("mode", "normal")
-    return RequestResponseController.make_stats_response(StatsCalculatorController.calculate_sum, column_name, mode)
+    dataset = request.args.get("dataset")
+    filters = request.args.getlist("filter")
+    return RequestResponseController.make_stats_response(StatsCalculatorController.calculate_sum, column_name, mode, dataset, filters)
 
 
 @StatsBlueprint.route("/quartiles")
@@ -106,6 +109,18 @@ def get_columns_quartiles():
         default: en
         enum: ['en', 'de', 'pl', 'zh', 'ko']
         description: The language for the response messages.
+      - name: approx
+        in: query
+        type: boolean
+        required: false
+        default: false
+        description: "Read the quartiles from a KLL sketch kept per column instead of sorting the column. The result's rank is within eps * n of the requested one (with high probability). Filtered requests are always exact. Required for streaming datasets, which only keep a sketch."
+      - name: eps
+        in: query
+        type: number
+        required: false
+        default: 0.01
+        description: Normalized rank error bound for approx=true, between 0.0001 and 0.5.
     responses:
       200:
         description: The calculated quartiles.
@@ -122,10 +137,15 @@ def get_columns_quartiles():
       - Statistics
     """
     column_name, err, code = RequestResponseController.validate_stats_request()
+    if err:
+      return err, code
+    eps, err, code = RequestResponseController.validate_approx_request()
     if err:
       return err, code
     mode = request.args.get("mode", "normal")
-    return RequestResponseController.make_stats_response(StatsCalculatorController.calculate_quartiles, column_name, mode)
+    dataset = request.args.get("dataset")
+    filters = request.args.getlist("filter")
+    return RequestResponseController.make_stats_response(StatsCalculatorController.calculate_quartiles, column_name, mode, dataset, filters, eps)
 
 
 @StatsBlueprint.route("/median")
@@ -146,6 +166,18 @@ def get_columns_median():
         default: en
         enum: ['en', 'de', 'pl', 'zh', 'ko']
         description: The language for the response messages.
+      - name: approx
+        in: query
+        type: boolean
+        required: false
+        default: false
+        description: "Read the median from a KLL sketch kept per column instead of sorting the column. The result's rank is within eps * n of the requested one (with high probability). Filtered requests are always exact. Required for streaming datasets, which only keep a sketch."
+      - name: eps
+        in: query
+        type: number
+        required: false
+        default: 0.01
+        description: Normalized rank error bound for approx=true, between 0.0001 and 0.5.
     responses:
       200:
         description: The calculated median.
@@ -162,10 +194,15 @@ def get_columns_median():
       - Statistics
     """
     column_name, err, code = RequestResponseController.validate_stats_request()
+    if err:
+      return err, code
+    eps, err, code = RequestResponseController.validate_approx_request()
     if err:
       return err, code
     mode = request.args.get("mode", "normal")
-    return RequestResponseController.make_stats_response(StatsCalculatorController.calculate_median, column_name, mode)
+    dataset = request.args.get("dataset")
+    filters = request.args.getlist("filter")
+    return RequestResponseController.make_stats_response(StatsCalculatorController.calculate_median, column_name, mode, dataset, filters, eps)
 
 
 @StatsBlueprint.route("/mode")
@@ -207,7 +244,9 @@ def get_columns_mode():
     if err:
       return err, code
     mode = request.args.get("mode", "normal")
-    return RequestResponseController.make_stats_response(StatsCalculatorController.calculate_mode, column_name, mode)
+    dataset = request.args.get("dataset")
+    filters = request.args.getlist("filter")
+    return RequestResponseController.make_stats_response(StatsCalculatorController.calculate_mode, column_name, mode, dataset, filters)
 
 
 @StatsBlueprint.route("/skewness")
@@ -247,7 +286,9 @@ def get_columns_skewness():
     if err:
       return err, code
     mode = request.args.get("mode", "normal")
-    return RequestResponseController.make_stats_response(StatsCalculatorController.calculate_skewness, column_name, mode)
+    dataset = request.args.get("dataset")
+    filters = request.args.getlist("filter")
+    return RequestResponseController.make_stats_response(StatsCalculatorController.calculate_skewness, column_name, mode, dataset, filters)
 
 
 @StatsBlueprint.route("/kurtosis")
@@ -287,7 +328,9 @@ def get_columns_kurtosis():
     if err:
       return err, code
     mode = request.args.get("mode", "normal")
-    return RequestResponseController.make_stats_response(StatsCalculatorController.calculate_kurtosis, column_name, mode)
+    dataset = request.args.get("dataset")
+    filters = request.args.getlist("filter")
+    return RequestResponseController.make_stats_response(StatsCalculatorController.calculate_kurtosis, column_name, mode, dataset, filters)
 
 
 @StatsBlueprint.route("/deviation")
@@ -327,7 +370,9 @@ def get_columns_deviation():
     if err:
       return err, code
     mode = request.args.get("mode", "normal")
-    return RequestResponseController.make_stats_response(StatsCalculatorController.calculate_deviation, column_name, mode)
+    dataset = request.args.get("dataset")
+    filters = request.args.getlist("filter")
+    return RequestResponseController.make_stats_response(StatsCalculatorController.calculate_deviation, column_name, mode, dataset, filters)
 
 
 @StatsBlueprint.route("/summary")
@@ -343,6 +388,26 @@ def get_summary():
         default: 'normal'
         enum: ['normal', 'prognosis']
         description: Dataset mode to use.
+      - name: dataset
+        in: query
+        type: string
+        required: false
+        description: Name of a registered dataset (see /datasets); defaults to the primary dataset.
+      - name: filter
+        in: query
+        type: array
+        items:
+          type: string
+        collectionFormat: multi
+        required: false
+        description: Row filter, repeatable and AND-combined, e.g. `credit_score>=700`, `loan_approved=true`, `city in (Berlin,Warsaw)`. Also accepted by the single-statistic endpoints.
+      - name: format
+        in: query
+        type: string
+        required: false
+        default: records
+        enum: ['records', 'columnar']
+        description: "`columnar` returns `{column: [names], mean: [...], median: [...], ...}` with one array per metric aligned to `column`."
     responses:
       200:
         description: Summary stats per metric per column.
@@ -353,9 +418,94 @@ def get_summary():
     tags:
       - Statistics
     """
-    try:
-        mode = request.args.get("mode", "normal")
-        result = StatsCalculatorController.get_summary_stats(mode)
-        return jsonify({"success": True, "result": result}), 200
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 400
+    fmt, err, code = RequestResponseController.validate_format_request()
+    if err:
+        return err, code
+    mode = request.args.get("mode", "normal")
+    dataset = request.args.get("dataset")
+    filters = request.args.getlist("filter")
+    if fmt == "columnar":
+        return RequestResponseController.make_stats_response(
+            lambda: RequestResponseController.to_columnar_table(StatsCalculatorController.get_summary_stats(mode, dataset, filters))
+        )
+    return RequestResponseController.make_stats_response(StatsCalculatorController.get_summary_stats, mode, dataset, filters)
+
+
+@StatsBlueprint.route("/stats/cache")
+def get_stats_cache():
+    """
+    Report the statistics result cache.
+    ---
+    responses:
+      200:
+        description: Cached entries, the LRU bound (STATS_CACHE_ENTRIES) and hit/miss counters since startup.
+        schema:
+          type: object
+          properties:
+            entries:
+              type: integer
+            max_entries:
+              type: integer
+            hits:
+              type: integer
+            misses:
+              type: integer
+            hit_rate:
+              type: number
+    tags:
+      - Statistics
+    """
+    return RequestResponseController.make_stats_response(StatsCalculatorController.get_cache_stats)
+
+
+@StatsBlueprint.route("/stats/batch", methods=["POST"])
+def get_stats_batch():
+    """
+    Compute many statistics in one request.
+    ---
+    parameters:
+      - name: dataset
+        in: query
+        type: string
+        required: false
+        description: Name of a registered dataset (see /datasets); defaults to the primary dataset.
+      - name: body
+        in: body
+        required: true
+        description: 'A list of requests (or `{"requests": [...]}`). `stat` is one of mean, sum, quartiles, median, mode, skewness, kurtosis or deviation. `mode` defaults to normal, and `filter` takes a string or list of row filters. Requests on the same mode, column and filters share one read of the column, one sort and one set of moments. At most 1000 requests per batch.'
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              stat:
+                type: string
+              column:
+                type: string
+              mode:
+                type: string
+              filter:
+                type: array
+                items:
+                  type: string
+    responses:
+      200:
+        description: One item per request, in request order, with `success` and either `result` or `error`.
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+            result:
+              type: array
+              items:
+                type: object
+      400:
+        description: Malformed body, unknown statistic or too many requests.
+    tags:
+      - Statistics
+    """
+    body = request.get_json(silent=True)
+    specs = body.get("requests") if isinstance(body, dict) else body
+    dataset = request.args.get("dataset") or (body.get("dataset") if isinstance(body, dict) else None)
+    return RequestResponseController.make_stats_response(StatsCalculatorController.calculate_batch, specs, dataset)
@@ -0,0 +1,169 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+from app.controllers.FilesController import FilesControllerInstance
+from app.utils.filters import build_mask, parse_filters
+from app.utils.merged_view import MergedView
+
+# partial aggregates kept per group; every supported metric is derived from them and they roll up to coarser groupings
+PARTIALS = ('count', 'sum', 'min', 'max')
+METRICS = ('mean', 'sum', 'min', 'max', 'count')
+ROWS = '__rows'
+
+
+class Metric(NamedTuple):
+    column: Optional[str]
+    function: str
+
+    @property
+    def label(self) -> str:
+        return self.function if self.column is None else f"{self.column}:{self.function}"
+
+
+class AggregationController:
+    """
+    Group-by aggregates of the served frames (/data/aggregate and the group charts).
+    One groupby pass per (dataset, version, mode, filters, by) computes count/sum/min/max of
+    every numeric column plus the group sizes; the partials are cached (LRU,
+    AGGREGATE_CACHE_ENTRIES) and a grouping that is a subset of a cached one is rolled up
+    from it instead of touching the rows again.
+    """
+
+    def __init__(self):
+        self.__max_entries = int(os.environ.get('AGGREGATE_CACHE_ENTRIES', '32'))
+        self.__partials: "OrderedDict[Tuple[Hashable, ...], DataFrame]" = OrderedDict()
+        self.__lock = threading.Lock()
+        FilesControllerInstance.add_reload_listener(self.invalidate)
+
+    def invalidate(self, dataset: str, version: int) -> None:
+        with self.__lock:
+            for key in [k for k in self.__partials if k[0] == dataset and k[1] < version]:
+                del self.__partials[key]
+
+    @staticmethod
+    def parse_metrics(expressions: List[str], numeric_columns: List[str]) -> List[Metric]:
+        """Parses `income:mean`, `loan_amount:sum` or a bare `count` (rows per group)."""
+        metrics: List[Metric] = []
+        for expression in expressions:
+            expression = expression.strip()
+            if not expression:
+                continue
+            if expression == 'count':
+                metrics.append(Metric(None, 'count'))
+                continue
+            column, _, function = expression.partition(':')
+            column, function = column.strip(), function.strip().lower()
+            if function not in METRICS:
+                raise ValueError(f"Invalid metric '{expression}' (expected column:{'|'.join(METRICS)} or count)")
+            if column not in numeric_columns:
+                raise ValueError(f"Column '{column}' is not numeric or not found in dataset.")
+            metrics.append(Metric(column, function))
+        if not metrics:
+            raise ValueError("Missing metrics parameter")
+        return metrics
+
+    def __get_cached(self, key: Tuple[Hashable, ...]) -> Optional[DataFrame]:
+        with self.__lock:
+            partial = self.__partials.get(key)
+            if partial is not None:
+                self.__partials.move_to_end(key)
+                return partial
+            # a cached finer grouping of the same rows rolls up to the requested one
+            finer = None
+            for cached_key, cached in reversed(self.__partials.items()):
+                if cached_key[:4] == key[:4] and set(key[4]) < set(cached_key[4]):
+                    self.__partials.move_to_end(cached_key)
+                    finer = cached
+                    break
+        if finer is None:
+            return None
+        partial = self.__roll_up(finer, list(key[4]))
+        self.__put(key, partial)
+        return partial
+
+    def __put(self, key: Tuple[Hashable, ...], partial: DataFrame) -> None:
+        with self.__lock:
+            self.__partials[key] = partial
+            self.__partials.move_to_end(key)
+            while len(self.__partials) > self.__max_entries:
+                self.__partials.popitem(last=False)
+
+    @staticmethod
+    def __roll_up(partial: DataFrame, by: List[str]) -> DataFrame:
+        functions = {c: ('sum' if c[1] in ('count', 'sum') or c[0] == ROWS else c[1]) for c in partial.columns}
+        return partial.groupby(level=by, observed=True, sort=True, dropna=False).agg(functions)
+
+    @staticmethod
+    def __compute_partials(data: Any, by: List[str], numeric: List[str], filters: Optional[List[str]]) -> DataFrame:
+        """
+        Partials of the grouping over the filtered rows. A MergedView is aggregated part by part
+        and the two partials are rolled up into one, so no merged column is stitched.
+        """
+        predicates = parse_filters(filters, list(data.columns))
+        if isinstance(data, MergedView):
+            columns = list(dict.fromkeys(by + numeric + [p.column for p in predicates]))
+            partials = [AggregationController.__compute_partials(part, by, numeric, filters) for part in data.get_parts(columns)]
+            return AggregationController.__roll_up(pd.concat(partials), by)
+        columns = list(dict.fromkeys(by + numeric))
+        frame = data[columns] if isinstance(data, DataFrame) else data.to_frame(columns)
+        if predicates:
+            frame = frame[build_mask(data, predicates)]
+        frame = frame.astype({c: np.float64 for c in numeric if frame[c].dtype == np.float32})
+        # missing keys form their own group, so a roll-up sees every row the finer grouping saw
+        groups = frame.groupby(by, observed=True, sort=True, dropna=False)
+        partial = groups[numeric].agg(list(PARTIALS))
+        partial[(ROWS, 'count')] = groups.size()
+        return partial
+
+    def get_partials(self, by: List[str], mode: str = 'normal', dataset: Optional[str] = None,
+                     filters: Optional[List[str]] = None) -> Tuple[DataFrame, List[str]]:
+        """Cached per-group partials for the grouping, and the numeric columns they cover."""
+        mode = mode if mode in ('prognosis', 'merged') else 'normal'
+        version, data = FilesControllerInstance.get_frame(dataset, mode)
+        if data is None:
+            raise ValueError("No data loaded")
+        if not by:
+            raise ValueError("Missing by parameter")
+        for column in by:
+            if column not in data.columns:
+                raise ValueError(f"Column '{column}' not found in dataset.")
+        dtypes = data.dtypes
+        numeric = [c for c in data.columns if c not in by and pd.api.types.is_numeric_dtype(dtypes[c])
+                   and not pd.api.types.is_bool_dtype(dtypes[c])]
+        key = (dataset or FilesControllerInstance.DEFAULT_DATASET, version, mode,
+               tuple(sorted(f.strip() for f in filters or [] if f.strip())), tuple(by))
+        partial = self.__get_cached(key)
+        if partial is None:
+            partial = self.__compute_partials(data, list(by), numeric, filters)
+            self.__put(key, partial)
+        return partial, numeric
+
+    def get_group_metrics(self, by: List[str], metrics: List[str], mode: str = 'normal', dataset: Optional[str] = None,
+                          filters: Optional[List[str]] = None) -> DataFrame:
+        """One column per metric (labelled like the request, e.g. 'income:mean'), indexed by the group keys."""
+        partial, numeric = self.get_partials(by, mode, dataset, filters)
+        result = {}
+        for metric in self.parse_metrics(metrics, numeric):
+            if metric.column is None:
+                result[metric.label] = partial[(ROWS, 'count')]
+            elif metric.function == 'mean':
+                counts = partial[(metric.column, 'count')]
+                result[metric.label] = (partial[(metric.column, 'sum')] / counts.where(counts > 0)).astype(np.float64)
+            else:
+                result[metric.label] = partial[(metric.column, metric.function)]
+        return DataFrame(result, index=partial.index)
+
+    def aggregate(self, by: List[str], metrics: List[str], mode: str = 'normal', dataset: Optional[str] = None,
+                  filters: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Rows of group keys and metric values, in group key order."""
+        by = [c.strip() for c in by if c.strip()]
+        table = self.get_group_metrics(by, metrics, mode, dataset, filters)
+        return table.reset_index().to_dict(orient="records")
+
+
+AggregationControllerInstance = AggregationController()
@@ -7,37 +7,78 @@ import pandas as pd
 import numpy as np
 from flask import Response, request
 from app.controllers.FilesController import FilesControllerInstance
+from app.controllers.AggregationController import AggregationControllerInstance
 from app.controllers.LanguagesController import LanguagesControllerInstance
 from app.controllers.FontController import FontControllerInstance
 from scipy.stats import norm, t as student_t
+from typing import List, Optional
+from app.utils.aggregates import StreamingAggregates
+from app.utils.schema import ApprovalIndex
 
 matplotlib.use("Agg")
 
 
 class ChartsController:
-    def __init__(self):
-        self.__data = None
+    def __get_dataset_name(self) -> Optional[str]:
+        try:
+            return request.args.get('dataset') if request else None
+        except Exception:
+            return None
 
-    def __get_data(self) -> pd.DataFrame:
+    def __get_mode(self) -> str:
         try:
-            mode = request.args.get('mode', 'normal') if request else 'normal'
+            return request.args.get('mode', 'normal') if request else 'normal'
         except Exception:
-            mode = 'normal'
+            return 'normal'
+
+    def __get_approval_index(self) -> ApprovalIndex:
+        """Approved/rejected row positions of the frame returned by __get_data for the same request."""
+        index = FilesControllerInstance.get_approval_index(self.__get_dataset_name(), self.__get_mode())
+        if index is None:
+            raise ValueError("Column 'loan_approved' not found in dataset.")
+        return index
+
+    def __get_group_metrics(self, by: List[str], metrics: List[str]) -> pd.DataFrame:
+        """Cached group aggregates of the requested frame, shared with /data/aggregate; groups with a missing key are not plotted."""
+        table = AggregationControllerInstance.get_group_metrics(by, metrics, self.__get_mode(), self.__get_dataset_name())
+        return table[table.index.to_frame(index=False).notna().all(axis=1).to_numpy()]
+
+    def __get_data(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Frame for the requested mode. Views (the merged view, SQLite storage) materialize only
+        the given columns, so a chart never loads more than it plots.
+        """
+        mode = self.__get_mode()
+        dataset = self.__get_dataset_name()
         if mode == 'prognosis':
-            data = FilesControllerInstance.get_prognosis_only_data()
+            data = FilesControllerInstance.get_prognosis_only_data(dataset)
             if data is None:
                 raise ValueError("No data loaded")
             return data
         if mode == 'merged':
-            data = FilesControllerInstance.get_prognosis_data()
-            if data is None:
-                raise ValueError("No data loaded")
+            data = FilesControllerInstance.get_prognosis_data(dataset)
+        else:
+            data = FilesControllerInstance.get_data(dataset)
+        if data is None:
+            raise ValueError("No data loaded")
+        if isinstance(data, pd.DataFrame):
             return data
-        if self.__data is None:
-            self.__data = FilesControllerInstance.get_data()
-            if self.__data is None:
-                raise ValueError("No data loaded")
-        return self.__data
+        return data.to_frame([c for c in columns if c in data.columns] if columns is not None else None)
+
+    def __get_aggregates(self) -> Optional[StreamingAggregates]:
+        """Aggregates of a streaming-ingested dataset, or None when the rows are in memory."""
+        if self.__get_mode() in ('prognosis', 'merged'):
+            return None
+        return FilesControllerInstance.get_aggregates(self.__get_dataset_name())
+
+    def __get_income_range_counts(self, normalize: bool = False) -> pd.Series:
+        aggregates = self.__get_aggregates()
+        if aggregates is None:
+            bins = pd.cut(self.__get_data(["income"])["income"], bins=10)
+            return bins.value_counts(normalize=normalize).sort_index()
+        edges, counts = aggregates.get_column("income").histogram.get_bins(10)
+        series = pd.Series(counts, index=pd.IntervalIndex.from_breaks(edges))
+        return series / series.sum() if normalize else series
 
     def __apply_theme(self, language: str, style: str = "whitegrid"):
         try:
@@ -67,18 +108,16 @@ class ChartsController:
         return {"low": low, "medium": medium, "high": high}
 
     def plot_income_histogram(self, language: str):
-        data = self.__get_data()
+        aggregates = self.__get_aggregates()
+        if aggregates is not None:
+            return self.__plot_streaming_income_histogram(aggregates, language)
+        data = self.__get_data(["income"])
+        index = self.__get_approval_index()
         self.__apply_theme(language, style="whitegrid")
         plt.figure(figsize=(8, 5))
-        approved_mask = data['loan_approved'].astype(str).str.lower().isin([
-            'true', '1', 'yes', 'tak', 'ja', '是', '예'
-        ]) | (data['loan_approved'] == True) | (data['loan_approved'] == 1)
-        rejected_mask = data['loan_approved'].astype(str).str.lower().isin([
-            'false', '0', 'no', 'nie', 'nein', '否', '아니오'
-        ]) | (data['loan_approved'] == False) | (data['loan_approved'] == 0)
 
-        approved_income = data.loc[approved_mask, 'income'].dropna()
-        rejected_income = data.loc[rejected_mask, 'income'].dropna()
+        approved_income = data['income'].iloc[index.approved].dropna()
+        rejected_income = data['income'].iloc[index.rejected].dropna()
 
         approved_label = LanguagesControllerInstance.get_translation(language, "chart_legend_loan_approved", "Loan Approved")
         rejected_label = LanguagesControllerInstance.get_translation(language, "chart_legend_loan_rejected", "Loan Rejected")
@@ -115,6 +154,25 @@ class ChartsController:
         plt.close()
         return Response(img_bytes, mimetype='image/png')
 
+    def __plot_streaming_income_histogram(self, aggregates: StreamingAggregates, language: str):
+        self.__apply_theme(language, style="whitegrid")
+        plt.figure(figsize=(8, 5))
+        approved_label = LanguagesControllerInstance.get_translation(language, "chart_legend_loan_approved", "Loan Approved")
+        rejected_label = LanguagesControllerInstance.get_translation(language, "chart_legend_loan_rejected", "Loan Rejected")
+        for approved, label, color in ((True, approved_label, '#99ff99'), (False, rejected_label, '#ff9999')):
+            edges, counts = aggregates.by_approval[approved]["income"].histogram.get_bins(30)
+            if not len(counts):
+                continue
+            density = counts / (counts.sum() * np.diff(edges))
+            plt.stairs(density, edges, fill=True, alpha=0.35, color=color, label=label)
+        plt.legend()
+        plt.title(LanguagesControllerInstance.get_translation(language, "chart_title_income_distribution", "Income Distribution by Loan Approval Decision"))
+        plt.xlabel(LanguagesControllerInstance.get_translation(language, "chart_label_income", "Income"))
+        plt.ylabel(LanguagesControllerInstance.get_translation(language, "chart_label_density", "Density"))
+        img_bytes = self.__fig_to_bytes(plt)
+        plt.close()
+        return Response(img_bytes, mimetype='image/png')
+
     def get_chart_description(self, chart_id: str, language: str) -> dict[str, str]:
         mapping = {
             "income-hist": (
@@ -246,7 +304,7 @@ class ChartsController:
         return {"chart": chart_id, "description": description}
 
     def plot_credit_vs_loan(self, language: str):
-        data = self.__get_data()
+        data = self.__get_data(["credit_score", "loan_amount", "income", "loan_approved"])
         self.__apply_theme(language, style="whitegrid")
 
         decision_map = self.__get_decision_labels(language)
@@ -294,7 +352,7 @@ class ChartsController:
         return Response(img_bytes, mimetype='image/png')
 
     def plot_employment_boxplot(self, language: str):
-        data = self.__get_data()
+        data = self.__get_data(["years_employed", "loan_approved"])
         self.__apply_theme(language, style="whitegrid")
         plt.figure(figsize=(7, 5))
 
@@ -311,7 +369,7 @@ class ChartsController:
         return Response(img_bytes, mimetype='image/png')
 
     def plot_correlation_heatmap(self, language: str):
-        data = self.__get_data()
+        data = self.__get_data(["income", "credit_score", "loan_amount", "years_employed", "points", "loan_approved"])
         self.__apply_theme(language, style="whitegrid")
         plt.figure(figsize=(8, 6))
         corr = data.corr(numeric_only=True)
@@ -336,7 +394,7 @@ class ChartsController:
         return Response(img_bytes, mimetype='image/png')
 
     def plot_income_vs_score(self, language: str):
-        data = self.__get_data()
+        data = self.__get_data(["credit_score", "income", "loan_approved"])
         self.__apply_theme(language, style="whitegrid")
         plt.figure(figsize=(8, 5))
 
@@ -353,7 +411,7 @@ class ChartsController:
         return Response(img_bytes, mimetype='image/png')
 
     def plot_income_vs_years(self, language: str):
-        data = self.__get_data()
+        data = self.__get_data(["years_employed", "income", "loan_approved"])
         self.__apply_theme(language, style="whitegrid")
         plt.figure(figsize=(8, 5))
 
@@ -377,7 +435,7 @@ class ChartsController:
         return Response(img_bytes, mimetype='image/png')
 
     def plot_credit_violin(self, language: str):
-        data = self.__get_data().copy()
+        data = self.__get_data(["credit_score", "income", "loan_approved"]).copy()
         data["income_group"] = pd.qcut(data["income"], 3, labels=["low", "medium", "high"])
 
         decision_map = self.__get_decision_labels(language)
@@ -396,9 +454,8 @@ class ChartsController:
         return Response(img_bytes, mimetype='image/png')
 
     def plot_avg_income_by_city(self, language: str):
-        data = self.__get_data()
         self.__apply_theme(language, style="whitegrid")
-        avg_income = data.groupby(["city", "loan_approved"])["income"].mean().unstack()
+        avg_income = self.__get_group_metrics(["city", "loan_approved"], ["income:mean"])["income:mean"].unstack()
         plt.figure(figsize=(12, 6))
         ax = avg_income.plot(kind="bar")
         plt.title(LanguagesControllerInstance.get_translation(language, "chart_title_avg_income_by_city", "Average Income by City and Loan Approval Decision"))
@@ -425,7 +482,7 @@ class ChartsController:
         return Response(img_bytes, mimetype='image/png')
 
     def plot_pairplot_main(self, language: str):
-        data = self.__get_data().copy()
+        data = self.__get_data(["income", "credit_score", "loan_amount", "loan_approved"]).copy()
         self.__apply_theme(language, style="ticks")
         decision_map = self.__get_decision_labels(language)
         data["loan_decision"] = data["loan_approved"].map(decision_map)
@@ -477,7 +534,7 @@ class ChartsController:
         return Response(img_bytes, mimetype='image/png')
 
     def plot_loan_amount_box(self, language: str):
-        data = self.__get_data()
+        data = self.__get_data(["loan_amount", "loan_approved"])
         self.__apply_theme(language, style="whitegrid")
         plt.figure(figsize=(8, 5))
 
@@ -494,11 +551,13 @@ class ChartsController:
         return Response(img_bytes, mimetype='image/png')
 
     def plot_credit_score_histogram(self, language: str):
-        data = self.__get_data()
+        data = self.__get_data(["credit_score"])
+        index = self.__get_approval_index()
         self.__apply_theme(language, style="whitegrid")
         plt.figure(figsize=(8, 5))
-        sns.kdeplot(data=data[data["loan_approved"] == True]["credit_score"].to_numpy(), label=LanguagesControllerInstance.get_translation(language, "chart_legend_loan_approved", "Loan Approved"))
-        sns.kdeplot(data=data[data["loan_approved"] == False]["credit_score"].to_numpy(), label=LanguagesControllerInstance.get_translation(language, "chart_legend_loan_rejected", "Loan Rejected"))
+        credit_score = data["credit_score"].to_numpy()
+        sns.kdeplot(data=credit_score[index.approved], label=LanguagesControllerInstance.get_translation(language, "chart_legend_loan_approved", "Loan Approved"))
+        sns.kdeplot(data=credit_score[index.rejected], label=LanguagesControllerInstance.get_translation(language, "chart_legend_loan_rejected", "Loan Rejected"))
         plt.title(LanguagesControllerInstance.get_translation(language, "chart_title_credit_score_distribution", "Credit Score Distribution by Loan Approval Decision"))
         plt.xlabel(LanguagesControllerInstance.get_translation(language, "chart_label_credit_score", "Credit Score"))
         plt.ylabel(LanguagesControllerInstance.get_translation(language, "chart_label_density", "Density"))
@@ -509,9 +568,14 @@ class ChartsController:
 
     def plot_income_hist_and_density(self, language: str):
         self.__apply_theme(language)
-        data = self.__get_data()
+        aggregates = self.__get_aggregates()
         plt.figure(figsize=(8, 5))
-        sns.histplot(data["income"].to_numpy(), kde=True, bins=20, color="skyblue")
+        if aggregates is not None:
+            edges, counts = aggregates.get_column("income").histogram.get_bins(20)
+            plt.stairs(counts, edges, fill=True, alpha=0.6, color="skyblue")
+        else:
+            data = self.__get_data(["income"])
+            sns.histplot(data["income"].to_numpy(), kde=True, bins=20, color="skyblue")
         plt.title(LanguagesControllerInstance.get_translation(language, "chart_title_income_hist_density", "Income Histogram and Density Distribution"))
         plt.xlabel(LanguagesControllerInstance.get_translation(language, "chart_label_income", "Income"))
         plt.ylabel(LanguagesControllerInstance.get_translation(language, "chart_label_number_of_clients", "Number of Clients"))
@@ -519,7 +583,7 @@ class ChartsController:
 
     def plot_income_box(self, language: str):
         self.__apply_theme(language)
-        data = self.__get_data()
+        data = self.__get_data(["income"])
         plt.figure(figsize=(6, 4))
         sns.boxplot(y=data["income"], color="lightgreen")
         plt.title(LanguagesControllerInstance.get_translation(language, "chart_title_income_box", "Income Box Plot"))
@@ -528,11 +592,16 @@ class ChartsController:
 
     def plot_income_ecdf(self, language: str):
         self.__apply_theme(language)
-        data = self.__get_data()
+        aggregates = self.__get_aggregates()
         plt.figure(figsize=(8, 5))
-        sorted_income = np.sort(data["income"])
-        ecdf = np.arange(1, len(sorted_income) + 1) / len(sorted_income)
-        plt.step(sorted_income, ecdf, where="post")
+        if aggregates is not None:
+            edges, counts = aggregates.get_column("income").histogram.get_bins()
+            plt.step(edges[1:], np.cumsum(counts) / counts.sum(), where="post")
+        else:
+            data = self.__get_data(["income"])
+            sorted_income = np.sort(data["income"])
+            ecdf = np.arange(1, len(sorted_income) + 1) / len(sorted_income)
+            plt.step(sorted_income, ecdf, where="post")
         plt.title(LanguagesControllerInstance.get_translation(language, "chart_title_income_ecdf", "Empirical Cumulative Distribution Function of Income"))
         plt.xlabel(LanguagesControllerInstance.get_translation(language, "chart_label_income", "Income"))
         plt.ylabel(LanguagesControllerInstance.get_translation(language, "chart_label_ecdf", "P(X ≤ x)"))
@@ -540,9 +609,7 @@ class ChartsController:
 
     def plot_income_frequency(self, language: str):
         self.__apply_theme(language)
-        data = self.__get_data()
-        bins = pd.cut(data["income"], bins=10)
-        counts = bins.value_counts().sort_index()
+        counts = self.__get_income_range_counts()
         plt.figure(figsize=(10, 5))
         counts.plot(kind="bar", color="coral")
         plt.title(LanguagesControllerInstance.get_translation(language, "chart_title_income_frequency", "Client Frequency in Income Ranges"))
@@ -552,9 +619,7 @@ class ChartsController:
 
     def plot_income_relative_frequency(self, language: str):
         self.__apply_theme(language)
-        data = self.__get_data()
-        bins = pd.cut(data["income"], bins=10)
-        rel_freq = bins.value_counts(normalize=True).sort_index()
+        rel_freq = self.__get_income_range_counts(normalize=True)
         plt.figure(figsize=(10, 5))
         rel_freq.plot(kind="bar", color="purple")
         plt.title(LanguagesControllerInstance.get_translation(language, "chart_title_income_relative_frequency", "Relative Frequency of Incomes"))
@@ -564,20 +629,25 @@ class ChartsController:
 
     def plot_loan_pie(self, language: str):
         self.__apply_theme(language)
-        data = self.__get_data()
-        counts = data["loan_approved"].value_counts()
+        aggregates = self.__get_aggregates()
+        if aggregates is not None:
+            counts = pd.Series([aggregates.approval_counts[False], aggregates.approval_counts[True]])
+        else:
+            data = self.__get_data(["loan_approved"])
+            counts = data["loan_approved"].value_counts()
         plt.figure(figsize=(6, 6))
         plt.pie(counts, labels=[LanguagesControllerInstance.get_translation(language, "chart_label_rejected", "Rejected"), LanguagesControllerInstance.get_translation(language, "chart_label_approved", "Approved")], autopct="%1.1f%%", colors=["#ff9999", "#99ff99"])
         plt.title(LanguagesControllerInstance.get_translation(language, "chart_title_loan_pie", "Share of Approved and Rejected Loans"))
         return Response(self.__fig_to_bytes(plt), mimetype='image/png')
 
     def plot_loan_group_means(self, language: str):
-        data = self.__get_data()
         self.__apply_theme(language, style="whitegrid")
 
         cols = ["income", "credit_score", "loan_amount", "years_employed", "points"]
 
-        group_means = data.groupby("loan_approved")[cols].mean().T
+        groups = self.__get_group_metrics(["loan_approved"], [f"{c}:{f}" for c in cols for f in ("mean", "min", "max")])
+        group_means = groups[[f"{c}:mean" for c in cols]].T
+        group_means.index = cols
         rejected_label = LanguagesControllerInstance.get_translation(language, "chart_label_rejected", "Rejected")
         approved_label = LanguagesControllerInstance.get_translation(language, "chart_label_approved", "Approved")
         group_means.columns = [rejected_label, approved_label]
@@ -585,8 +655,8 @@ class ChartsController:
         normalized_means = group_means.copy()
 
         for col in group_means.index:
-            min_val = data[col].min()
-            max_val = data[col].max()
+            min_val = groups[f"{col}:min"].min()
+            max_val = groups[f"{col}:max"].max()
 
             if (max_val - min_val) != 0:
                 normalized_means.loc[col, rejected_label] = (normalized_means.loc[col, rejected_label] - min_val) / (max_val - min_val)
@@ -637,7 +707,7 @@ class ChartsController:
 
     def plot_income_radar(self, language: str):
         self.__apply_theme(language)
-        data = self.__get_data()
+        data = self.__get_data(["income", "loan_amount", "credit_score", "years_employed"])
 
         cols = ["income", "loan_amount", "credit_score", "years_employed"]
 
@@ -687,11 +757,12 @@ class ChartsController:
 
     def plot_age_pyramid(self, language: str):
         self.__apply_theme(language)
-        data = self.__get_data()
+        data = self.__get_data(["years_employed"])
+        index = self.__get_approval_index()
         bins = range(0, int(data["years_employed"].max()) + 5, 5)
 
-        approved_counts = pd.cut(data[data["loan_approved"] == True]["years_employed"], bins=bins).value_counts().sort_index()
-        rejected_counts = pd.cut(data[data["loan_approved"] == False]["years_employed"], bins=bins).value_counts().sort_index()
+        approved_counts = pd.cut(data["years_employed"].iloc[index.approved], bins=bins).value_counts().sort_index()
+        rejected_counts = pd.cut(data["years_employed"].iloc[index.rejected], bins=bins).value_counts().sort_index()
 
         bin_labels = [f"{int(interval.left)}-{int(interval.right)}" for interval in approved_counts.index]
 
@@ -719,7 +790,7 @@ class ChartsController:
 
     def plot_income_line(self, language: str):
         self.__apply_theme(language)
-        data = self.__get_data().sort_values("income")
+        data = self.__get_data(["income"]).sort_values("income")
         plt.figure(figsize=(8, 5))
         plt.plot(data["income"].to_numpy(), marker="o")
         plt.title(LanguagesControllerInstance.get_translation(language, "chart_title_income_line", "Line Plot of Income Values"))
@@ -766,7 +837,7 @@ class ChartsController:
         return Response(img_bytes, mimetype='image/png')
 
     def plot_kurtosis_comparison(self, language: str):
-        data = self.__get_data()
+        data = self.__get_data(["income", "loan_amount", "credit_score", "years_employed"])
         self.__apply_theme(language, style="whitegrid")
 
         num_cols = data.select_dtypes(include=[np.number]).columns.tolist()
@@ -814,16 +885,26 @@ class ChartsController:
 
     def plot_normal_distribution(self, language: str):
         self.__apply_theme(language)
-        data = self.__get_data()
-
-        income = data['income'].dropna()
-        mean_val = income.mean()
-        std_val = income.std()
+        aggregates = self.__get_aggregates()
+        actual_label = LanguagesControllerInstance.get_translation(language, 'chart_label_actual_data', 'Actual Data')
 
         plt.figure(figsize=(8, 5))
-        plt.hist(income, bins=50, density=True, alpha=0.6, color='skyblue', label=LanguagesControllerInstance.get_translation(language, 'chart_label_actual_data', 'Actual Data'))
-
-        x = np.linspace(income.min(), income.max(), 400)
+        if aggregates is not None:
+            income_agg = aggregates.get_column('income')
+            mean_val = income_agg.moments.get_mean()
+            std_val = income_agg.moments.get_deviation()
+            min_val, max_val = income_agg.moments.min, income_agg.moments.max
+            edges, counts = income_agg.histogram.get_bins(50)
+            plt.stairs(counts / (counts.sum() * np.diff(edges)), edges, fill=True, alpha=0.6, color='skyblue', label=actual_label)
+        else:
+            data = self.__get_data(["income"])
+            income = data['income'].dropna()
+            mean_val = income.mean()
+            std_val = income.std()
+            min_val, max_val = income.min(), income.max()
+            plt.hist(income, bins=50, density=True, alpha=0.6, color='skyblue', label=actual_label)
+
+        x = np.linspace(min_val, max_val, 400)
         y = norm.pdf(x, mean_val, std_val)
         plt.plot(x, y, 'r-', linewidth=2, label=f'N({mean_val:.0f}, {std_val:.0f})')
 
@@ -836,7 +917,7 @@ class ChartsController:
 
     def plot_student_t_distribution(self, language: str):
         self.__apply_theme(language)
-        data = self.__get_data()
+        data = self.__get_data(["income"])
 
         income = data['income'].dropna()
         standardized = (income - income.mean()) / income.std()
@@ -860,21 +941,24 @@ class ChartsController:
         plt.tight_layout()
         return Response(self.__fig_to_bytes(plt), mimetype='image/png')
 
-    def plot_quantiles_distance(self, language: str):
+    def plot_quantiles_distance(self, language: str, eps: Optional[float] = None):
         self.__apply_theme(language)
 
         col = request.args.get('column', None) if request else None
         compare_flag = str(request.args.get('compare', '0')).lower() in ('1', 'true', 'yes') if request else False
         columns_param = request.args.get('columns', None) if request else None
 
-        def distances_for(series: pd.Series):
+        def distances_for(series: pd.Series, mode: str, column: str):
             s = pd.to_numeric(series, errors='coerce').dropna()
             if s.empty:
                 return None
             mean_val = s.mean()
-            q1 = s.quantile(0.25)
-            q2 = s.quantile(0.5)
-            q3 = s.quantile(0.75)
+            if eps is not None:
+                q1, q2, q3 = FilesControllerInstance.get_approx_quantiles(column, [0.25, 0.5, 0.75], eps, self.__get_dataset_name(), mode)
+            else:
+                q1 = s.quantile(0.25)
+                q2 = s.quantile(0.5)
+                q3 = s.quantile(0.75)
             return [abs(q1 - mean_val), abs(q2 - mean_val), abs(q3 - mean_val)]
 
 
@@ -893,7 +977,7 @@ class ChartsController:
             'points': LanguagesControllerInstance.get_translation(language, 'chart_label_points', 'Points') if hasattr(LanguagesControllerInstance, 'get_translation') else 'Points',
         }
 
-        data = self.__get_data()
+        data = self.__get_data(["income", "loan_amount", "credit_score", "years_employed", "points"])
         all_cols = ['income', 'loan_amount', 'credit_score', 'years_employed', 'points']
 
         if columns_param:
@@ -904,8 +988,8 @@ class ChartsController:
 
         if col is None:
             if compare_flag:
-                normal_df = FilesControllerInstance.get_data()
-                prog_df = FilesControllerInstance.get_prognosis_only_data()
+                normal_df = FilesControllerInstance.get_data(self.__get_dataset_name())
+                prog_df = FilesControllerInstance.get_prognosis_only_data(self.__get_dataset_name())
                 if normal_df is None or prog_df is None:
                     raise ValueError("Data not available for comparison")
 
@@ -921,8 +1005,8 @@ class ChartsController:
                     if c not in normal_df.columns or c not in prog_df.columns:
                         ax.axis('off')
                         continue
-                    d_normal = distances_for(normal_df[c])
-                    d_prog = distances_for(prog_df[c])
+                    d_normal = distances_for(normal_df[c], 'normal', c)
+                    d_prog = distances_for(prog_df[c], 'prognosis', c)
                     if d_normal is None or d_prog is None:
                         ax.axis('off')
                         continue
@@ -952,7 +1036,7 @@ class ChartsController:
                     axes = [axes]
                 for idx, c in enumerate(available_cols):
                     ax = axes[idx]
-                    d = distances_for(data[c])
+                    d = distances_for(data[c], self.__get_mode(), c)
                     if d is None:
                         ax.axis('off')
                         continue
@@ -971,12 +1055,12 @@ class ChartsController:
 
         if compare_flag:
 
-            normal_df = FilesControllerInstance.get_data()
-            prog_df = FilesControllerInstance.get_prognosis_only_data()
+            normal_df = FilesControllerInstance.get_data(self.__get_dataset_name())
+            prog_df = FilesControllerInstance.get_prognosis_only_data(self.__get_dataset_name())
             if normal_df is None or prog_df is None or col not in normal_df.columns or col not in prog_df.columns:
                 raise ValueError("Selected column not available for comparison")
-            d_normal = distances_for(normal_df[col])
-            d_prog = distances_for(prog_df[col])
+            d_normal = distances_for(normal_df[col], 'normal', col)
+            d_prog = distances_for(prog_df[col], 'prognosis', col)
             if d_normal is None or d_prog is None:
                 raise ValueError("No numeric data to compute distances")
 
@@ -998,7 +1082,7 @@ class ChartsController:
 
             if col not in data.columns:
                 col = 'income'
-            d = distances_for(data[col])
+            d = distances_for(data[col], self.__get_mode(), col)
             if d is None:
                 raise ValueError("No numeric data available for selected column")
             plt.figure(figsize=(7, 5))
@@ -5,29 +5,26 @@ import matplotlib.pyplot as plt
 from matplotlib.patches import Circle, Rectangle, Polygon
 import textwrap
 from flask import Response
-from typing import Optional, cast
+from typing import Optional, Union, cast
 from app.controllers.FilesController import FilesControllerInstance
 from app.controllers.LanguagesController import LanguagesControllerInstance
 from app.controllers.FontController import FontControllerInstance
+from app.utils.merged_view import MergedView
 
 class ChernoffController:
-    __data: Optional[pd.DataFrame] = None
-
-    def __get_data(self, mode: str = 'normal') -> Optional[pd.DataFrame]:
+    def __get_data(self, mode: str = 'normal', dataset: Optional[str] = None) -> Union[pd.DataFrame, MergedView, None]:
         mode_norm = (mode or 'normal').strip().lower()
         if mode_norm == 'prognosis':
-            data = FilesControllerInstance.get_prognosis_only_data()
+            data = FilesControllerInstance.get_prognosis_only_data(dataset)
             if data is None:
                 raise ValueError('No data loaded')
             return data
         if mode_norm == 'merged':
-            data = FilesControllerInstance.get_prognosis_data()
+            data = FilesControllerInstance.get_prognosis_data(dataset)
             if data is None:
                 raise ValueError('No data loaded')
             return data
-        if self.__data is None:
-            self.__data = FilesControllerInstance.get_data()
-        return self.__data
+        return FilesControllerInstance.get_data(dataset)
 
     def __fig_to_bytes(self, fig) -> bytes:
         buf = io.BytesIO()
@@ -35,9 +32,16 @@ class ChernoffController:
         plt.close(fig)
         return buf.getvalue()
 
-    def generate_chernoff_faces(self, language: str = "en", mode: str = 'normal', single_face: Optional[str] = None, selected_columns: Optional[str] = None):
+    def __get_quartiles(self, series, column: str, mode: str, dataset: Optional[str], eps: Optional[float]):
+        """Exact quartiles, or sketch-backed ones with rank error eps when it is given."""
+        if eps is not None:
+            return tuple(FilesControllerInstance.get_approx_quantiles(column, [0.25, 0.5, 0.75], eps, dataset, (mode or 'normal').strip().lower()))
+        return series.quantile(0.25), series.quantile(0.50), series.quantile(0.75)
+
+    def generate_chernoff_faces(self, language: str = "en", mode: str = 'normal', single_face: Optional[str] = None, selected_columns: Optional[str] = None, dataset: Optional[str] = None,
+                                eps: Optional[float] = None):
         plt.close('all')
-        data = self.__get_data(mode)
+        data = self.__get_data(mode, dataset)
 
         if data is None:
             fig, ax = plt.subplots(figsize=(6, 6))
@@ -83,7 +87,7 @@ class ChernoffController:
             for feature, col_name in features_map.items():
                 if col_name in data.columns:
                     available_features[feature] = col_name
-                    quartiles[feature] = self.__get_quartile(data[col_name])
+                    quartiles[feature] = self.__get_quartile(self.__get_quartiles(data[col_name], col_name, mode, dataset, eps), data[col_name].mean())
                     means[feature] = data[col_name].mean()
                 else:
                     quartiles[feature] = 'q2'
@@ -106,9 +110,7 @@ class ChernoffController:
                 fig, axes = plt.subplots(1, num_cols, figsize=(4 * num_cols, 6))
 
             for idx, col in enumerate(cols):
-                q1 = data[col].quantile(0.25)
-                q2 = data[col].quantile(0.50)
-                q3 = data[col].quantile(0.75)
+                q1, q2, q3 = self.__get_quartiles(data[col], col, mode, dataset, eps)
                 mean = data[col].mean()
 
                 distances = {
@@ -289,11 +291,8 @@ class ChernoffController:
 
         return Response(self.__fig_to_bytes(fig), mimetype='image/png')
 
-    def __get_quartile(self, series):
-        q1 = series.quantile(0.25)
-        q2 = series.quantile(0.50)
-        q3 = series.quantile(0.75)
-        mean = series.mean()
+    def __get_quartile(self, quartiles, mean):
+        q1, q2, q3 = quartiles
         distances = {
             'q1': abs(mean - q1),
             'q2': abs(mean - q2),
@@ -1,17 +1,28 @@
+from app import app
 from app.controllers.FilesController import FilesControllerInstance
-from typing import Any, Dict, Optional
+from app.utils.filters import Predicate, parse_filters
+from app.utils.pagination import DEFAULT_PER_PAGE, Cursor, clamp_per_page, decode_cursor, encode_cursor
+from app.utils.response_cache import CachedResponse, ResponseCache
+from app.utils.merged_view import MergedView
+from app.utils.row_index import RowIndexCache, RowOrder, SortSpec, parse_sort
+from app.utils.schema import BOOL_LABELS
+from app.utils.sqlite_store import SqliteStore
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import io
+import os
+import hashlib
+import importlib.util
 import numpy as np
+import pandas as pd
 
 
 class DataController:
-    PAGE_LIMIT = 10
-
-    __BOOL_LABELS: Dict[str, Dict[bool, str]] = {
-        "en": {True: "Yes", False: "No"},
-        "pl": {True: "Tak", False: "Nie"},
-        "de": {True: "Ja", False: "Nein"},
-        "zh": {True: "是", False: "否"},
-        "ko": {True: "예", False: "아니오"},
+    PAGE_LIMIT = DEFAULT_PER_PAGE
+    EXPORT_CHUNK_ROWS = int(os.environ.get('EXPORT_CHUNK_ROWS', '10000'))
+    EXPORT_FORMATS: Dict[str, str] = {
+        "csv": "text/csv",
+        "ndjson": "application/x-ndjson",
+        "arrow": "application/vnd.apache.arrow.stream",
     }
 
     __HEADER_LABELS: Dict[str, Dict[str, str]] = {
@@ -80,101 +91,411 @@ class DataController:
         "ko": {"normal": "일반", "prognosis": "예측"},
     }
 
+    # label arrays indexed by the bool value (0 = False, 1 = True), built once per language
+    __BOOL_LABEL_ARRAYS: Dict[str, np.ndarray] = {
+        language: np.array([labels[False], labels[True]], dtype=object) for language, labels in BOOL_LABELS.items()
+    }
+
     @staticmethod
-    def __to_bool(value: Any) -> Optional[bool]:
-        if isinstance(value, (bool, np.bool_)):
-            return bool(value)
-        if isinstance(value, (int, np.integer)):
-            if value in (0, 1):
-                return bool(value)
-        if isinstance(value, str):
-            lowered = value.strip().lower()
-            if lowered in ("true", "yes", "y", "1", "tak", "ja", "是", "예"):
-                return True
-            if lowered in ("false", "no", "n", "0", "nie", "nein", "否", "아니오"):
-                return False
-        return None
+    def __localize_dataset_column(values: pd.Series, labels: Dict[str, str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Localized labels and lower-case codes of the dataset column, mapped once per distinct value."""
+        codes, uniques = pd.factorize(values, use_na_sentinel=False)
+        unique_codes = np.array([str(v).strip().lower() for v in uniques], dtype=object)
+        unique_labels = np.array([labels.get(code, value) for code, value in zip(unique_codes, uniques)], dtype=object)
+        return unique_labels[codes], unique_codes[codes]
 
     @staticmethod
-    def __localize_value(column: str, value: Any, language: Optional[str]) -> Any:
+    def __localize_frame(frame: pd.DataFrame, language: Optional[str], mode: str, with_dataset: bool = True) -> pd.DataFrame:
+        """
+        Column-wise localization of a page (or a whole export): loan_approved is mapped through
+        the per-language label array by vectorized indexing and the dataset column through its
+        distinct values, instead of touching every cell of every record.
+        with_dataset=False leaves out the dataset/dataset_code columns (projected away).
+        """
+        frame = frame.copy(deep=False)
+        if with_dataset and "dataset" not in frame.columns:
+            frame["dataset"] = "normal"
         if not language:
-            return value
-
-        if column == "loan_approved":
-            normalized = DataController.__to_bool(value)
-            if normalized is not None:
-                labels = DataController.__BOOL_LABELS.get(
-                    language, DataController.__BOOL_LABELS.get("en", {})
-                )
-                return labels.get(normalized, value)
-
-        return value
+            return frame
+        # loan_approved is normalized to a real bool at ingest (see to_bool_series)
+        if "loan_approved" in frame.columns and pd.api.types.is_bool_dtype(frame["loan_approved"].dtype):
+            labels = DataController.__BOOL_LABEL_ARRAYS.get(language, DataController.__BOOL_LABEL_ARRAYS["en"])
+            frame["loan_approved"] = labels[frame["loan_approved"].to_numpy(dtype=np.int8)]
+        if not with_dataset:
+            return frame
+        dataset_labels = DataController.__DATASET_LABELS.get(language, DataController.__DATASET_LABELS.get("en", {}))
+        localized, codes = DataController.__localize_dataset_column(frame["dataset"], dataset_labels)
+        frame["dataset"] = localized
+        if mode != "normal":
+            frame["dataset_code"] = codes
+        return frame
 
     @staticmethod
-    def get_data_headers() -> list:
-        data = FilesControllerInstance.get_data()
-        if data is not None:
-            return list(data.columns)
+    def get_data_headers(dataset: Optional[str] = None) -> list:
+        columns = FilesControllerInstance.get_columns(dataset)
+        if columns is not None:
+            return columns
         raise ValueError("No data loaded")
 
     @staticmethod
-    def get_data_headers_localized(language: str) -> Dict[str, str]:
-        data = FilesControllerInstance.get_data()
-        if data is None:
+    def get_data_headers_localized(language: str, dataset: Optional[str] = None) -> Dict[str, str]:
+        columns = FilesControllerInstance.get_columns(dataset)
+        if columns is None:
             raise ValueError("No data loaded")
         labels = DataController.__HEADER_LABELS.get(language, DataController.__HEADER_LABELS.get("en", {}))
         result: Dict[str, str] = {}
-        for col in data.columns:
+        for col in columns:
             result[col] = labels.get(col, str(col))
 
         if 'dataset' not in result and 'dataset' in labels:
             result['dataset'] = labels['dataset']
         return result
 
+    __row_index = RowIndexCache()
+    __page_cache = ResponseCache()
+
+    @staticmethod
+    def __get_cursor_scope(dataset: str, version: int, mode: str, sort: Optional[str], filters: Optional[List[str]]) -> str:
+        listing = "\n".join([dataset, str(version), mode, sort or ""] + sorted(filters or []))
+        return hashlib.sha1(listing.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def __get_page_bounds(page: int, per_page: int, cursor: Optional[Cursor], order: Optional[RowOrder]) -> Tuple[int, int]:
+        """
+        Range [start, end) of the requested page within the listing. With a cursor the range is
+        found from the boundary row id (keyset), so deep pages cost the same as the first one.
+        """
+        if cursor is None:
+            start = (page - 1) * per_page
+            return start, start + per_page
+        index = order.index_of(cursor.row_id) if order is not None else cursor.row_id
+        if cursor.direction == "next":
+            return index + 1, index + 1 + per_page
+        return max(0, index - per_page), index
+
+    @staticmethod
+    def __read_store_page(store: SqliteStore, page: int, per_page: int, cursor: Optional[Cursor], sort: Optional[SortSpec],
+                          predicates: List[Predicate], columns: Optional[List[str]]) -> Tuple[int, int, pd.DataFrame]:
+        """
+        A sorted/filtered page of a SQLite dataset pushed down as WHERE / ORDER BY / LIMIT: page numbers
+        use OFFSET, cursors a keyset bound on (sort value, row id). Returns the listing total, the
+        page's start index and its rows (indexed by row id); no whole column is read.
+        """
+        total = store.count_rows(predicates)
+        if cursor is None:
+            start = (page - 1) * per_page
+            return total, start, store.get_listing(sort, predicates, columns, per_page, offset=start)
+        index = store.get_listing_rank(sort, predicates, cursor.row_id)
+        if cursor.direction == "next":
+            return total, index + 1, store.get_listing(sort, predicates, columns, per_page, after=cursor.row_id)
+        start = max(0, index - per_page)
+        return total, start, store.get_listing(sort, predicates, columns, index - start, before=cursor.row_id)
+
     @staticmethod
-    def get_data(page: int = 1, language: Optional[str] = None, mode: str = "normal") -> dict:
+    def __parse_columns(columns: Optional[str], available: List[str]) -> Optional[List[str]]:
+        """Comma-separated projection ('income,credit_score'); None keeps every column."""
+        if not columns or not columns.strip():
+            return None
+        selected: List[str] = []
+        for column in (c.strip() for c in columns.split(",")):
+            if not column or column in selected:
+                continue
+            if column not in available and column != "dataset":
+                raise ValueError(f"Unknown column '{column}'")
+            selected.append(column)
+        return selected
+
+    @staticmethod
+    def __read_rows(data: Any, start: int, end: int, row_ids: Optional[np.ndarray], columns: Optional[List[str]]) -> pd.DataFrame:
+        """
+        Rows [start, end) of the file order, or the given row ids, projected to the columns
+        before anything is copied: views (MergedView, SqliteStore) only stitch/select those.
+        """
+        if columns is not None:
+            columns = [c for c in columns if c in data.columns]
+            if not columns:
+                return pd.DataFrame(index=range(len(row_ids) if row_ids is not None else max(0, end - start)))
+        if isinstance(data, pd.DataFrame):
+            frame = data.iloc[start:end] if row_ids is None else data.take(row_ids)
+            return frame if columns is None else frame[columns]
+        return data.get_rows(start, end, columns) if row_ids is None else data.take(row_ids, columns)
+
+    @staticmethod
+    def __restore_integers(frame: pd.DataFrame, data: Any, row_ids: np.ndarray) -> pd.DataFrame:
+        """
+        Merged rows stitch the integer columns of the normal rows with the float prognosis values
+        into float64; the normal rows get their integers back (Python ints in an object column),
+        so they serialize as 389 like in normal mode instead of 389.0.
+        """
+        if not isinstance(data, MergedView) or frame.empty:
+            return frame
+        normal = np.asarray(data.dataset_codes[row_ids] == 0)
+        if not normal.any():
+            return frame
+        frame = frame.copy(deep=False)
+        for column in data.get_widened_columns():
+            if column in frame.columns and pd.api.types.is_float_dtype(frame[column].dtype):
+                floats = frame[column].to_numpy()
+                values = floats.astype(object)
+                values[normal] = floats[normal].astype(np.int64).tolist()
+                frame[column] = values
+        return frame
+
+    @staticmethod
+    def invalidate_caches(dataset: str, version: int) -> None:
+        DataController.__row_index.invalidate(dataset, version)
+        DataController.__page_cache.invalidate(dataset, version)
+
+    @staticmethod
+    def get_data(page: int = 1, language: Optional[str] = None, mode: str = "normal", dataset: Optional[str] = None,
+                 per_page: Optional[int] = None, cursor: Optional[str] = None, sort: Optional[str] = None,
+                 filters: Optional[List[str]] = None, columns: Optional[str] = None, fmt: str = "records") -> dict:
+        """
+        One page of records, addressed by page number or by an opaque cursor from a previous
+        response (next_cursor / prev_cursor). per_page is capped at DATA_MAX_PER_PAGE.
+        sort ('income:desc') and filters ('credit_score>=700') are served from the sort
+        permutations and predicate masks cached per dataset version (see RowIndexCache), or
+        run as SQL for SQLite datasets (see SqliteStore.get_listing).
+        columns ('income,credit_score') projects the page before it is read and serialized.
+        fmt='columnar' returns data as {column: [values]} instead of a list of records.
+        """
+        per_page = clamp_per_page(per_page)
         mode_norm = (mode or "normal").strip().lower()
-        if mode_norm == "prognosis":
-            data = FilesControllerInstance.get_prognosis_only_data()
-        elif mode_norm == "merged":
+        if mode_norm not in ("prognosis", "merged"):
+            mode_norm = "normal"
+        version, data = FilesControllerInstance.get_frame(dataset, mode_norm)
+        return DataController.__get_page(version, data, page, language, mode_norm, dataset, per_page, cursor, sort, filters, columns, fmt)
 
-            data = FilesControllerInstance.get_prognosis_data()
-        else:
-            data = FilesControllerInstance.get_data()
+    @staticmethod
+    def __get_page(version: int, data: Any, page: int, language: Optional[str], mode_norm: str, dataset: Optional[str],
+                   per_page: int, cursor: Optional[str], sort: Optional[str], filters: Optional[List[str]],
+                   columns: Optional[str], fmt: str) -> dict:
+        """get_data on an already taken snapshot (version, data) with normalized mode and per_page."""
+        dataset_name = dataset or FilesControllerInstance.DEFAULT_DATASET
         if data is not None:
-            total_records = len(data)
-            start = (page - 1) * DataController.PAGE_LIMIT
-            end = start + DataController.PAGE_LIMIT
-            page_data = data.iloc[start:end]
-            if page_data.empty:
-                raise ValueError("No data found for this page")
-            records = page_data.to_dict(orient="records")
-            for row in records:
-                if "dataset" not in row:
-                    row["dataset"] = "normal"
-            if language:
-                localized_records = []
-                for row in records:
-                    localized_row = {k: DataController.__localize_value(k, v, language) for k, v in row.items()}
-
-                    if "dataset" in localized_row:
-                        labels = DataController.__DATASET_LABELS.get(language, DataController.__DATASET_LABELS.get("en", {}))
-                        val = str(localized_row["dataset"]).strip().lower()
-                        localized_row["dataset"] = labels.get(val, localized_row["dataset"])
-                        if mode_norm != "normal":
-                            localized_row["dataset_code"] = val
-                    localized_records.append(localized_row)
-                records = localized_records
+            available = list(data.columns)
+            sort_spec = parse_sort(sort, available)
+            predicates = parse_filters(filters, available)
+            projection = DataController.__parse_columns(columns, available)
+            scope = DataController.__get_cursor_scope(dataset_name, version, mode_norm, sort, filters)
+            position = decode_cursor(cursor, scope) if cursor else None
+            if isinstance(data, SqliteStore) and (sort_spec is not None or predicates):
+                total_records, start, page_data = DataController.__read_store_page(
+                    data, page, per_page, position, sort_spec, predicates, projection
+                )
+                end = start + len(page_data)
+                row_ids = page_data.index.to_numpy()
+                if len(row_ids) == 0 and start > 0:
+                    raise ValueError("No data found for this page")
+            else:
+                order = DataController.__row_index.get_order((dataset_name, version, mode_norm), data, sort_spec, predicates)
+                total_records = len(order) if order is not None else len(data)
+                start, end = DataController.__get_page_bounds(page, per_page, position, order)
+                end = min(end, total_records)
+                row_ids = np.arange(start, max(start, end)) if order is None else order.row_ids[start:end]
+                if len(row_ids) == 0 and start > 0:
+                    raise ValueError("No data found for this page")
+                page_data = DataController.__read_rows(data, start, end, None if order is None else row_ids, projection)
+                page_data = DataController.__restore_integers(page_data, data, row_ids)
+            with_dataset = projection is None or "dataset" in projection
+            localized = DataController.__localize_frame(page_data, language, mode_norm, with_dataset)
+            if fmt == "columnar":
+                # straight from the column arrays; the JSON provider encodes numpy arrays natively
+                records: Any = {str(c): localized[c].to_numpy() for c in localized.columns}
+            else:
+                records = localized.to_dict(orient="records")
             return {
                 "data": records,
                 "has_next": end < total_records,
-                "has_prev": page > 1,
+                "has_prev": start > 0,
                 "total": total_records,
-                "per_page": DataController.PAGE_LIMIT,
-                "page": page
+                "per_page": per_page,
+                "page": start // per_page + 1,
+                "next_cursor": encode_cursor(Cursor(scope, int(row_ids[-1]), "next")) if end < total_records else None,
+                "prev_cursor": encode_cursor(Cursor(scope, int(row_ids[0]), "prev")) if start > 0 else None,
             }
         raise ValueError("Dataset not loaded")
 
     @staticmethod
-    def get_prognosis_process_details() -> Dict[str, Any]:
-        return FilesControllerInstance.get_prognosis_process_details()
+    def search_data(query: str, mode: str = "normal", dataset: Optional[str] = None, page: int = 1, per_page: Optional[int] = None,
+                    match: str = "substring", fields: Optional[List[str]] = None) -> dict:
+        """
+        Paginated ids of the records whose name or city starts with (match='prefix') or contains
+        the query, case-insensitively. Ids are row positions in the frame served for the mode,
+        the same row ids /data cursors and sort listings use.
+        """
+        if not query or not query.strip():
+            raise ValueError("Missing search query")
+        per_page = clamp_per_page(per_page)
+        mode_norm = (mode or "normal").strip().lower()
+        if mode_norm not in ("prognosis", "merged"):
+            mode_norm = "normal"
+        version, row_ids = FilesControllerInstance.search(query, dataset, mode_norm, (match or "substring").strip().lower(), fields)
+        total = int(len(row_ids))
+        start = (page - 1) * per_page
+        end = min(start + per_page, total)
+        return {
+            "ids": [int(i) for i in row_ids[start:end]],
+            "has_next": end < total,
+            "has_prev": page > 1,
+            "total": total,
+            "per_page": per_page,
+            "page": page,
+            "version": version,
+        }
+
+    @staticmethod
+    def get_data_response(page: int = 1, language: Optional[str] = None, mode: str = "normal", dataset: Optional[str] = None,
+                          per_page: Optional[int] = None, cursor: Optional[str] = None, sort: Optional[str] = None,
+                          filters: Optional[List[str]] = None, columns: Optional[str] = None, fmt: str = "records") -> CachedResponse:
+        """
+        The encoded /data response body and its ETag. A page depends only on the dataset version
+        and the request parameters, so the bytes are cached (see ResponseCache) and repeated
+        requests skip slicing, localization and JSON encoding. The key and the page come from the
+        same snapshot, so a reload between the two cannot cache old rows under the new version;
+        mode and per_page are normalized first, so equivalent requests share one entry.
+        """
+        per_page = clamp_per_page(per_page)
+        mode_norm = (mode or "normal").strip().lower()
+        if mode_norm not in ("prognosis", "merged"):
+            mode_norm = "normal"
+        dataset_name = dataset or FilesControllerInstance.DEFAULT_DATASET
+        version, data = FilesControllerInstance.get_frame(dataset, mode_norm)
+        key = (dataset_name, version, mode_norm, language or "", page, per_page, cursor or "", sort or "",
+               tuple(filters or ()), columns or "", fmt)
+        cached = DataController.__page_cache.get(key)
+        if cached is not None:
+            return cached
+        result = DataController.__get_page(version, data, page, language, mode_norm, dataset, per_page, cursor, sort, filters, columns, fmt)
+        body = app.json.response({"success": True, "result": result}).get_data()
+        return DataController.__page_cache.put(key, body)
+
+    @staticmethod
+    def export_data(fmt: str = "csv", language: Optional[str] = None, mode: str = "normal", dataset: Optional[str] = None,
+                    sort: Optional[str] = None, filters: Optional[List[str]] = None, columns: Optional[str] = None) -> Tuple[Iterator[bytes], str]:
+        """
+        Streams the whole listing (optionally sorted/filtered like /data) as CSV, NDJSON or an
+        Arrow IPC stream. Rows are read, localized and serialized EXPORT_CHUNK_ROWS at a time
+        from the snapshot taken here, so memory stays at one chunk and a reload mid-export
+        does not mix versions. Returns the byte generator and its mimetype.
+        """
+        fmt = (fmt or "csv").strip().lower()
+        if fmt not in DataController.EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format '{fmt}' (expected one of {', '.join(DataController.EXPORT_FORMATS)})")
+        if fmt == "arrow":
+            # only probed here: pyarrow is a requirement, but importing it costs every worker startup time
+            if importlib.util.find_spec("pyarrow") is None:
+                raise ValueError("Arrow export needs 'pyarrow' (see requirements.txt), which is not installed")
+        mode_norm = (mode or "normal").strip().lower()
+        if mode_norm not in ("prognosis", "merged"):
+            mode_norm = "normal"
+        dataset_name = dataset or FilesControllerInstance.DEFAULT_DATASET
+        version, data = FilesControllerInstance.get_frame(dataset, mode_norm)
+        if data is None:
+            raise ValueError("Dataset not loaded")
+        available = list(data.columns)
+        projection = DataController.__parse_columns(columns, available)
+        with_dataset = projection is None or "dataset" in projection
+        sort_spec, predicates = parse_sort(sort, available), parse_filters(filters, available)
+
+        def store_chunks() -> Iterator[pd.DataFrame]:
+            # keyset walk over the SQL listing, one chunk per query
+            after = None
+            while True:
+                chunk = data.get_listing(sort_spec, predicates, projection, DataController.EXPORT_CHUNK_ROWS, after=after)
+                if not len(chunk.index):
+                    return
+                after = int(chunk.index[-1])
+                yield DataController.__localize_frame(chunk, language, mode_norm, with_dataset)
+
+        pushdown = isinstance(data, SqliteStore) and (sort_spec is not None or bool(predicates))
+        order = None if pushdown else DataController.__row_index.get_order((dataset_name, version, mode_norm), data, sort_spec, predicates)
+
+        def chunks() -> Iterator[pd.DataFrame]:
+            if pushdown:
+                yield from store_chunks()
+                return
+            total = len(order) if order is not None else len(data)
+            for start in range(0, total, DataController.EXPORT_CHUNK_ROWS):
+                end = min(start + DataController.EXPORT_CHUNK_ROWS, total)
+                row_ids = np.arange(start, end) if order is None else order.row_ids[start:end]
+                chunk = DataController.__read_rows(data, start, end, None if order is None else row_ids, projection)
+                if fmt != "arrow":
+                    chunk = DataController.__restore_integers(chunk, data, row_ids)
+                yield DataController.__localize_frame(chunk, language, mode_norm, with_dataset)
+
+        if fmt == "arrow":
+            float_columns = {str(c) for c, dtype in data.dtypes.items() if pd.api.types.is_float_dtype(dtype)}
+            return DataController.__export_arrow(chunks(), float_columns), DataController.EXPORT_FORMATS[fmt]
+        serializers = {"csv": DataController.__export_csv, "ndjson": DataController.__export_ndjson}
+        return serializers[fmt](chunks()), DataController.EXPORT_FORMATS[fmt]
+
+    @staticmethod
+    def __export_csv(chunks: Iterator[pd.DataFrame]) -> Iterator[bytes]:
+        header = True
+        for chunk in chunks:
+            yield chunk.to_csv(sep=";", index=False, header=header).encode("utf-8")
+            header = False
+
+    @staticmethod
+    def __export_ndjson(chunks: Iterator[pd.DataFrame]) -> Iterator[bytes]:
+        # encoded by the app's JSON provider, so every line matches the records served by /data
+        for chunk in chunks:
+            records = chunk.to_dict(orient="records")
+            if records:
+                yield ("\n".join(app.json.dumps(record) for record in records) + "\n").encode("utf-8")
+
+    @staticmethod
+    def __get_arrow_dtypes(chunk: pd.DataFrame, float_columns: set) -> Dict[str, Any]:
+        # one type per column for the whole stream: chunks of a merged view can be int in one part and float
+        # in the other, and dictionary columns go out as plain strings because an IPC stream cannot replace
+        # a dictionary between batches
+        dtypes: Dict[str, Any] = {}
+        for column in chunk.columns:
+            dtype = chunk[column].dtype
+            if pd.api.types.is_bool_dtype(dtype):
+                continue
+            if pd.api.types.is_numeric_dtype(dtype):
+                dtypes[column] = np.float64 if column in float_columns or pd.api.types.is_float_dtype(dtype) else np.int64
+            else:
+                dtypes[column] = "string"
+        return dtypes
+
+    @staticmethod
+    def __export_arrow(chunks: Iterator[pd.DataFrame], float_columns: set) -> Iterator[bytes]:
+        import pyarrow as pa
+        sink = io.BytesIO()
+        writer = None
+        schema = None
+        for chunk in chunks:
+            chunk = chunk.astype(DataController.__get_arrow_dtypes(chunk, float_columns))
+            batch = pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False)
+            if writer is None:
+                schema = batch.schema
+                writer = pa.ipc.new_stream(sink, schema)
+            writer.write_batch(batch)
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+        if writer is not None:
+            writer.close()
+            yield sink.getvalue()
+
+    @staticmethod
+    def get_prognosis_process_details(dataset: Optional[str] = None) -> Dict[str, Any]:
+        return FilesControllerInstance.get_prognosis_process_details(dataset)
+
+    @staticmethod
+    def get_datasets() -> List[Dict[str, Any]]:
+        return FilesControllerInstance.list_datasets()
+
+    @staticmethod
+    def get_memory_report() -> List[Dict[str, Any]]:
+        return FilesControllerInstance.get_memory_report()
+
+    @staticmethod
+    def upload_dataset(stream: Any, content_length: Optional[int] = None, storage: Optional[str] = None) -> Dict[str, Any]:
+        return FilesControllerInstance.register_upload(stream, content_length, storage)
+
+
+FilesControllerInstance.add_reload_listener(DataController.invalidate_caches)
@@ -1,77 +1,655 @@
 import os
 import sys
+import time
+import threading
+import uuid
 import pandas as pd
 import numpy as np
 from pandas import DataFrame
-from typing import Union
+from collections import OrderedDict
+from functools import partial
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
 
 from app import app
-
-
-class FilesController:
-    def __init__(self):
-        self.__data_path = os.path.join(app.root_path, "models", "part_of_loan_approval.csv")
-        self.__data = None
-        self.__prognosis_cache = None
-        self.__prognosis_only_cache = None
-        self.__prognosis_file_path = os.path.join(app.root_path, "models", "prognosis_loan_approval.csv")
-        self.__load_data()
-
-    def __load_data(self) -> None:
-        if os.path.exists(self.__data_path):
-            try:
-                self.__data = pd.read_csv(self.__data_path, sep=';')
-            except Exception as ex:
-                print(f"[FilesController] Error: {ex}", file=sys.stderr)
+from app.utils.columnar_cache import read_csv_cached
+from app.utils.aggregates import KLLSketch, PartitionMoments, StreamingAggregates
+from app.utils.schema import SCHEMA_FINGERPRINT, ApprovalIndex, apply_compact_schema, build_approval_index, get_column_memory
+from app.utils.upload import ingest_csv_stream
+from app.utils.merged_view import MergedView
+from app.utils.search_index import SearchIndex
+from app.utils.sqlite_store import SqliteStore
+
+
+class DatasetSnapshot:
+    """
+    One published version of the dataset. Every frame derived from it (prognosis-only,
+    merged) is cached on the snapshot itself, so a reload never mixes old and new rows.
+    Frames arrive with loan_approved already normalized to bool (see to_bool_series); the
+    approved/rejected row positions of each frame are computed once and reused by consumers.
+    Datasets ingested in streaming mode carry only aggregates and no row-level frame;
+    datasets with SQLite storage carry a SqliteStore in place of the DataFrame.
+    The name/city search index of the base frame is built with the snapshot, the prognosis
+    one together with the prognosis frame; merged searches combine both.
+    Column moments are kept per partition (base rows, prognosis rows) and the merged ones
+    are combined from the two instead of being computed over the merged frame.
+    """
+
+    def __init__(self, version: int, data: Union[DataFrame, SqliteStore, None], prognosis_loader: Callable[[DataFrame], DataFrame],
+                 aggregates: Optional[StreamingAggregates] = None, moments: Optional[PartitionMoments] = None):
+        self.version = version
+        self.data = data
+        self.aggregates = aggregates
+        self.__partitions: Dict[str, PartitionMoments] = {"normal": moments} if moments is not None else {}
+        self.__sketches: Dict[Tuple[str, str, int], KLLSketch] = {}
+        self.__prognosis_loader = prognosis_loader
+        self.__prognosis_cache: Optional[MergedView] = None
+        self.__prognosis_only_cache: Optional[DataFrame] = None
+        self.__approval_index: Optional[ApprovalIndex] = None
+        self.__prognosis_approval_index: Optional[ApprovalIndex] = None
+        self.__merged_approval_index: Optional[ApprovalIndex] = None
+        self.__search_index: Optional[SearchIndex] = None
+        self.__prognosis_search_index: Optional[SearchIndex] = None
+        if isinstance(data, DataFrame):
+            self.__approval_index = build_approval_index(data)
+            self.__search_index = SearchIndex(data)
+            self.__memory_usage = (int(data.memory_usage(deep=True).sum()) + self.__get_index_bytes(self.__approval_index)
+                                   + self.__search_index.get_memory_usage())
+        elif data is not None:
+            self.__search_index = SearchIndex(data)
+            self.__memory_usage = self.__search_index.get_memory_usage()
         else:
-            print(f"[FilesController] Invalid data path: {self.__data_path}", file=sys.stderr)
-
-    def get_data(self) -> Union[DataFrame, None]:
-        return self.__data
-
-    def get_prognosis_data(self) -> Union[DataFrame, None]:
+            self.__memory_usage = aggregates.get_memory_usage() if aggregates is not None else 0
+        self.__lock = threading.Lock()
+
+    def get_columns(self) -> List[str]:
+        if self.data is not None:
+            return list(self.data.columns)
+        return list(self.aggregates.columns) if self.aggregates is not None else []
+
+    def get_rows(self) -> int:
+        if self.data is not None:
+            return int(len(self.data))
+        return self.aggregates.rows if self.aggregates is not None else 0
+
+    def get_memory_usage(self) -> int:
+        """Bytes held by the base frame plus any derived frames built so far."""
+        return self.__memory_usage
+
+    @staticmethod
+    def __get_index_bytes(index: Optional[ApprovalIndex]) -> int:
+        return int(index.approved.nbytes + index.rejected.nbytes) if index is not None else 0
+
+    def get_approval_index(self, mode: str = "normal") -> Optional[ApprovalIndex]:
+        """Approved/rejected row positions of the frame served for the mode (normal, prognosis, merged)."""
+        if self.data is None:
+            return None
+        if mode == "prognosis":
+            self.get_prognosis_only_data()
+            return self.__prognosis_approval_index
+        if mode == "merged":
+            self.get_prognosis_data()
+            return self.__merged_approval_index
+        if isinstance(self.data, SqliteStore):
+            return self.data.get_approval_index()
+        return self.__approval_index
+
+    def search(self, query: str, mode: str = "normal", match: str = "substring", columns: Optional[List[str]] = None) -> np.ndarray:
+        """Sorted row ids of the frame served for the mode whose name/city matches the query."""
+        if mode == "prognosis":
+            self.get_prognosis_only_data()
+            return self.__prognosis_search_index.search(query, match, columns)
+        normal = self.__search_index.search(query, match, columns)
+        if mode != "merged":
+            return normal
+        self.get_prognosis_data()
+        return np.concatenate([normal, self.__prognosis_search_index.search(query, match, columns) + len(self.data)])
+
+    def get_partition_moments(self, mode: str = "normal") -> Optional[PartitionMoments]:
         """
-        Returns the original dataset with additional synthetic rows appended.
-        Prognosis rows come from a pre-generated CSV for consistency across tabs.
-        If missing, they are generated deterministically and saved.
-        Includes a 'dataset' column: 'normal' for original rows, 'prognosis' for appended rows.
+        Moments of the frame served for the mode: built once per partition on first use, and for
+        merged mode combined from the normal and prognosis partitions in O(columns).
+        """
+        if self.data is None:
+            return None
+        partition = self.__partitions.get(mode)
+        if partition is not None:
+            return partition
+        if mode == "merged":
+            partition = self.get_partition_moments("normal").combine(self.get_partition_moments("prognosis"))
+        elif mode == "prognosis":
+            partition = PartitionMoments.from_frame(self.get_prognosis_only_data())
+        else:
+            partition = PartitionMoments.from_frame(self.data)
+        with self.__lock:
+            if mode not in self.__partitions:
+                self.__partitions[mode] = partition
+                self.__memory_usage += partition.get_memory_usage()
+            return self.__partitions[mode]
+
+    def get_quantile_sketch(self, mode: str, column: str, k: int) -> Optional[KLLSketch]:
         """
-        if self.__data is None:
+        KLL sketch of the column in the frame served for the mode, built once per partition and k;
+        the merged sketch is the merge of the normal and prognosis ones.
+        """
+        if self.data is None:
             return None
+        key = (mode, column, k)
+        sketch = self.__sketches.get(key)
+        if sketch is not None:
+            return sketch
+        if mode == "merged":
+            sketch = self.get_quantile_sketch("normal", column, k).copy()
+            sketch.merge(self.get_quantile_sketch("prognosis", column, k))
+        else:
+            frame = self.get_prognosis_only_data() if mode == "prognosis" else self.data
+            if column not in frame.columns:
+                raise ValueError(f"Column '{column}' not found in dataset.")
+            sketch = KLLSketch(k, seed=0)
+            sketch.update(frame[column].to_numpy(dtype=float, na_value=np.nan))
+        with self.__lock:
+            if key not in self.__sketches:
+                self.__sketches[key] = sketch
+                self.__memory_usage += sketch.get_memory_usage()
+            return self.__sketches[key]
+
+    def get_memory_report(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Per-column dtype and bytes of the base frame and of every derived frame built so far."""
+        report = {"data": get_column_memory(self.data) if isinstance(self.data, DataFrame) else {}}
+        if self.__prognosis_only_cache is not None:
+            report["prognosis"] = get_column_memory(self.__prognosis_only_cache)
+        if self.__prognosis_cache is not None:
+            report["merged"] = self.__prognosis_cache.get_column_memory()
+        return report
+
+    def get_prognosis_data(self) -> MergedView:
         if self.__prognosis_cache is not None:
             return self.__prognosis_cache
+        prognosis_df = self.get_prognosis_only_data()
+        with self.__lock:
+            if self.__prognosis_cache is not None:
+                return self.__prognosis_cache
+            base_index = self.get_approval_index("normal")
+            prognosis_index = self.__prognosis_approval_index
+            if base_index is not None and prognosis_index is not None:
+                offset = len(self.data)
+                self.__merged_approval_index = ApprovalIndex(
+                    np.concatenate([base_index.approved, prognosis_index.approved + offset]),
+                    np.concatenate([base_index.rejected, prognosis_index.rejected + offset]),
+                )
+            self.__prognosis_cache = MergedView(self.data, prognosis_df)
+            self.__memory_usage += int(self.__prognosis_cache.dataset_codes.nbytes) + self.__get_index_bytes(self.__merged_approval_index)
+            return self.__prognosis_cache
 
-        df = self.__data.copy()
-        if df.empty:
-            self.__prognosis_cache = df
-            return df
+    def get_prognosis_only_data(self) -> DataFrame:
+        if self.__prognosis_only_cache is not None:
+            return self.__prognosis_only_cache
+        with self.__lock:
+            if self.__prognosis_only_cache is not None:
+                return self.__prognosis_only_cache
+            df = self.data
+            if df.empty:
+                self.__prognosis_only_cache = df
+                self.__prognosis_approval_index = self.__approval_index
+                self.__prognosis_search_index = self.__search_index
+                return df
+
+            prognosis_df = self.__prognosis_loader(df)
+
+            missing = [col for col in df.columns if col not in prognosis_df.columns]
+            for col in missing:
+                prognosis_df[col] = np.nan
+            prognosis_df = prognosis_df[df.columns]
+            if missing:
+                prognosis_df = apply_compact_schema(prognosis_df)
+            self.__prognosis_approval_index = build_approval_index(prognosis_df)
+            self.__prognosis_search_index = SearchIndex(prognosis_df)
+            prognosis_df['dataset'] = pd.Categorical.from_codes(
+                np.ones(len(prognosis_df), dtype=np.int8), categories=list(MergedView.DATASET_LABELS)
+            )
+            self.__prognosis_only_cache = prognosis_df
+            self.__memory_usage += (int(prognosis_df.memory_usage(deep=True).sum()) + self.__get_index_bytes(self.__prognosis_approval_index)
+                                    + self.__prognosis_search_index.get_memory_usage())
+            return prognosis_df
+
+
+class DatasetSource:
+    """Registry entry: where a named dataset lives on disk and which snapshot of it is loaded."""
+
+    def __init__(self, name: str, data_path: str, prognosis_path: str, streaming: Optional[bool] = None, storage: str = "memory"):
+        self.name = name
+        self.data_path = data_path
+        self.prognosis_path = prognosis_path
+        self.streaming = streaming
+        self.storage = storage
+        self.snapshot: Optional[DatasetSnapshot] = None
+        self.signature: Optional[Tuple[Tuple[int, int], ...]] = None
+        self.lock = threading.Lock()
+
+    def get_source_signature(self) -> Tuple[Tuple[int, int], ...]:
+        signature = []
+        for path in (self.data_path, self.prognosis_path):
+            try:
+                st = os.stat(path)
+                signature.append((st.st_size, st.st_mtime_ns))
+            except OSError:
+                signature.append((-1, -1))
+        return tuple(signature)
 
 
-        prognosis_df = self.__load_or_generate_prognosis(df)
+class FilesController:
+    DEFAULT_DATASET = "part_of_loan_approval"
 
+    def __init__(self):
+        self.__models_dir = os.path.join(app.root_path, "models")
+        self.__sources: Dict[str, DatasetSource] = {}
+        self.__loaded: "OrderedDict[str, None]" = OrderedDict()
+        self.__memory_budget = int(float(os.environ.get('DATASET_MEMORY_BUDGET_MB', '1024')) * 1024 * 1024)
+        self.__streaming_threshold = int(float(os.environ.get('STREAMING_INGEST_THRESHOLD_MB', '512')) * 1024 * 1024)
+        self.__streaming_chunk_rows = int(os.environ.get('STREAMING_CHUNK_ROWS', '100000'))
+        self.__default_storage = os.environ.get('DATASET_STORAGE', 'memory')
+        self.__uploads_dir = os.environ.get('UPLOAD_DIR') or os.path.join(self.__models_dir, "uploads")
+        self.__upload_max_bytes = int(float(os.environ.get('UPLOAD_MAX_MB', '2048')) * 1024 * 1024)
+        self.__version = 0
+        self.__registry_lock = threading.RLock()
+        self.__reload_listeners: List[Callable[[str, int], None]] = []
+        self.__ready = threading.Event()
+        self.__startup_error: Optional[str] = None
+        self.__started = False
+
+        self.register_dataset(
+            "part_of_loan_approval",
+            os.path.join(self.__models_dir, "part_of_loan_approval.csv"),
+            os.path.join(self.__models_dir, "prognosis_loan_approval.csv"),
+        )
+        self.register_dataset(
+            "loan_approval",
+            os.path.join(self.__models_dir, "loan_approval.csv"),
+            os.path.join(self.__models_dir, "prognosis_full_loan_approval.csv"),
+        )
+        self.__register_existing_uploads()
+
+    def start(self) -> None:
+        """
+        Loads the default dataset on a background thread so the server can bind its port
+        while CSV parsing / prognosis generation runs. Idempotent; see is_ready().
+        """
+        with self.__registry_lock:
+            if self.__started:
+                return
+            self.__started = True
+        loader = threading.Thread(target=self.__load_default, name="FilesControllerLoader", daemon=True)
+        loader.start()
+
+    def __load_default(self) -> None:
+        started = time.monotonic()
+        try:
+            if self.__get_source_snapshot(self.DEFAULT_DATASET) is None:
+                self.__startup_error = f"Dataset '{self.DEFAULT_DATASET}' could not be loaded"
+        except Exception as ex:
+            self.__startup_error = str(ex)
+            print(f"[FilesController] Error: {ex}", file=sys.stderr)
+        finally:
+            self.__ready.set()
+        print(f"[FilesController] Default dataset ready after {time.monotonic() - started:.2f}s", file=sys.stderr)
+        self.__start_watcher(float(os.environ.get('DATA_RELOAD_INTERVAL', '5')))
+
+    def is_ready(self) -> bool:
+        return self.__ready.is_set()
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the startup load finished (successfully or not); starts it if nobody did."""
+        self.start()
+        return self.__ready.wait(timeout)
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.is_ready() and self.__startup_error is None,
+            "error": self.__startup_error,
+            "datasets": self.list_datasets(),
+        }
 
-        for col in df.columns:
-            if col in prognosis_df.columns and df[col].dtype == bool and prognosis_df[col].dtype != bool:
-                prognosis_df[col] = prognosis_df[col].astype(str).str.lower().isin(['true','1','yes','tak','ja','是','예'])
+    def register_dataset(self, name: str, data_path: str, prognosis_path: Optional[str] = None, streaming: Optional[bool] = None,
+                         storage: Optional[str] = None) -> None:
+        """
+        Adds a named dataset to the registry. Nothing is read until the dataset is first requested.
+        streaming=None picks chunked aggregate-only ingest for files above STREAMING_INGEST_THRESHOLD_MB.
+        storage is 'memory' (DataFrame) or 'sqlite' (indexed SQLite file, see SqliteStore);
+        it defaults to DATASET_STORAGE.
+        """
+        storage = storage or self.__default_storage
+        if storage not in ("memory", "sqlite"):
+            raise ValueError(f"Unknown storage '{storage}' (expected 'memory' or 'sqlite')")
+        if prognosis_path is None:
+            prognosis_path = os.path.join(os.path.dirname(data_path), f"prognosis_{name}.csv")
+        with self.__registry_lock:
+            if name in self.__sources:
+                raise ValueError(f"Dataset '{name}' is already registered")
+            self.__sources[name] = DatasetSource(name, data_path, prognosis_path, streaming, storage)
+
+    def __register_existing_uploads(self) -> None:
+        """Re-registers datasets uploaded before a restart; they are loaded lazily like the bundled ones."""
+        if not os.path.isdir(self.__uploads_dir):
+            return
+        for file_name in sorted(os.listdir(self.__uploads_dir)):
+            if not file_name.endswith(".csv") or file_name.startswith("prognosis_"):
+                continue
+            try:
+                self.register_dataset(os.path.splitext(file_name)[0], os.path.join(self.__uploads_dir, file_name))
+            except ValueError as ex:
+                print(f"[FilesController] Skipped upload {file_name}: {ex}", file=sys.stderr)
+
+    def register_upload(self, stream: BinaryIO, content_length: Optional[int] = None, storage: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Registers a ';'-separated loan CSV read from a stream as a new dataset and returns its id.
+        The body is parsed chunk by chunk while it is copied to UPLOAD_DIR, so a schema error
+        aborts the upload at the first bad row and at most one chunk is held besides the result.
+        Chunks go straight into the compact frame, into streaming aggregates when the declared
+        size is above STREAMING_INGEST_THRESHOLD_MB, or into a SQLite store for storage='sqlite'.
+        """
+        storage = storage or self.__default_storage
+        if storage not in ("memory", "sqlite"):
+            raise ValueError(f"Unknown storage '{storage}' (expected 'memory' or 'sqlite')")
+        name = f"upload_{uuid.uuid4().hex[:12]}"
+        data_path = os.path.join(self.__uploads_dir, f"{name}.csv")
+        streaming = storage == "memory" and content_length is not None and content_length > self.__streaming_threshold
+        pieces: List[DataFrame] = []
+        aggregates: List[StreamingAggregates] = []
+        moments: List[PartitionMoments] = []
+
+        def collect(chunk: DataFrame) -> None:
+            if storage == "sqlite":
+                return
+            if not streaming:
+                pieces.append(apply_compact_schema(chunk))
+                if not moments:
+                    moments.append(PartitionMoments.from_frame(pieces[-1]))
+                else:
+                    moments[0].update(pieces[-1])
+                return
+            if not aggregates:
+                numeric = [c for c in chunk.columns if pd.api.types.is_numeric_dtype(chunk[c]) and not pd.api.types.is_bool_dtype(chunk[c])]
+                aggregates.append(StreamingAggregates(list(chunk.columns), numeric))
+            aggregates[0].update(chunk)
+
+        rows = ingest_csv_stream(stream, data_path, sep=';', chunksize=self.__streaming_chunk_rows,
+                                 max_bytes=self.__upload_max_bytes, on_chunk=collect)
+        self.register_dataset(name, data_path, streaming=streaming, storage=storage)
+        source = self.__resolve_source(name)
+        with source.lock:
+            if storage == "sqlite":
+                if not self.__load_source(source):
+                    raise ValueError("Uploaded dataset could not be stored")
+            elif streaming:
+                self.__publish(source, source.get_source_signature(), None, aggregates[0])
+            else:
+                data = apply_compact_schema(pd.concat(pieces, ignore_index=True))
+                self.__publish(source, source.get_source_signature(), data, None, moments[0] if moments else None)
+        self.__enforce_memory_budget(keep=name)
+        print(f"[FilesController] Registered uploaded dataset '{name}' ({rows} rows, {storage})", file=sys.stderr)
+        return {
+            "id": name,
+            "rows": rows,
+            "storage": storage,
+            "streaming": streaming,
+            "version": source.snapshot.version if source.snapshot is not None else None,
+        }
 
-        df_out = df.copy()
-        df_out['dataset'] = 'normal'
-        prognosis_df = prognosis_df.copy()
-        prognosis_df['dataset'] = 'prognosis'
+    def list_datasets(self) -> List[Dict[str, Any]]:
+        with self.__registry_lock:
+            sources = list(self.__sources.values())
+        result = []
+        for source in sources:
+            snapshot = source.snapshot
+            result.append({
+                "name": source.name,
+                "default": source.name == self.DEFAULT_DATASET,
+                "loaded": snapshot is not None,
+                "streaming": snapshot.aggregates is not None if snapshot is not None else bool(source.streaming),
+                "storage": source.storage,
+                "version": snapshot.version if snapshot is not None else None,
+                "rows": snapshot.get_rows() if snapshot is not None else None,
+                "memory_bytes": snapshot.get_memory_usage() if snapshot is not None else 0,
+            })
+        return result
+
+    def get_memory_report(self) -> List[Dict[str, Any]]:
+        """Bytes per column of every loaded dataset, so the memory budget can be sized per worker."""
+        with self.__registry_lock:
+            sources = list(self.__sources.values())
+        result = []
+        for source in sources:
+            snapshot = source.snapshot
+            entry: Dict[str, Any] = {
+                "name": source.name,
+                "loaded": snapshot is not None,
+                "total_bytes": snapshot.get_memory_usage() if snapshot is not None else 0,
+                "frames": {},
+            }
+            if snapshot is not None and snapshot.data is not None:
+                entry["frames"] = snapshot.get_memory_report()
+                if isinstance(snapshot.data, SqliteStore):
+                    entry["disk_bytes"] = snapshot.data.get_disk_usage()
+            elif snapshot is not None and snapshot.aggregates is not None:
+                entry["frames"] = {"aggregates": {
+                    col: {"dtype": "aggregate", "bytes": snapshot.aggregates.get_column(col).get_memory_usage()}
+                    for col in snapshot.aggregates.numeric_columns
+                }}
+            result.append(entry)
+        return result
+
+    def __resolve_source(self, dataset: Optional[str]) -> DatasetSource:
+        name = dataset or self.DEFAULT_DATASET
+        source = self.__sources.get(name)
+        if source is None:
+            raise ValueError(f"Unknown dataset '{name}'")
+        return source
+
+    def __get_source_snapshot(self, dataset: Optional[str]) -> Optional[DatasetSnapshot]:
+        source = self.__resolve_source(dataset)
+        snapshot = source.snapshot
+        if snapshot is None:
+            with source.lock:
+                if source.snapshot is None:
+                    self.__load_source(source)
+                snapshot = source.snapshot
+        if snapshot is not None:
+            with self.__registry_lock:
+                if source.name in self.__loaded:
+                    self.__loaded.move_to_end(source.name)
+            self.__enforce_memory_budget(keep=source.name)
+        return snapshot
+
+    def __enforce_memory_budget(self, keep: str) -> None:
+        """
+        Evicts least recently used datasets until the loaded snapshots fit into
+        DATASET_MEMORY_BUDGET_MB. The dataset being served is never evicted; in-flight
+        requests keep their own reference to an evicted snapshot until they finish.
+        """
+        with self.__registry_lock:
+            usage = {}
+            for name in self.__loaded:
+                snapshot = self.__sources[name].snapshot
+                usage[name] = snapshot.get_memory_usage() if snapshot is not None else 0
+            total = sum(usage.values())
+            for name in list(self.__loaded):
+                if total <= self.__memory_budget:
+                    break
+                if name == keep:
+                    continue
+                source = self.__sources[name]
+                source.snapshot = None
+                source.signature = None
+                del self.__loaded[name]
+                total -= usage[name]
+                print(f"[FilesController] Evicted dataset '{name}' ({usage[name]} bytes) to stay within memory budget", file=sys.stderr)
+
+    def __load_source(self, source: DatasetSource) -> bool:
+        if not os.path.exists(source.data_path):
+            print(f"[FilesController] Invalid data path: {source.data_path}", file=sys.stderr)
+            return False
+        signature = source.get_source_signature()
+        streaming = source.streaming
+        if streaming is None:
+            streaming = os.path.getsize(source.data_path) > self.__streaming_threshold
+        data: Union[DataFrame, SqliteStore, None] = None
+        aggregates: Optional[StreamingAggregates] = None
+        try:
+            if source.storage == "sqlite":
+                data = SqliteStore.open_csv(source.data_path, sep=';', chunksize=self.__streaming_chunk_rows)
+            elif streaming:
+                aggregates = StreamingAggregates.from_csv(source.data_path, sep=';', chunksize=self.__streaming_chunk_rows)
+            else:
+                data = read_csv_cached(source.data_path, sep=';', transform=apply_compact_schema, schema=SCHEMA_FINGERPRINT)
+        except Exception as ex:
+            print(f"[FilesController] Error: {ex}", file=sys.stderr)
+            return False
+        self.__publish(source, signature, data, aggregates)
+        return True
+
+    def __publish(self, source: DatasetSource, signature: Tuple[Tuple[int, int], ...],
+                  data: Union[DataFrame, SqliteStore, None], aggregates: Optional[StreamingAggregates],
+                  moments: Optional[PartitionMoments] = None) -> None:
+        """Swaps in a new snapshot of the source under a fresh version and notifies the reload listeners."""
+        with self.__registry_lock:
+            self.__version += 1
+            version = self.__version
+            source.snapshot = DatasetSnapshot(version, data, partial(self.__load_or_generate_prognosis, source), aggregates, moments)
+            source.signature = signature
+            self.__loaded[source.name] = None
+            self.__loaded.move_to_end(source.name)
+        for listener in list(self.__reload_listeners):
+            try:
+                listener(source.name, version)
+            except Exception as ex:
+                print(f"[FilesController] Reload listener failed: {ex}", file=sys.stderr)
 
+    def __start_watcher(self, interval: float) -> None:
+        if interval <= 0:
+            return
+        watcher = threading.Thread(target=self.__watch_sources, args=(interval,), name="FilesControllerWatcher", daemon=True)
+        watcher.start()
 
-        for col in df_out.columns:
-            if col not in prognosis_df.columns:
-                prognosis_df[col] = np.nan
-        prognosis_df = prognosis_df[df_out.columns]
+    def __watch_sources(self, interval: float) -> None:
+        """
+        Polls the source CSVs of loaded datasets and reloads once a change has been stable
+        for one interval, so a file that is still being written is never parsed half-way.
+        A failed reload keeps the current snapshot and is not retried until the files change again.
+        """
+        pending: Dict[str, Tuple[Tuple[int, int], ...]] = {}
+        while True:
+            time.sleep(interval)
+            with self.__registry_lock:
+                sources = [self.__sources[name] for name in self.__loaded]
+            for source in sources:
+                signature = source.get_source_signature()
+                if source.signature is None or signature == source.signature:
+                    pending.pop(source.name, None)
+                    continue
+                if pending.get(source.name) != signature:
+                    pending[source.name] = signature
+                    continue
+                print(f"[FilesController] Source data of '{source.name}' changed, reloading", file=sys.stderr)
+                with source.lock:
+                    if not self.__load_source(source):
+                        source.signature = signature
+                pending.pop(source.name, None)
+
+    def reload(self, dataset: Optional[str] = None) -> bool:
+        source = self.__resolve_source(dataset)
+        with source.lock:
+            return self.__load_source(source)
+
+    def add_reload_listener(self, listener: Callable[[str, int], None]) -> None:
+        """Registers a callback invoked with (dataset, version) after every published snapshot."""
+        self.__reload_listeners.append(listener)
+
+    def get_snapshot(self, dataset: Optional[str] = None) -> Optional[DatasetSnapshot]:
+        return self.__get_source_snapshot(dataset)
+
+    def get_version(self, dataset: Optional[str] = None) -> int:
+        snapshot = self.__get_source_snapshot(dataset)
+        return snapshot.version if snapshot is not None else 0
+
+    def __get_frame_snapshot(self, dataset: Optional[str]) -> Optional[DatasetSnapshot]:
+        snapshot = self.__get_source_snapshot(dataset)
+        if snapshot is not None and snapshot.data is None:
+            raise ValueError(f"Dataset '{dataset or self.DEFAULT_DATASET}' was ingested in streaming mode; only summary statistics and distribution charts are available")
+        return snapshot
+
+    def get_aggregates(self, dataset: Optional[str] = None) -> Optional[StreamingAggregates]:
+        """Returns the chunk-built aggregates for streaming datasets, None for in-memory ones."""
+        snapshot = self.__get_source_snapshot(dataset)
+        return snapshot.aggregates if snapshot is not None else None
+
+    def get_approval_index(self, dataset: Optional[str] = None, mode: str = "normal") -> Optional[ApprovalIndex]:
+        """Precomputed approved/rejected row positions matching the frame served for the mode."""
+        snapshot = self.__get_frame_snapshot(dataset)
+        return snapshot.get_approval_index(mode) if snapshot is not None else None
+
+    def search(self, query: str, dataset: Optional[str] = None, mode: str = "normal", match: str = "substring",
+               columns: Optional[List[str]] = None) -> Tuple[int, np.ndarray]:
+        """Row ids matching the name/city query in the frame served for the mode, with the dataset version."""
+        snapshot = self.__get_frame_snapshot(dataset)
+        if snapshot is None:
+            raise ValueError("Dataset not loaded")
+        return snapshot.version, snapshot.search(query, mode, match, columns)
+
+    def get_store(self, dataset: Optional[str] = None) -> Optional[SqliteStore]:
+        """Returns the SqliteStore of datasets with SQLite storage, None for the others."""
+        snapshot = self.__get_source_snapshot(dataset)
+        if snapshot is not None and isinstance(snapshot.data, SqliteStore):
+            return snapshot.data
+        return None
+
+    def get_columns(self, dataset: Optional[str] = None) -> Optional[List[str]]:
+        snapshot = self.__get_source_snapshot(dataset)
+        return snapshot.get_columns() if snapshot is not None else None
+
+    def get_data(self, dataset: Optional[str] = None) -> Union[DataFrame, SqliteStore, None]:
+        snapshot = self.__get_frame_snapshot(dataset)
+        return snapshot.data if snapshot is not None else None
+
+    def get_frame(self, dataset: Optional[str] = None, mode: str = "normal") -> Tuple[int, Union[DataFrame, MergedView, SqliteStore, None]]:
+        """The frame served for the mode together with the version it belongs to, read from one snapshot."""
+        snapshot = self.__get_frame_snapshot(dataset)
+        if snapshot is None:
+            return 0, None
+        if mode == "prognosis":
+            return snapshot.version, snapshot.get_prognosis_only_data()
+        if mode == "merged":
+            return snapshot.version, snapshot.get_prognosis_data()
+        return snapshot.version, snapshot.data
+
+    def get_approx_quantiles(self, column: str, qs: List[float], eps: float, dataset: Optional[str] = None,
+                             mode: str = "normal") -> List[float]:
+        """
+        Quantiles of the column read from a KLL sketch whose normalized rank error is at most eps
+        (k is rounded up to a power of two, which keeps the number of sketches per column small).
+        """
+        snapshot = self.__get_frame_snapshot(dataset)
+        if snapshot is None:
+            raise ValueError("No data loaded")
+        k = 1 << int(np.ceil(np.log2(KLLSketch.k_for_error(eps))))
+        mode = mode if mode in ("prognosis", "merged") else "normal"
+        return snapshot.get_quantile_sketch(mode, column, k).get_quantiles(qs)
 
-        self.__prognosis_cache = pd.concat([df_out, prognosis_df], ignore_index=True)
-        return self.__prognosis_cache
+    def get_prognosis_data(self, dataset: Optional[str] = None) -> Union[MergedView, None]:
+        """
+        Returns the original dataset with additional synthetic rows appended, as a MergedView
+        over both frames (nothing is concatenated up front).
+        Prognosis rows come from a pre-generated CSV for consistency across tabs.
+        If missing, they are generated deterministically and saved.
+        Includes a 'dataset' column: 'normal' for original rows, 'prognosis' for appended rows.
+        """
+        snapshot = self.__get_frame_snapshot(dataset)
+        if snapshot is None:
+            return None
+        return snapshot.get_prognosis_data()
 
-    def get_prognosis_process_details(self) -> dict:
-        if self.__data is None:
+    def get_prognosis_process_details(self, dataset: Optional[str] = None) -> dict:
+        df = self.get_data(dataset)
+        if df is None:
             raise ValueError("No data loaded")
-        df = self.__data
         head = df.head(3)
         numeric_cols = head.select_dtypes(include=['number']).columns.tolist()
         cat_cols = [c for c in df.columns if c not in numeric_cols]
@@ -109,57 +687,40 @@ class FilesController:
 
         return details
 
-    def get_prognosis_only_data(self) -> Union[DataFrame, None]:
+    def get_prognosis_only_data(self, dataset: Optional[str] = None) -> Union[DataFrame, None]:
         """
         Returns ONLY synthetic prognosis rows generated from the first 3 rows
         of the original dataset. Includes a 'dataset' column set to 'prognosis'.
         """
-        if self.__data is None:
+        snapshot = self.__get_frame_snapshot(dataset)
+        if snapshot is None:
             return None
-        if self.__prognosis_only_cache is not None:
-            return self.__prognosis_only_cache
-        df = self.__data
-        if df.empty:
-            self.__prognosis_only_cache = df
-            return df
-
-        prognosis_df = self.__load_or_generate_prognosis(df)
-
-        for col in df.columns:
-            if col in prognosis_df.columns and df[col].dtype == bool and prognosis_df[col].dtype != bool:
-                prognosis_df[col] = prognosis_df[col].astype(str).str.lower().isin(['true','1','yes','tak','ja','是','예'])
-
-
-        for col in df.columns:
-            if col not in prognosis_df.columns:
-                prognosis_df[col] = np.nan
-        prognosis_df = prognosis_df[df.columns]
-        prognosis_df['dataset'] = 'prognosis'
-        self.__prognosis_only_cache = prognosis_df
-        return prognosis_df
+        return snapshot.get_prognosis_only_data()
 
-    def __load_or_generate_prognosis(self, base_df: DataFrame) -> DataFrame:
+    def __load_or_generate_prognosis(self, source: DatasetSource, base_df: DataFrame) -> DataFrame:
 
-        if os.path.exists(self.__prognosis_file_path):
+        if os.path.exists(source.prognosis_path):
             try:
-                p = pd.read_csv(self.__prognosis_file_path, sep=';')
+                p = read_csv_cached(source.prognosis_path, sep=';', transform=apply_compact_schema, schema=SCHEMA_FINGERPRINT)
 
                 if 'years_employed' in p.columns:
                     try:
                         p['years_employed'] = np.maximum(0, np.rint(pd.to_numeric(p['years_employed'], errors='coerce')).astype('Int64')).astype(int)
                     except Exception:
                         p['years_employed'] = np.maximum(0, np.rint(p['years_employed']).astype(int))
-                return p
+                return apply_compact_schema(p)
             except Exception as ex:
                 print(f"[FilesController] Failed to load prognosis file: {ex}", file=sys.stderr)
 
 
         try:
             from app.utils.generate_prognosis import generate_prognosis_csv
-            base_csv = self.__data_path
-            out_csv = self.__prognosis_file_path
+            base_csv = source.data_path
+            out_csv = source.prognosis_path
             p = generate_prognosis_csv(base_csv, out_csv, seed=42, size_ratio=0.25)
-            return p
+            if source.signature is not None:
+                source.signature = (source.signature[0], source.get_source_signature()[1])
+            return apply_compact_schema(p)
         except Exception as ex:
             print(f"[FilesController] Failed to generate prognosis file: {ex}", file=sys.stderr)
 
@@ -1,10 +1,41 @@
 from flask import request, jsonify, Response
-from typing import Callable, Any, Optional, Tuple
-import numpy as np
+from typing import Callable, Any, Dict, List, Optional, Tuple
+
+RESPONSE_FORMATS = ("records", "columnar")
+DEFAULT_QUANTILE_EPS = 0.01
 
 
 class RequestResponseController:
     @staticmethod
+    def validate_format_request() -> Tuple[str, Optional[Response], Optional[int]]:
+        """Layout of tabular results: 'records' (list of row objects, default) or 'columnar' ({column: [values]})."""
+        fmt = (request.args.get("format") or "records").strip().lower()
+        if fmt not in RESPONSE_FORMATS:
+            return fmt, jsonify({"success": False, "error": f"Invalid format '{fmt}' (expected 'records' or 'columnar')"}), 400
+        return fmt, None, None
+
+    @staticmethod
+    def to_columnar(rows: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+        """{column: [values]} of a list of row dicts; columns missing from a row are null."""
+        columns: List[str] = []
+        for row in rows:
+            columns.extend(k for k in row if k not in columns)
+        return {c: [row.get(c) for row in rows] for c in columns}
+
+    @staticmethod
+    def to_columnar_table(table: Dict[str, Dict[str, Any]], key: str = "column") -> Dict[str, List[Any]]:
+        """
+        Columnar form of a {metric: {column: value}} table such as /summary: the key array lists
+        the columns and every metric becomes one array aligned with it.
+        """
+        columns: List[str] = []
+        for values in table.values():
+            columns.extend(c for c in values if c not in columns)
+        result: Dict[str, List[Any]] = {key: columns}
+        for metric, values in table.items():
+            result[metric] = [values.get(c) for c in columns]
+        return result
+    @staticmethod
     def validate_stats_request() -> Tuple[Optional[str], Optional[Response], Optional[int]]:
         column_name = request.args.get("column_name")
         if not column_name:
@@ -29,22 +60,51 @@ class RequestResponseController:
             return 1, jsonify({"success": False, "error": "Invalid page number (must be positive integer)"}), 400
 
     @staticmethod
-    def make_stats_response(function_name: Callable, *args) -> Tuple[Response, int]:
+    def validate_per_page_request() -> Tuple[Optional[int], Optional[Response], Optional[int]]:
+        raw = request.args.get("per_page")
+        if raw is None:
+            return None, None, None
         try:
-            result = function_name(*args)
+            per_page = int(raw)
+            if per_page < 1:
+                raise ValueError
+            return per_page, None, None
+        except ValueError:
+            return None, jsonify({"success": False, "error": "Invalid per_page (must be positive integer)"}), 400
 
-            if isinstance(result, (np.integer, np.floating)):
-                result = result.item()
-            elif isinstance(result, dict):
-                result = {
-                    k: v.item() if isinstance(v, (np.integer, np.floating)) else v
-                    for k, v in result.items()
-                }
+    @staticmethod
+    def validate_approx_request() -> Tuple[Optional[float], Optional[Response], Optional[int]]:
+        """Rank error bound for sketch-backed quantiles when approx=true (eps, default 0.01); None for exact ones."""
+        if str(request.args.get("approx", "false")).strip().lower() not in ("1", "true", "yes"):
+            return None, None, None
+        try:
+            eps = float(request.args.get("eps", DEFAULT_QUANTILE_EPS))
+            if not 1e-4 <= eps <= 0.5:
+                raise ValueError
+            return eps, None, None
+        except ValueError:
+            return None, jsonify({"success": False, "error": "Invalid eps (must be a number between 0.0001 and 0.5)"}), 400
 
+    @staticmethod
+    def make_stats_response(function_name: Callable, *args) -> Tuple[Response, int]:
+        try:
+            # numpy results are encoded as they are by the app's JSON provider (see FastJSONProvider)
+            result = function_name(*args)
             return jsonify({"success": True, "result": result}), 200
         except Exception as e:
             return jsonify({"success": False, "error": str(e)}), 400
 
+    @staticmethod
+    def make_conditional_response(body: bytes, etag: str, mimetype: str = "application/json") -> Response:
+        """200 with a strong ETag, or an empty 304 when the client's If-None-Match already has it."""
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype=mimetype)
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
     @staticmethod
     def make_data_response(function_name: Callable[[], Any]) -> Tuple[Response, int]:
         try:
@@ -1,48 +1,183 @@
-from typing import Dict, Union, List
+from typing import Any, Dict, Union, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 
 from app.controllers.FilesController import FilesControllerInstance
+from app.utils.aggregates import ColumnAggregate, KLLSketch, MomentAccumulator
+from app.utils.merged_view import MergedView
+from app.utils.filters import Predicate, build_mask, parse_filters
+from app.utils.sqlite_store import SqliteStore
+from app.utils.summary import sorted_median, sorted_mode, sorted_quantile, summarize
+from app.utils.stats_cache import StatsCache, memoized
+
+
+BATCH_STATS = ('mean', 'sum', 'quartiles', 'median', 'mode', 'skewness', 'kurtosis', 'deviation')
+BATCH_LIMIT = 1000
 
 
 class StatsCalculatorController:
     def __init__(self):
-        self.__data = None
         self.__numeric_columns: List[str] = [
             'credit_score', 'income', 'loan_amount', 'points', 'years_employed'
         ]
+        self.stats_cache = StatsCache()
+        FilesControllerInstance.add_reload_listener(self.stats_cache.invalidate)
+
+    @staticmethod
+    def get_dataset_name(dataset: Optional[str] = None) -> str:
+        return dataset or FilesControllerInstance.DEFAULT_DATASET
+
+    @staticmethod
+    def get_version(dataset: Optional[str] = None) -> int:
+        return FilesControllerInstance.get_version(dataset)
+
+    def get_cache_stats(self) -> Dict[str, Union[int, float, None]]:
+        return self.stats_cache.get_stats()
 
-    def __get_data(self, mode: str = 'normal') -> pd.DataFrame:
+    def __get_data(self, mode: str = 'normal', dataset: Optional[str] = None) -> Union[pd.DataFrame, MergedView]:
         if mode == 'prognosis':
-            data = FilesControllerInstance.get_prognosis_only_data()
+            data = FilesControllerInstance.get_prognosis_only_data(dataset)
             if data is None:
                 raise ValueError("No data loaded")
             return data
         if mode == 'merged':
-            data = FilesControllerInstance.get_prognosis_data()
+            data = FilesControllerInstance.get_prognosis_data(dataset)
             if data is None:
                 raise ValueError("No data loaded")
             return data
-        if self.__data is None:
-            self.__data = FilesControllerInstance.get_data()
-        return self.__data
+        data = FilesControllerInstance.get_data(dataset)
+        if data is None:
+            raise ValueError("No data loaded")
+        return data
+
+    @staticmethod
+    def __get_series(data: Union[pd.DataFrame, MergedView, SqliteStore], column: str, filters: Optional[List[str]] = None) -> pd.Series:
+        # Columns stored as float32 are upcast so results are not rounded to single precision
+        series = data[column]
+        predicates = parse_filters(filters, list(data.columns))
+        if predicates:
+            series = series[build_mask(data, predicates)]
+        return series.astype(np.float64) if series.dtype == np.float32 else series
+
+    @staticmethod
+    def __get_part_series(data: MergedView, column: str, filters: Optional[List[str]] = None) -> List[pd.Series]:
+        """The column's filtered values in each part of a merged view, for reductions that combine per part."""
+        predicates = parse_filters(filters, list(data.columns))
+        pieces = []
+        for part in data.get_parts(list(dict.fromkeys([column] + [p.column for p in predicates]))):
+            series = part[column]
+            if predicates:
+                series = series[build_mask(part, predicates)]
+            pieces.append(series.astype(np.float64) if series.dtype == np.float32 else series)
+        return pieces
+
+    def __get_streaming_column(self, column: str, mode: str = 'normal', dataset: Optional[str] = None,
+                               filters: Optional[List[str]] = None) -> Optional[ColumnAggregate]:
+        if mode in ('prognosis', 'merged'):
+            return None
+        aggregates = FilesControllerInstance.get_aggregates(dataset)
+        if aggregates is None:
+            return None
+        if any(f.strip() for f in filters or []):
+            raise ValueError("Filters are not supported for datasets ingested in streaming mode")
+        return aggregates.get_column(column)
+
+    def __get_store(self, mode: str = 'normal', dataset: Optional[str] = None,
+                    filters: Optional[List[str]] = None) -> Tuple[Optional[SqliteStore], List[Predicate]]:
+        """SQLite-backed dataset plus the parsed filters, so the statistic can be pushed down as SQL."""
+        if mode in ('prognosis', 'merged'):
+            return None, []
+        store = FilesControllerInstance.get_store(dataset)
+        if store is None:
+            return None, []
+        return store, parse_filters(filters, list(store.columns))
+
+    def __get_partition_moments(self, column: str, mode: str = 'normal', dataset: Optional[str] = None,
+                                filters: Optional[List[str]] = None) -> Optional[MomentAccumulator]:
+        """
+        Unfiltered column moments kept on the snapshot per partition (merged mode combines normal and
+        prognosis); filtered merged moments are accumulated per part and merged.
+        """
+        if any(f.strip() for f in filters or []):
+            if mode != 'merged':
+                return None
+            data = self.__get_data(mode, dataset)
+            if column not in data.columns:
+                return None
+            moments = MomentAccumulator()
+            for piece in self.__get_part_series(data, column, filters):
+                moments.merge(MomentAccumulator.from_values(piece.to_numpy(dtype=np.float64, na_value=np.nan)))
+            return moments
+        snapshot = FilesControllerInstance.get_snapshot(dataset)
+        if snapshot is None:
+            return None
+        partition = snapshot.get_partition_moments(mode if mode in ('prognosis', 'merged') else 'normal')
+        return partition.get_moments(column) if partition is not None else None
 
-    def calculate_mean(self, column: str, mode: str = 'normal') -> float:
-        data = self.__get_data(mode)
+    @staticmethod
+    def __get_approx_quantiles(column: str, qs: List[float], eps: Optional[float], mode: str = 'normal', dataset: Optional[str] = None,
+                               filters: Optional[List[str]] = None) -> Optional[List[float]]:
+        """Sketch quantiles with rank error eps; None when exact ones were asked for or filters apply (those stay exact)."""
+        if eps is None or any(f.strip() for f in filters or []):
+            return None
+        return FilesControllerInstance.get_approx_quantiles(column, qs, eps, dataset, mode)
+
+    @staticmethod
+    def __get_streaming_quantiles(aggregate: ColumnAggregate, qs: List[float], eps: Optional[float]) -> List[float]:
+        """Quantiles of a streaming dataset, which only keeps its ingest-time sketch, so they must be asked for with approx=true."""
+        error = KLLSketch.rank_error(aggregate.sketch.k)
+        if eps is None:
+            raise ValueError(f"Streaming datasets only have approximate quantiles (rank error {error:.2%}); pass approx=true")
+        if eps < error:
+            raise ValueError(f"The quantile sketch of this streaming dataset has a rank error of {error:.2%}; pass eps of at least {error:.4f}")
+        return aggregate.sketch.get_quantiles(qs)
+
+    @memoized('mean')
+    def calculate_mean(self, column: str, mode: str = 'normal', dataset: Optional[str] = None, filters: Optional[List[str]] = None) -> float:
+        aggregate = self.__get_streaming_column(column, mode, dataset, filters)
+        if aggregate is not None:
+            return aggregate.moments.get_mean()
+        store, predicates = self.__get_store(mode, dataset, filters)
+        if store is not None:
+            return store.get_moments(column, predicates).get_mean()
+        moments = self.__get_partition_moments(column, mode, dataset, filters)
+        if moments is not None:
+            return moments.get_mean()
+        data = self.__get_data(mode, dataset)
         if column in data.columns:
-            return data[column].mean()
+            return self.__get_series(data, column, filters).mean()
         raise ValueError(f"Column '{column}' not found in dataset.")
 
-    def calculate_sum(self, column: str, mode: str = 'normal') -> float:
-        data = self.__get_data(mode)
+    @memoized('sum')
+    def calculate_sum(self, column: str, mode: str = 'normal', dataset: Optional[str] = None, filters: Optional[List[str]] = None) -> float:
+        aggregate = self.__get_streaming_column(column, mode, dataset, filters)
+        if aggregate is not None:
+            return aggregate.sum
+        store, predicates = self.__get_store(mode, dataset, filters)
+        if store is not None:
+            return store.get_sum(column, predicates)
+        data = self.__get_data(mode, dataset)
+        if isinstance(data, MergedView) and column in data.columns:
+            return sum(piece.sum() for piece in self.__get_part_series(data, column, filters))
         if column in data.columns:
-            return data[column].sum()
+            return self.__get_series(data, column, filters).sum()
         raise ValueError(f"Column '{column}' not found in dataset.")
 
-    def calculate_quartiles(self, column: str, mode: str = 'normal') -> Dict[str, float]:
-        data = self.__get_data(mode)
+    @memoized('quartiles')
+    def calculate_quartiles(self, column: str, mode: str = 'normal', dataset: Optional[str] = None, filters: Optional[List[str]] = None,
+                            eps: Optional[float] = None) -> Dict[str, float]:
+        aggregate = self.__get_streaming_column(column, mode, dataset, filters)
+        if aggregate is not None:
+            return dict(zip(("Q1", "Q2", "Q3"), self.__get_streaming_quantiles(aggregate, [0.25, 0.5, 0.75], eps)))
+        quantiles = self.__get_approx_quantiles(column, [0.25, 0.5, 0.75], eps, mode, dataset, filters)
+        if quantiles is not None:
+            return dict(zip(("Q1", "Q2", "Q3"), quantiles))
+        store, predicates = self.__get_store(mode, dataset, filters)
+        if store is not None:
+            return dict(zip(("Q1", "Q2", "Q3"), store.get_quantiles(column, [0.25, 0.5, 0.75], predicates)))
+        data = self.__get_data(mode, dataset)
         if column in data.columns:
-            col = data[column]
+            col = self.__get_series(data, column, filters)
             return {
                 "Q1": col.quantile(0.25),
                 "Q2": col.quantile(0.5),
@@ -50,77 +185,205 @@ class StatsCalculatorController:
             }
         raise ValueError(f"Column '{column}' not found in dataset.")
 
-    def calculate_median(self, column: str, mode: str = 'normal') -> float:
-        data = self.__get_data(mode)
+    @memoized('median')
+    def calculate_median(self, column: str, mode: str = 'normal', dataset: Optional[str] = None, filters: Optional[List[str]] = None,
+                         eps: Optional[float] = None) -> float:
+        aggregate = self.__get_streaming_column(column, mode, dataset, filters)
+        if aggregate is not None:
+            return self.__get_streaming_quantiles(aggregate, [0.5], eps)[0]
+        quantiles = self.__get_approx_quantiles(column, [0.5], eps, mode, dataset, filters)
+        if quantiles is not None:
+            return quantiles[0]
+        store, predicates = self.__get_store(mode, dataset, filters)
+        if store is not None:
+            return store.get_quantiles(column, [0.5], predicates)[0]
+        data = self.__get_data(mode, dataset)
         if column in data.columns:
-            return data[column].median()
+            return self.__get_series(data, column, filters).median()
         raise ValueError(f"Column '{column}' not found in dataset.")
 
-    def calculate_mode(self, column: str, mode: str = 'normal') -> Union[float, None]:
-        data = self.__get_data(mode)
+    @memoized('mode')
+    def calculate_mode(self, column: str, mode: str = 'normal', dataset: Optional[str] = None, filters: Optional[List[str]] = None) -> Union[float, None]:
+        aggregate = self.__get_streaming_column(column, mode, dataset, filters)
+        if aggregate is not None:
+            return aggregate.get_mode()
+        store, predicates = self.__get_store(mode, dataset, filters)
+        if store is not None:
+            return store.get_mode(column, predicates)
+        data = self.__get_data(mode, dataset)
         if column in data.columns:
-            col = data[column].mode()
+            col = self.__get_series(data, column, filters).mode()
             return col.iloc[0] if not col.empty else None
         raise ValueError(f"Column '{column}' not found in dataset.")
 
-    def calculate_skewness(self, column: str, mode: str = 'normal') -> float:
-        data = self.__get_data(mode)
+    @memoized('skewness')
+    def calculate_skewness(self, column: str, mode: str = 'normal', dataset: Optional[str] = None, filters: Optional[List[str]] = None) -> float:
+        aggregate = self.__get_streaming_column(column, mode, dataset, filters)
+        if aggregate is not None:
+            return aggregate.moments.get_skewness()
+        store, predicates = self.__get_store(mode, dataset, filters)
+        if store is not None:
+            return store.get_moments(column, predicates).get_skewness()
+        moments = self.__get_partition_moments(column, mode, dataset, filters)
+        if moments is not None:
+            return moments.get_skewness()
+        data = self.__get_data(mode, dataset)
         if column in data.columns:
-            return data[column].skew()
+            return self.__get_series(data, column, filters).skew()
         raise ValueError(f"Column '{column}' not found in dataset.")
 
-    def calculate_kurtosis(self, column: str, mode: str = 'normal') -> float:
-        data = self.__get_data(mode)
+    @memoized('kurtosis')
+    def calculate_kurtosis(self, column: str, mode: str = 'normal', dataset: Optional[str] = None, filters: Optional[List[str]] = None) -> float:
+        aggregate = self.__get_streaming_column(column, mode, dataset, filters)
+        if aggregate is not None:
+            return aggregate.moments.get_kurtosis()
+        store, predicates = self.__get_store(mode, dataset, filters)
+        if store is not None:
+            return store.get_moments(column, predicates).get_kurtosis()
+        moments = self.__get_partition_moments(column, mode, dataset, filters)
+        if moments is not None:
+            return moments.get_kurtosis()
+        data = self.__get_data(mode, dataset)
         if column in data.columns:
-            return data[column].kurt()
+            return self.__get_series(data, column, filters).kurt()
         raise ValueError(f"Column '{column}' not found in dataset.")
 
-    def calculate_deviation(self, column: str, mode: str = 'normal') -> float:
-        data = self.__get_data(mode)
+    @memoized('deviation')
+    def calculate_deviation(self, column: str, mode: str = 'normal', dataset: Optional[str] = None, filters: Optional[List[str]] = None) -> float:
+        aggregate = self.__get_streaming_column(column, mode, dataset, filters)
+        if aggregate is not None:
+            return aggregate.moments.get_deviation()
+        store, predicates = self.__get_store(mode, dataset, filters)
+        if store is not None:
+            return store.get_moments(column, predicates).get_deviation()
+        moments = self.__get_partition_moments(column, mode, dataset, filters)
+        if moments is not None:
+            return moments.get_deviation()
+        data = self.__get_data(mode, dataset)
         if column in data.columns:
-            return data[column].std()
+            return self.__get_series(data, column, filters).std()
         raise ValueError(f"Column '{column}' not found in dataset.")
 
-    def get_summary_stats(self, mode: str) -> Dict[str, Dict[str, Union[float, int, None]]]:
-        data = self.__get_data(mode)
-        cols = [c for c in self.__numeric_columns if c in data.columns]
+    @memoized('summary')
+    def get_summary_stats(self, mode: str, dataset: Optional[str] = None, filters: Optional[List[str]] = None) -> Dict[str, Dict[str, Union[float, int, None]]]:
         res: Dict[str, Dict[str, Union[float, int, None]]] = {
             'mean': {}, 'median': {}, 'mode': {}, 'sum': {},
             'deviation': {}, 'skewness': {}, 'kurtosis': {},
             'Q1': {}, 'Q2': {}, 'Q3': {}
         }
-        for c in cols:
-            s = data[c]
-
-            q1 = s.quantile(0.25)
-            q2 = s.quantile(0.5)
-            q3 = s.quantile(0.75)
-            m = s.mode()
-            mode_val: Union[float, int, None]
-            if m.empty:
-                mode_val = None
-            else:
-                mode_val = m.iloc[0]
-
-            res['mean'][c] = s.mean()
-            res['median'][c] = s.median()
-            res['mode'][c] = mode_val
-            res['sum'][c] = s.sum()
-            res['deviation'][c] = s.std()
-            res['skewness'][c] = s.skew()
-            res['kurtosis'][c] = s.kurt()
-            res['Q1'][c] = q1
-            res['Q2'][c] = q2
-            res['Q3'][c] = q3
-
-
-        def to_py(x):
-            if isinstance(x, (np.generic,)):
-                return x.item()
-            return x
-
-        for k, d in res.items():
-            for c in list(d.keys()):
-                d[c] = to_py(d[c])
-
-        return res
+        aggregates = FilesControllerInstance.get_aggregates(dataset) if mode not in ('prognosis', 'merged') else None
+        if aggregates is not None:
+            if any(f.strip() for f in filters or []):
+                raise ValueError("Filters are not supported for datasets ingested in streaming mode")
+            for c in [c for c in self.__numeric_columns if c in aggregates.numeric_columns]:
+                for k, v in aggregates.get_column(c).get_summary().items():
+                    res[k][c] = v
+            return res
+
+        store, predicates = self.__get_store(mode, dataset, filters)
+        if store is not None:
+            for c in [c for c in self.__numeric_columns if c in store.columns]:
+                moments = store.get_moments(c, predicates)
+                q1, q2, q3 = store.get_quantiles(c, [0.25, 0.5, 0.75], predicates)
+                res['mean'][c] = moments.get_mean()
+                res['median'][c] = q2
+                res['mode'][c] = store.get_mode(c, predicates)
+                res['sum'][c] = store.get_sum(c, predicates)
+                res['deviation'][c] = moments.get_deviation()
+                res['skewness'][c] = moments.get_skewness()
+                res['kurtosis'][c] = moments.get_kurtosis()
+                res['Q1'][c] = q1
+                res['Q2'][c] = q2
+                res['Q3'][c] = q3
+            return res
+
+        data = self.__get_data(mode, dataset)
+        predicates = parse_filters(filters, list(data.columns))
+        cols = [c for c in self.__numeric_columns if c in data.columns]
+        frame = data[cols] if isinstance(data, pd.DataFrame) else data.to_frame(cols)
+        if predicates:
+            frame = frame[build_mask(data, predicates)]
+        return summarize(frame, cols)
+
+    def __get_batch_series(self, shared: Dict[str, Any], column: str, mode: str, dataset: Optional[str],
+                           filters: Optional[List[str]]) -> pd.Series:
+        if 'series' not in shared:
+            data = self.__get_data(mode, dataset)
+            if column not in data.columns:
+                raise ValueError(f"Column '{column}' not found in dataset.")
+            series = self.__get_series(data, column, filters)
+            if not pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+                raise ValueError(f"Column '{column}' is not numeric.")
+            shared['series'] = series
+        return shared['series']
+
+    def __compute_batch_stat(self, shared: Dict[str, Any], stat: str, column: str, mode: str, dataset: Optional[str],
+                             filters: Optional[List[str]]) -> Any:
+        """One statistic of a batch group; shared holds the group's column, sorted values and moments once computed."""
+        if self.__get_streaming_column(column, mode, dataset, filters) is not None or self.__get_store(mode, dataset, filters)[0] is not None:
+            return getattr(StatsCalculatorController, f'calculate_{stat}').__wrapped__(self, column, mode, dataset, filters)
+        if stat in ('mean', 'deviation', 'skewness', 'kurtosis'):
+            if 'moments' not in shared:
+                moments = self.__get_partition_moments(column, mode, dataset, filters)
+                if moments is None:
+                    series = self.__get_batch_series(shared, column, mode, dataset, filters)
+                    moments = MomentAccumulator.from_values(series.to_numpy(dtype=np.float64, na_value=np.nan))
+                shared['moments'] = moments
+            return getattr(shared['moments'], f'get_{stat}')()
+        series = self.__get_batch_series(shared, column, mode, dataset, filters)
+        if stat == 'sum':
+            return series.sum()
+        if 'sorted' not in shared:
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            shared['sorted'] = np.sort(values[~np.isnan(values)])
+        ordered = shared['sorted']
+        if stat == 'quartiles':
+            return {name: sorted_quantile(ordered, q) for name, q in (('Q1', 0.25), ('Q2', 0.5), ('Q3', 0.75))}
+        if stat == 'median':
+            return sorted_median(ordered)
+        value = sorted_mode(ordered)
+        return int(value) if value is not None and pd.api.types.is_integer_dtype(series.dtype) else value
+
+    def calculate_batch(self, specs: Any, dataset: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Results of many {stat, column, mode, filter} requests, in request order. Requests are grouped
+        by (mode, column, filters): a group reads its column once and shares one sorted copy
+        (quartiles, median, mode) and one set of moments (mean, deviation, skewness, kurtosis)
+        between its statistics. Results use the same cache entries as the single-statistic methods.
+        A failing request reports its error without failing the others.
+        """
+        if not isinstance(specs, list) or not specs:
+            raise ValueError("Expected a non-empty list of {stat, column, mode} objects")
+        if len(specs) > BATCH_LIMIT:
+            raise ValueError(f"Too many requests in one batch (at most {BATCH_LIMIT})")
+        parsed = []
+        for i, spec in enumerate(specs):
+            if not isinstance(spec, dict):
+                raise ValueError(f"Request {i}: expected an object with stat and column")
+            stat = str(spec.get('stat') or '').strip().lower()
+            column = spec.get('column')
+            if stat not in BATCH_STATS:
+                raise ValueError(f"Request {i}: unknown stat '{stat}' (expected one of {', '.join(BATCH_STATS)})")
+            if not isinstance(column, str) or not column:
+                raise ValueError(f"Request {i}: missing column")
+            filters = spec.get('filter') or []
+            filters = [filters] if isinstance(filters, str) else [str(f) for f in filters]
+            parsed.append((stat, column, str(spec.get('mode') or 'normal'), filters))
+
+        groups: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        results: List[Dict[str, Any]] = []
+        for stat, column, mode, filters in parsed:
+            key = getattr(self, f'calculate_{stat}').cache_key(self, column, mode, dataset, filters)
+            shared = groups.setdefault((key[2], column, key[5]), {})
+            item: Dict[str, Any] = {'stat': stat, 'column': column, 'mode': mode}
+            try:
+                item['result'] = self.stats_cache.get_or_compute(
+                    key, lambda: self.__compute_batch_stat(shared, stat, column, mode, dataset, filters),
+                    lambda: self.get_version(key[0])
+                )
+                item['success'] = True
+            except Exception as e:
+                item['success'] = False
+                item['error'] = str(e)
+            results.append(item)
+        return results
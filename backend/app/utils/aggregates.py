@@ -0,0 +1,483 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from app.utils.schema import to_bool_series
+
+
+class MomentAccumulator:
+    """
+    Running count/mean/M2/M3/M4 (sums of centred powers) that can be updated chunk by chunk
+    and merged with the pairwise formulas of Chan et al. / Pébay. The derived statistics use
+    the same bias corrections as pandas (std ddof=1, adjusted skew, excess kurtosis).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> "MomentAccumulator":
+        acc = cls()
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return acc
+        acc.count = int(values.size)
+        acc.mean = float(values.mean())
+        d = values - acc.mean
+        d2 = d * d
+        acc.m2 = float(d2.sum())
+        acc.m3 = float((d2 * d).sum())
+        acc.m4 = float((d2 * d2).sum())
+        acc.min = float(values.min())
+        acc.max = float(values.max())
+        return acc
+
+    def update(self, values: np.ndarray) -> None:
+        self.merge(MomentAccumulator.from_values(values))
+
+    def merge(self, other: "MomentAccumulator") -> None:
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2, self.m3, self.m4 = other.count, other.mean, other.m2, other.m3, other.m4
+            self.min, self.max = other.min, other.max
+            return
+        na, nb = float(self.count), float(other.count)
+        n = na + nb
+        delta = other.mean - self.mean
+        delta2 = delta * delta
+        mean = self.mean + delta * nb / n
+        m2 = self.m2 + other.m2 + delta2 * na * nb / n
+        m3 = (self.m3 + other.m3
+              + delta2 * delta * na * nb * (na - nb) / (n * n)
+              + 3.0 * delta * (na * other.m2 - nb * self.m2) / n)
+        m4 = (self.m4 + other.m4
+              + delta2 * delta2 * na * nb * (na * na - na * nb + nb * nb) / (n * n * n)
+              + 6.0 * delta2 * (na * na * other.m2 + nb * nb * self.m2) / (n * n)
+              + 4.0 * delta * (na * other.m3 - nb * self.m3) / n)
+        self.count = int(n)
+        self.mean, self.m2, self.m3, self.m4 = mean, m2, m3, m4
+        self.min = float(np.fmin(self.min, other.min))
+        self.max = float(np.fmax(self.max, other.max))
+
+    def copy(self) -> "MomentAccumulator":
+        acc = MomentAccumulator()
+        acc.merge(self)
+        return acc
+
+    def get_mean(self) -> float:
+        return self.mean if self.count > 0 else np.nan
+
+    def get_deviation(self) -> float:
+        if self.count < 2:
+            return np.nan
+        return float(np.sqrt(self.m2 / (self.count - 1)))
+
+    def get_skewness(self) -> float:
+        n = float(self.count)
+        if n < 3:
+            return np.nan
+        m2 = 0.0 if abs(self.m2) < 1e-14 else self.m2
+        m3 = 0.0 if abs(self.m3) < 1e-14 else self.m3
+        if m2 == 0:
+            return 0.0
+        return float((n * (n - 1) ** 0.5 / (n - 2)) * (m3 / m2 ** 1.5))
+
+    def get_kurtosis(self) -> float:
+        n = float(self.count)
+        if n < 4:
+            return np.nan
+        adj = 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+        numerator = n * (n + 1) * (n - 1) * self.m4
+        denominator = (n - 2) * (n - 3) * self.m2 ** 2
+        numerator = 0.0 if abs(numerator) < 1e-14 else numerator
+        denominator = 0.0 if abs(denominator) < 1e-14 else denominator
+        if denominator == 0:
+            return 0.0
+        return float(numerator / denominator - adj)
+
+
+class StreamingHistogram:
+    """
+    Fixed-size histogram whose bin width is a power of two. When new values fall outside the
+    covered range, neighbouring bins are merged pairwise (width doubles) until everything fits,
+    so memory stays at max_bins counters and two histograms can always be aligned and merged.
+    """
+
+    def __init__(self, max_bins: int = 512):
+        self.max_bins = max_bins
+        self.exponent: Optional[int] = None
+        self.offset = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    @property
+    def width(self) -> float:
+        return float(2.0 ** (self.exponent or 0))
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def __coarsen(self) -> None:
+        if len(self.counts):
+            idx = np.arange(self.offset, self.offset + len(self.counts)) >> 1
+            self.counts = np.bincount(idx - idx[0], weights=self.counts).astype(np.int64)
+        self.offset >>= 1
+        self.exponent = (self.exponent or 0) + 1
+
+    def __span(self, first: int, last: int) -> Tuple[int, int]:
+        if not len(self.counts):
+            return first, last
+        return min(first, self.offset), max(last, self.offset + len(self.counts) - 1)
+
+    def __extend(self, lo: int, hi: int) -> None:
+        if not len(self.counts):
+            self.counts = np.zeros(hi - lo + 1, dtype=np.int64)
+            self.offset = lo
+            return
+        pad_left = self.offset - lo
+        pad_right = hi - (self.offset + len(self.counts) - 1)
+        self.counts = np.concatenate([
+            np.zeros(pad_left, dtype=np.int64), self.counts, np.zeros(pad_right, dtype=np.int64)
+        ])
+        self.offset = lo
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            return
+        if self.exponent is None:
+            span = float(values.max() - values.min())
+            self.exponent = int(np.floor(np.log2(span / self.max_bins))) if span > 0 else 0
+        idx = np.floor(values / self.width).astype(np.int64)
+        while True:
+            lo, hi = self.__span(int(idx.min()), int(idx.max()))
+            if hi - lo + 1 <= self.max_bins:
+                break
+            self.__coarsen()
+            idx >>= 1
+        self.__extend(lo, hi)
+        self.counts += np.bincount(idx - self.offset, minlength=len(self.counts)).astype(np.int64)
+
+    def merge(self, other: "StreamingHistogram") -> None:
+        if other.exponent is None or not len(other.counts):
+            return
+        other = other.copy()
+        if self.exponent is None:
+            self.exponent, self.offset, self.counts = other.exponent, other.offset, other.counts
+            return
+        while (other.exponent or 0) < (self.exponent or 0):
+            other.__coarsen()
+        while (self.exponent or 0) < (other.exponent or 0):
+            self.__coarsen()
+        while True:
+            lo, hi = self.__span(other.offset, other.offset + len(other.counts) - 1)
+            if hi - lo + 1 <= self.max_bins:
+                break
+            self.__coarsen()
+            other.__coarsen()
+        self.__extend(lo, hi)
+        start = other.offset - self.offset
+        self.counts[start:start + len(other.counts)] += other.counts
+
+    def copy(self) -> "StreamingHistogram":
+        h = StreamingHistogram(self.max_bins)
+        h.exponent, h.offset, h.counts = self.exponent, self.offset, self.counts.copy()
+        return h
+
+    def get_bins(self, max_bins: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns (edges, counts), coarsened to at most max_bins bins and trimmed of empty tails."""
+        h = self.copy()
+        if max_bins is not None:
+            while len(h.counts) > max_bins:
+                h.__coarsen()
+        nonzero = np.nonzero(h.counts)[0]
+        if not len(nonzero):
+            return np.zeros(0), np.zeros(0, dtype=np.int64)
+        counts = h.counts[nonzero[0]:nonzero[-1] + 1]
+        first = h.offset + int(nonzero[0])
+        edges = (np.arange(first, first + len(counts) + 1)) * h.width
+        return edges, counts
+
+    def get_mode(self) -> float:
+        edges, counts = self.get_bins()
+        if not len(counts):
+            return np.nan
+        i = int(np.argmax(counts))
+        return float((edges[i] + edges[i + 1]) / 2)
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch (Karnin, Lang, Liberty). Keeps O(k log(n/k)) items in a stack of
+    compactors; each compaction sorts a level and promotes every other item with doubled weight.
+    The normalized rank error is roughly 2.446 / k**0.9433 (about 1.65% for k=200).
+    """
+
+    def __init__(self, k: int = 200, c: float = 2.0 / 3.0, seed: Optional[int] = None):
+        self.k = max(8, int(k))
+        self.c = c
+        self.n = 0
+        self.levels: List[np.ndarray] = [np.zeros(0)]
+        self.__seed = seed
+        self.__rng = np.random.default_rng(seed)
+
+    @staticmethod
+    def rank_error(k: int) -> float:
+        return 2.446 / float(k) ** 0.9433
+
+    @staticmethod
+    def k_for_error(eps: float) -> int:
+        eps = min(max(float(eps), 1e-4), 0.5)
+        return int(np.ceil((2.446 / eps) ** (1 / 0.9433)))
+
+    def __capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * self.c ** depth)))
+
+    def __compact(self, level: int) -> None:
+        if level + 1 == len(self.levels):
+            self.levels.append(np.zeros(0))
+        items = np.sort(self.levels[level])
+        keep = items[:1] if len(items) % 2 else items[:0]
+        items = items[len(keep):]
+        promoted = items[int(self.__rng.integers(2))::2]
+        self.levels[level] = keep
+        self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+
+    def __compress(self) -> None:
+        while sum(len(lvl) for lvl in self.levels) >= sum(self.__capacity(h) for h in range(len(self.levels))):
+            for level in range(len(self.levels)):
+                if len(self.levels[level]) >= self.__capacity(level):
+                    self.__compact(level)
+                    break
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        self.n += int(values.size)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.__compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.zeros(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self.__compress()
+
+    def copy(self) -> "KLLSketch":
+        sketch = KLLSketch(self.k, self.c, self.__seed)
+        sketch.n = self.n
+        sketch.levels = [lvl.copy() for lvl in self.levels]
+        return sketch
+
+    def get_quantiles(self, qs: List[float]) -> List[float]:
+        if self.n == 0:
+            return [np.nan for _ in qs]
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(lvl), 2 ** i, dtype=np.float64) for i, lvl in enumerate(self.levels)])
+        order = np.argsort(items, kind='mergesort')
+        items, weights = items[order], weights[order]
+        cum = np.cumsum(weights)
+        total = cum[-1]
+        return [float(items[min(int(np.searchsorted(cum, q * total, side='left')), len(items) - 1)]) for q in qs]
+
+    def get_memory_usage(self) -> int:
+        return int(sum(lvl.nbytes for lvl in self.levels))
+
+
+class PartitionMoments:
+    """
+    Moments and histogram of every numeric column of one partition of rows (the base frame,
+    the prognosis rows, an uploaded chunk). Appending rows is update(); two partitions combine
+    with merge() in O(columns) regardless of their size, so the merged frame's statistics
+    follow from the partitions' without another pass over the rows.
+    """
+
+    def __init__(self, numeric_columns: List[str]):
+        self.numeric_columns = list(numeric_columns)
+        self.rows = 0
+        self.moments: Dict[str, MomentAccumulator] = {c: MomentAccumulator() for c in self.numeric_columns}
+        self.histograms: Dict[str, StreamingHistogram] = {c: StreamingHistogram() for c in self.numeric_columns}
+
+    @classmethod
+    def from_frame(cls, data: Any) -> "PartitionMoments":
+        """Moments of a DataFrame or frame-like view (MergedView, SqliteStore), one column at a time."""
+        dtypes = data.dtypes
+        numeric = [c for c in data.columns if pd.api.types.is_numeric_dtype(dtypes[c]) and not pd.api.types.is_bool_dtype(dtypes[c])]
+        partition = cls(numeric)
+        partition.update(data)
+        return partition
+
+    def update(self, data: Any) -> None:
+        self.rows += len(data)
+        for c in self.numeric_columns:
+            values = data[c].to_numpy(dtype=float, na_value=np.nan)
+            self.moments[c].update(values)
+            self.histograms[c].update(values)
+
+    def merge(self, other: "PartitionMoments") -> None:
+        self.rows += other.rows
+        for c in self.numeric_columns:
+            if c in other.moments:
+                self.moments[c].merge(other.moments[c])
+                self.histograms[c].merge(other.histograms[c])
+
+    def copy(self) -> "PartitionMoments":
+        partition = PartitionMoments([])
+        partition.numeric_columns = list(self.numeric_columns)
+        partition.rows = self.rows
+        partition.moments = {c: m.copy() for c, m in self.moments.items()}
+        partition.histograms = {c: h.copy() for c, h in self.histograms.items()}
+        return partition
+
+    def combine(self, other: "PartitionMoments") -> "PartitionMoments":
+        """New partition covering the rows of both; columns missing from either are dropped."""
+        partition = self.copy()
+        for c in [c for c in partition.numeric_columns if c not in other.moments]:
+            partition.numeric_columns.remove(c)
+            del partition.moments[c], partition.histograms[c]
+        partition.merge(other)
+        return partition
+
+    def get_moments(self, column: str) -> Optional[MomentAccumulator]:
+        return self.moments.get(column)
+
+    def get_memory_usage(self) -> int:
+        return int(sum(h.counts.nbytes for h in self.histograms.values()))
+
+
+class ColumnAggregate:
+    """Per-column aggregates that can be built from chunks without keeping the rows."""
+
+    MAX_DISTINCT_FOR_MODE = 50_000
+    # rank error about 0.7%, within the default eps of approx=true quantile requests
+    SKETCH_K = 512
+
+    def __init__(self, sketch_k: int = SKETCH_K):
+        self.moments = MomentAccumulator()
+        self.histogram = StreamingHistogram()
+        self.sketch = KLLSketch(sketch_k, seed=0)
+        self.sum: Union[int, float] = 0
+        self.__value_counts: Optional[pd.Series] = pd.Series(dtype=np.int64)
+
+    def update(self, series: pd.Series) -> None:
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        self.moments.update(values)
+        self.histogram.update(values)
+        self.sketch.update(values)
+        chunk_sum = series.sum()
+        self.sum = self.sum + (chunk_sum.item() if isinstance(chunk_sum, np.generic) else chunk_sum)
+        if self.__value_counts is not None:
+            counts = series.value_counts(dropna=True)
+            self.__value_counts = self.__value_counts.add(counts, fill_value=0)
+            if len(self.__value_counts) > self.MAX_DISTINCT_FOR_MODE:
+                self.__value_counts = None
+
+    def merge(self, other: "ColumnAggregate") -> None:
+        self.moments.merge(other.moments)
+        self.histogram.merge(other.histogram)
+        self.sketch.merge(other.sketch)
+        self.sum = self.sum + other.sum
+        if self.__value_counts is not None and other.__value_counts is not None:
+            self.__value_counts = self.__value_counts.add(other.__value_counts, fill_value=0)
+        else:
+            self.__value_counts = None
+
+    def get_mode(self) -> Union[float, int, None]:
+        """Exact mode while the column has few distinct values, histogram peak otherwise."""
+        if self.moments.count == 0:
+            return None
+        if self.__value_counts is not None and len(self.__value_counts):
+            top = self.__value_counts[self.__value_counts == self.__value_counts.max()]
+            value = top.index.min()
+            return value.item() if isinstance(value, np.generic) else value
+        return self.histogram.get_mode()
+
+    def get_summary(self) -> Dict[str, Any]:
+        q1, q2, q3 = self.sketch.get_quantiles([0.25, 0.5, 0.75])
+        return {
+            'mean': self.moments.get_mean(),
+            'median': q2,
+            'mode': self.get_mode(),
+            'sum': self.sum,
+            'deviation': self.moments.get_deviation(),
+            'skewness': self.moments.get_skewness(),
+            'kurtosis': self.moments.get_kurtosis(),
+            'Q1': q1,
+            'Q2': q2,
+            'Q3': q3,
+        }
+
+    def get_memory_usage(self) -> int:
+        counts_bytes = int(self.__value_counts.memory_usage(deep=True)) if self.__value_counts is not None else 0
+        return int(self.histogram.counts.nbytes + self.sketch.get_memory_usage() + counts_bytes)
+
+
+class StreamingAggregates:
+    """
+    Aggregates of a CSV that was ingested chunk by chunk: per numeric column overall and split
+    by loan_approved, plus approval counts. Peak memory is one chunk regardless of file size.
+    """
+
+    def __init__(self, columns: List[str], numeric_columns: List[str]):
+        self.columns = columns
+        self.numeric_columns = numeric_columns
+        self.rows = 0
+        self.by_column: Dict[str, ColumnAggregate] = {c: ColumnAggregate() for c in numeric_columns}
+        self.by_approval: Dict[bool, Dict[str, ColumnAggregate]] = {
+            True: {c: ColumnAggregate() for c in numeric_columns},
+            False: {c: ColumnAggregate() for c in numeric_columns},
+        }
+        self.approval_counts: Dict[bool, int] = {True: 0, False: 0}
+
+    @classmethod
+    def from_csv(cls, path: str, sep: str = ';', chunksize: int = 100_000) -> "StreamingAggregates":
+        aggregates: Optional[StreamingAggregates] = None
+        for chunk in pd.read_csv(path, sep=sep, chunksize=chunksize):
+            if aggregates is None:
+                numeric = [c for c in chunk.columns if pd.api.types.is_numeric_dtype(chunk[c]) and not pd.api.types.is_bool_dtype(chunk[c])]
+                aggregates = cls(list(chunk.columns), numeric)
+            aggregates.update(chunk)
+        if aggregates is None:
+            raise ValueError(f"No rows in {path}")
+        return aggregates
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        self.rows += len(chunk)
+        approved = None
+        if 'loan_approved' in chunk.columns:
+            col = chunk['loan_approved']
+            approved = to_bool_series(col).to_numpy()
+            n_approved = int(approved.sum())
+            self.approval_counts[True] += n_approved
+            self.approval_counts[False] += len(chunk) - n_approved
+        for c in self.numeric_columns:
+            series = pd.to_numeric(chunk[c], errors='coerce')
+            self.by_column[c].update(series)
+            if approved is not None:
+                self.by_approval[True][c].update(series[approved])
+                self.by_approval[False][c].update(series[~approved])
+
+    def get_column(self, column: str) -> ColumnAggregate:
+        if column not in self.by_column:
+            raise ValueError(f"Column '{column}' not found in dataset.")
+        return self.by_column[column]
+
+    def get_memory_usage(self) -> int:
+        total = sum(a.get_memory_usage() for a in self.by_column.values())
+        for group in self.by_approval.values():
+            total += sum(a.get_memory_usage() for a in group.values())
+        return int(total)
@@ -0,0 +1,185 @@
+import os
+import sys
+import json
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from typing import Any, Callable, Dict, List, Optional
+
+CACHE_FORMAT_VERSION = 2
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def _cache_enabled() -> bool:
+    return os.environ.get('COLUMNAR_CACHE', '1') != '0'
+
+
+def _cache_dir_for(csv_path: str) -> str:
+    base_dir = os.environ.get('COLUMNAR_CACHE_DIR') or os.path.join(os.path.dirname(csv_path), '.columnar')
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(base_dir, stem)
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_meta(cache_dir: str, schema: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    meta_path = os.path.join(cache_dir, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get('format') != CACHE_FORMAT_VERSION or meta.get('schema') != schema:
+        return None
+    return meta
+
+
+def _write_meta(cache_dir: str, meta: Dict[str, Any]) -> None:
+    """Writes meta.json through a temp file and os.replace, so readers never see a partial file."""
+    meta_path = os.path.join(cache_dir, 'meta.json')
+    tmp_path = f"{meta_path}.tmp-{os.getpid()}"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _is_fresh(meta: Dict[str, Any], csv_path: str, cache_dir: str) -> bool:
+    """
+    Fast path compares size + mtime. When only the mtime moved (touch, copy, checkout)
+    the content hash decides, and a match refreshes the stored mtime so the next boot
+    skips hashing again.
+    """
+    st = os.stat(csv_path)
+    source = meta.get('source', {})
+    if source.get('size') != st.st_size:
+        return False
+    if source.get('mtime_ns') == st.st_mtime_ns:
+        return True
+    if source.get('sha256') != file_sha256(csv_path):
+        return False
+    source['mtime_ns'] = st.st_mtime_ns
+    try:
+        _write_meta(cache_dir, meta)
+    except OSError:
+        pass
+    return True
+
+
+def _open_columns(meta: Dict[str, Any], cache_dir: str) -> DataFrame:
+    columns: Dict[str, Any] = {}
+    for idx, col in enumerate(meta['columns']):
+        values = np.load(os.path.join(cache_dir, f"c{idx}.npy"), mmap_mode='r')
+        if col['kind'] == 'category':
+            categories = np.load(os.path.join(cache_dir, f"c{idx}.categories.npy"))
+            columns[col['name']] = pd.Categorical.from_codes(values, categories=pd.Index(categories.astype(object)))
+        elif col['kind'] == 'string':
+            categories = np.load(os.path.join(cache_dir, f"c{idx}.categories.npy"))
+            restored = np.asarray(categories, dtype=object).take(np.maximum(values, 0))
+            restored[np.asarray(values) < 0] = np.nan
+            columns[col['name']] = restored
+        else:
+            columns[col['name']] = values
+    return pd.DataFrame(columns, copy=False)
+
+
+def _write_cache(df: DataFrame, csv_path: str, sep: str, transform_name: Optional[str], schema: Optional[str],
+                 cache_dir: str) -> None:
+    tmp_dir = f"{cache_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    try:
+        columns_meta: List[Dict[str, str]] = []
+        for idx, name in enumerate(df.columns):
+            series = df[name]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                np.save(os.path.join(tmp_dir, f"c{idx}.npy"), series.cat.codes.to_numpy())
+                np.save(os.path.join(tmp_dir, f"c{idx}.categories.npy"), np.asarray(series.cat.categories, dtype=str))
+                columns_meta.append({'name': str(name), 'kind': 'category', 'dtype': 'category'})
+            elif pd.api.types.is_bool_dtype(series.dtype) or pd.api.types.is_numeric_dtype(series.dtype):
+                np.save(os.path.join(tmp_dir, f"c{idx}.npy"), series.to_numpy())
+                columns_meta.append({'name': str(name), 'kind': 'numeric', 'dtype': str(series.dtype)})
+            elif pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype):
+                codes, categories = pd.factorize(series, use_na_sentinel=True)
+                np.save(os.path.join(tmp_dir, f"c{idx}.npy"), codes.astype(np.int32))
+                np.save(os.path.join(tmp_dir, f"c{idx}.categories.npy"), np.asarray(categories, dtype=str))
+                columns_meta.append({'name': str(name), 'kind': 'string', 'dtype': str(series.dtype)})
+            else:
+                raise TypeError(f"Unsupported dtype for column '{name}': {series.dtype}")
+
+        st = os.stat(csv_path)
+        meta = {
+            'format': CACHE_FORMAT_VERSION,
+            'sep': sep,
+            'transform': transform_name,
+            'schema': schema,
+            'rows': int(len(df)),
+            'columns': columns_meta,
+            'source': {
+                'path': os.path.abspath(csv_path),
+                'size': st.st_size,
+                'mtime_ns': st.st_mtime_ns,
+                'sha256': file_sha256(csv_path),
+            },
+        }
+        _write_meta(tmp_dir, meta)
+
+        # a directory cannot replace a non-empty one, so the old sidecar is renamed away first;
+        # a reader racing the swap finds no meta.json and parses the CSV instead
+        stale_dir = f"{cache_dir}.old-{os.getpid()}"
+        if os.path.isdir(cache_dir):
+            os.replace(cache_dir, stale_dir)
+        os.replace(tmp_dir, cache_dir)
+        shutil.rmtree(stale_dir, ignore_errors=True)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def read_csv_cached(csv_path: str, sep: str = ';', transform: Optional[Callable[[DataFrame], DataFrame]] = None,
+                    schema: Optional[str] = None) -> DataFrame:
+    """
+    Read a CSV through a columnar sidecar cache.
+    The first parse writes one .npy file per column (strings are dictionary-encoded) plus a
+    meta.json describing the source file. Later calls validate the sidecar against the
+    source size/mtime/sha256 and open the numeric columns memory-mapped instead of re-parsing.
+    An optional transform (e.g. a dtype schema) is applied after parsing and its result is
+    what gets cached; the sidecar is rebuilt when the transform changes. schema fingerprints
+    what the transform produces (see SCHEMA_FINGERPRINT) and is checked the same way, so editing
+    the transform's rules or value spellings does not keep serving old converted columns.
+    Set COLUMNAR_CACHE=0 to bypass the cache, COLUMNAR_CACHE_DIR to relocate it.
+    """
+    transform_name = f"{transform.__module__}.{transform.__qualname__}" if transform is not None else None
+    if not _cache_enabled():
+        df = pd.read_csv(csv_path, sep=sep)
+        return transform(df) if transform is not None else df
+
+    cache_dir = _cache_dir_for(csv_path)
+    meta = _read_meta(cache_dir, schema)
+    if meta is not None and meta.get('sep') == sep and meta.get('transform') == transform_name:
+        try:
+            if _is_fresh(meta, csv_path, cache_dir):
+                return _open_columns(meta, cache_dir)
+        except Exception as ex:
+            print(f"[columnar_cache] Ignoring unreadable cache {cache_dir}: {ex}", file=sys.stderr)
+
+    df = pd.read_csv(csv_path, sep=sep)
+    if transform is not None:
+        df = transform(df)
+    try:
+        _write_cache(df, csv_path, sep, transform_name, schema, cache_dir)
+    except Exception as ex:
+        print(f"[columnar_cache] Failed to write cache {cache_dir}: {ex}", file=sys.stderr)
+    return df
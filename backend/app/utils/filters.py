@@ -0,0 +1,112 @@
+import re
+import numpy as np
+import pandas as pd
+from typing import Any, Hashable, List, NamedTuple, Optional, Tuple
+
+from app.utils.merged_view import MergedView
+
+_PREDICATE_RE = re.compile(r'^\s*([A-Za-z_][A-Za-z0-9_]*)\s*(>=|<=|!=|=|>|<|\s+in\s+)\s*(.*?)\s*$', re.IGNORECASE)
+
+
+class Predicate(NamedTuple):
+    column: str
+    op: str
+    value: Any
+
+    @property
+    def key(self) -> Tuple[Hashable, ...]:
+        """Cache key of the predicate: 1, 1.0 and True are equal and hash alike, so the value types are part of it."""
+        types = tuple(type(v).__name__ for v in self.value) if self.op == 'in' else type(self.value).__name__
+        return self.column, self.op, self.value, types
+
+
+def _parse_value(raw: str) -> Any:
+    raw = raw.strip().strip('"\'')
+    lowered = raw.lower()
+    if lowered in ('true', 'yes'):
+        return True
+    if lowered in ('false', 'no'):
+        return False
+    try:
+        return int(raw)
+    except ValueError:
+        pass
+    try:
+        return float(raw)
+    except ValueError:
+        return raw
+
+
+def parse_filters(expressions: Optional[List[str]], columns: Optional[List[str]] = None) -> List[Predicate]:
+    """
+    Parses filter expressions such as `credit_score>=700`, `loan_approved=true` or
+    `city in (Berlin,Warsaw)` into predicates. Raises ValueError for malformed
+    expressions and, when columns are given, for unknown columns.
+    """
+    predicates: List[Predicate] = []
+    for expression in expressions or []:
+        if not expression or not expression.strip():
+            continue
+        match = _PREDICATE_RE.match(expression)
+        if match is None:
+            raise ValueError(f"Invalid filter '{expression}'")
+        column, op, raw = match.group(1), match.group(2).strip().lower(), match.group(3)
+        if columns is not None and column not in columns:
+            raise ValueError(f"Unknown filter column '{column}'")
+        if op == 'in':
+            if not (raw.startswith('(') and raw.endswith(')')):
+                raise ValueError(f"Invalid filter '{expression}': expected a list like (a,b)")
+            values = [_parse_value(v) for v in raw[1:-1].split(',') if v.strip()]
+            if not values:
+                raise ValueError(f"Invalid filter '{expression}': empty list")
+            predicates.append(Predicate(column, op, tuple(values)))
+        else:
+            if raw == '':
+                raise ValueError(f"Invalid filter '{expression}': missing value")
+            predicates.append(Predicate(column, op, _parse_value(raw)))
+    return predicates
+
+
+def build_mask(data: Any, predicates: List[Predicate]) -> np.ndarray:
+    """
+    Boolean row mask of the predicates (AND-combined) over a DataFrame or frame-like view;
+    a MergedView is masked part by part, so no merged column is stitched for it.
+    """
+    if isinstance(data, MergedView):
+        columns = list(dict.fromkeys(p.column for p in predicates))
+        return np.concatenate([build_mask(part, predicates) for part in data.get_parts(columns)])
+    mask = np.ones(len(data), dtype=bool)
+    for predicate in predicates:
+        series = data[predicate.column]
+        if predicate.op == 'in':
+            current = series.isin(list(predicate.value))
+        elif predicate.op == '=':
+            current = series == predicate.value
+        elif predicate.op == '!=':
+            current = series != predicate.value
+        else:
+            if not pd.api.types.is_numeric_dtype(series.dtype) or isinstance(predicate.value, (bool, str)):
+                raise ValueError(f"Operator '{predicate.op}' needs a numeric column and value")
+            current = {'>=': series >= predicate.value, '<=': series <= predicate.value,
+                       '>': series > predicate.value, '<': series < predicate.value}[predicate.op]
+        mask &= np.asarray(current, dtype=bool)
+    return mask
+
+
+def to_sql_where(predicates: List[Predicate]) -> Tuple[str, List[Any]]:
+    """SQL WHERE clause (without the keyword, '1' when empty) plus its bound parameters."""
+    clauses: List[str] = []
+    params: List[Any] = []
+    for predicate in predicates:
+        column = '"' + predicate.column.replace('"', '""') + '"'
+        if predicate.op == 'in':
+            clauses.append(f"{column} IN ({', '.join('?' for _ in predicate.value)})")
+            params.extend(predicate.value)
+        elif predicate.op == '!=':
+            # missing values differ from every value, as in build_mask
+            clauses.append(f"({column} IS NULL OR {column} != ?)")
+            params.append(predicate.value)
+        else:
+            clauses.append(f"{column} {predicate.op} ?")
+            params.append(predicate.value)
+    return (' AND '.join(clauses) if clauses else '1'), params
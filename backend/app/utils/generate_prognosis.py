@@ -4,6 +4,11 @@ import numpy as np
 import pandas as pd
 from typing import Optional
 
+try:
+    from app.utils.schema import BOOL_COLUMNS, to_bool_series
+except ImportError:  # run as a script from app/utils
+    from schema import BOOL_COLUMNS, to_bool_series
+
 
 def generate_prognosis_csv(base_csv: str, output_csv: str, seed: int = 42, size_ratio: float = 0.25) -> pd.DataFrame:
     """
@@ -18,6 +23,9 @@ def generate_prognosis_csv(base_csv: str, output_csv: str, seed: int = 42, size_
     df = pd.read_csv(base_csv, sep=';')
     if df.empty:
         raise ValueError("Base dataset is empty")
+    for col in BOOL_COLUMNS:
+        if col in df.columns:
+            df[col] = to_bool_series(df[col])
 
     head = df.head(3)
     numeric_cols = head.select_dtypes(include=['number']).columns.tolist()
@@ -58,9 +66,9 @@ def generate_prognosis_csv(base_csv: str, output_csv: str, seed: int = 42, size_
         except Exception:
             synth_df['years_employed'] = np.maximum(0, np.rint(synth_df['years_employed']).astype(int))
 
-    for col in df.columns:
-        if str(df[col].dtype) == 'bool' and str(synth_df[col].dtype) != 'bool':
-            synth_df[col] = synth_df[col].astype(str).str.lower().isin(['true','1','yes','tak','ja','是','예'])
+    for col in BOOL_COLUMNS:
+        if col in synth_df.columns:
+            synth_df[col] = synth_df[col].astype(bool)
 
 
     os.makedirs(os.path.dirname(output_csv), exist_ok=True)
@@ -0,0 +1,86 @@
+import os
+import math
+import json
+import orjson
+import numpy as np
+import pandas as pd
+from collections.abc import Mapping
+from flask.json.provider import DefaultJSONProvider
+from typing import Any
+
+
+def _to_builtin(value: Any) -> Any:
+    """Maps the numpy/pandas values the controllers return to JSON-native Python values."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, pd.DataFrame):
+        return value.to_dict(orient="records")
+    if isinstance(value, (pd.Series, pd.Index)):
+        return value.tolist()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, Mapping):
+        # read-only mappings such as the MappingProxyType results of the stats cache
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _sanitize(value: Any, allow_nan: bool) -> Any:
+    """Builtin-only copy of value for the stdlib encoder, with NaN/Infinity mapped to None unless allowed."""
+    if isinstance(value, Mapping):
+        return {k.item() if isinstance(k, np.generic) else k: _sanitize(v, allow_nan) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_sanitize(v, allow_nan) for v in value]
+    if isinstance(value, (str, int, bool)) or value is None:
+        return value
+    if isinstance(value, float):
+        return value if allow_nan or math.isfinite(value) else None
+    return _sanitize(_to_builtin(value), allow_nan)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider for every response: numpy scalars and arrays, pandas Series/DataFrames
+    and pandas missing values are encoded directly, so controllers can return them as they are.
+    Encodes with orjson (a requirement).
+    NaN policy (JSON_NAN): 'null' (default) writes NaN/Infinity as null, which every JSON parser
+    accepts; 'raise' rejects them instead, through the stdlib encoder since orjson cannot.
+    """
+
+    nan_policy = os.environ.get('JSON_NAN', 'null')
+
+    def __orjson_options(self) -> int:
+        options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        if self.nan_policy == 'raise':
+            return self.dumps(obj).encode('utf-8')
+        return orjson.dumps(obj, default=_to_builtin, option=self.__orjson_options())
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if self.nan_policy != 'raise' and not kwargs:
+            return self.dumps_bytes(obj).decode('utf-8')
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('separators', (',', ':'))
+        if self.nan_policy == 'raise':
+            return json.dumps(_sanitize(obj, allow_nan=True), allow_nan=False, **kwargs)
+        return json.dumps(_sanitize(obj, allow_nan=False), **kwargs)
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from pandas.api.types import union_categoricals
+from typing import Dict, List, Optional, Tuple, Union
+
+
+class _MergedRowIndexer:
+    def __init__(self, view: "MergedView"):
+        self.__view = view
+
+    def __getitem__(self, key: slice) -> DataFrame:
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            raise TypeError("MergedView only supports contiguous row slices")
+        start, stop, _ = key.indices(len(self.__view))
+        return self.__view.get_rows(start, stop)
+
+
+class MergedView:
+    """
+    Read-only merged dataset: the original rows followed by the prognosis rows.
+    Both parts are referenced, not copied, and the 'dataset' column is kept as one int8 code
+    per row (0 normal, 1 prognosis); that array is all the view owns.
+    Reductions (filter masks, group partials, sums, moments) are computed on get_parts and
+    combined by the caller; get_rows and take copy only the rows they return. A whole column
+    (view[column], to_frame) is stitched into a new array on every call and never kept, so it is
+    only used where every value is needed at once (exact quantiles, plots).
+    Supports the subset of the DataFrame API used by the controllers:
+    columns, len(), view[column], view[[columns]], view.iloc[start:stop], view.take(positions).
+    """
+
+    DATASET_LABELS = ('normal', 'prognosis')
+
+    def __init__(self, normal: DataFrame, prognosis: DataFrame):
+        self.__parts = (normal, prognosis)
+        self.columns = pd.Index([c for c in normal.columns if c != 'dataset'] + ['dataset'])
+        self.dataset_codes = np.repeat(np.arange(2, dtype=np.int8), [len(normal), len(prognosis)])
+        self.iloc = _MergedRowIndexer(self)
+
+    def __len__(self) -> int:
+        return int(self.dataset_codes.shape[0])
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    @property
+    def dtypes(self) -> pd.Series:
+        """dtype each column has once stitched: the common type of both parts (float where one part lacks it)."""
+        result = {}
+        for column in self.columns:
+            if column == 'dataset':
+                result[column] = pd.CategoricalDtype(list(self.DATASET_LABELS))
+                continue
+            dtypes = [part[column].dtype if column in part.columns else np.dtype(np.float64) for part in self.__parts]
+            if all(isinstance(d, np.dtype) and d.kind in 'biuf' for d in dtypes):
+                result[column] = np.result_type(*dtypes)
+            elif all(d == dtypes[0] for d in dtypes):
+                result[column] = dtypes[0]
+            else:
+                result[column] = np.dtype(object)
+        return pd.Series(result)
+
+    def get_widened_columns(self) -> List[str]:
+        """Columns that are integer in the normal part but stitch to float because the prognosis part is float."""
+        normal = self.__parts[0]
+        dtypes = self.dtypes
+        return [c for c in normal.columns if c != 'dataset' and pd.api.types.is_integer_dtype(normal[c].dtype)
+                and pd.api.types.is_float_dtype(dtypes[c])]
+
+    def __getitem__(self, key: Union[str, List[str]]) -> Union[pd.Series, DataFrame]:
+        if isinstance(key, str):
+            return self.get_column(key)
+        return self.to_frame(list(key))
+
+    def __get_dataset_column(self, codes: np.ndarray) -> pd.Categorical:
+        return pd.Categorical.from_codes(codes, categories=list(self.DATASET_LABELS))
+
+    def __part_column(self, part: DataFrame, column: str) -> pd.Series:
+        if column in part.columns:
+            return part[column]
+        return pd.Series(np.nan, index=range(len(part)), name=column)
+
+    def get_parts(self, columns: Optional[List[str]] = None) -> Tuple[DataFrame, DataFrame]:
+        """
+        The normal and the prognosis rows as two frames with the requested columns (a column one
+        part lacks is all-NaN there, 'dataset' holds the part's label), without copying the parts.
+        """
+        columns = self.__get_columns(columns)
+        parts = []
+        for code, part in enumerate(self.__parts):
+            frame = {}
+            for column in columns:
+                if column == 'dataset':
+                    frame[column] = self.__get_dataset_column(np.full(len(part), code, dtype=np.int8))
+                else:
+                    frame[column] = self.__part_column(part, column).reset_index(drop=True)
+            parts.append(pd.DataFrame(frame, index=range(len(part)), copy=False))
+        return parts[0], parts[1]
+
+    def __stitch(self, pieces: List[pd.Series], column: str) -> pd.Series:
+        pieces = [p for p in pieces if len(p)] or pieces[:1]
+        if len(pieces) > 1 and all(isinstance(p.dtype, pd.CategoricalDtype) for p in pieces):
+            return pd.Series(union_categoricals([p.array for p in pieces]), name=column)
+        return pd.concat(pieces, ignore_index=True).rename(column)
+
+    def get_column(self, column: str) -> pd.Series:
+        """The whole column in merged order, stitched into a new array for this call only."""
+        if column == 'dataset':
+            return pd.Series(self.__get_dataset_column(self.dataset_codes), name='dataset')
+        if column not in self.columns:
+            raise KeyError(column)
+        return self.__stitch([self.__part_column(part, column) for part in self.__parts], column)
+
+    def to_frame(self, columns: Optional[List[str]] = None) -> DataFrame:
+        """Materializes the requested columns (all by default) as a regular DataFrame."""
+        columns = list(self.columns) if columns is None else columns
+        return pd.DataFrame({c: self.get_column(c) for c in columns}, copy=False)
+
+    def __get_columns(self, columns: Optional[List[str]]) -> List[str]:
+        return list(self.columns) if columns is None else [c for c in columns if c in self.columns]
+
+    def get_rows(self, start: int, stop: int, columns: Optional[List[str]] = None) -> DataFrame:
+        """Rows [start, stop) of the merged order (optionally only some columns); only the parts the range touches are sliced."""
+        normal, prognosis = self.__parts
+        split = len(normal)
+        columns = self.__get_columns(columns)
+        ranges = ((normal, max(0, min(start, split)), max(0, min(stop, split))),
+                  (prognosis, max(0, start - split), max(0, stop - split)))
+        pieces = [part.iloc[lo:hi] for part, lo, hi in ranges]
+        result = {
+            c: self.__stitch([self.__part_column(piece, c).reset_index(drop=True) for piece in pieces], c)
+            for c in columns if c != 'dataset'
+        }
+        if 'dataset' in columns:
+            result['dataset'] = self.__get_dataset_column(self.dataset_codes[start:stop])
+        frame = pd.DataFrame(result, copy=False)
+        frame.index = range(start, start + len(frame))
+        return frame
+
+    def take(self, positions: np.ndarray, columns: Optional[List[str]] = None) -> DataFrame:
+        """Rows at arbitrary merged positions, in the given order (optionally only some columns)."""
+        positions = np.asarray(positions, dtype=np.int64)
+        normal, prognosis = self.__parts
+        split = len(normal)
+        columns = self.__get_columns(columns)
+        in_prognosis = positions >= split
+        grouped = np.argsort(in_prognosis, kind='stable')
+        pieces = [normal.take(positions[~in_prognosis]), prognosis.take(positions[in_prognosis] - split)]
+        restore = np.argsort(grouped, kind='stable')
+        result = {
+            c: self.__stitch([self.__part_column(piece, c).reset_index(drop=True) for piece in pieces], c).take(restore).reset_index(drop=True)
+            for c in columns if c != 'dataset'
+        }
+        if 'dataset' in columns:
+            result['dataset'] = self.__get_dataset_column(self.dataset_codes[positions])
+        frame = pd.DataFrame(result, copy=False)
+        frame.index = positions
+        return frame
+
+    def get_column_memory(self) -> Dict[str, Dict[str, object]]:
+        """Bytes owned by the view itself: only the dataset codes, the columns stay in the parts."""
+        return {"dataset": {"dtype": str(self.dataset_codes.dtype), "bytes": int(self.dataset_codes.nbytes)}}
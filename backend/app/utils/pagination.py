@@ -0,0 +1,49 @@
+import base64
+import json
+import os
+from typing import Any, Dict, NamedTuple, Optional
+
+DEFAULT_PER_PAGE = 10
+MAX_PER_PAGE = int(os.environ.get('DATA_MAX_PER_PAGE', '1000'))
+
+
+class Cursor(NamedTuple):
+    """
+    Position in an ordered listing: the stable row id of the boundary row and the direction
+    to read from it ('next' reads rows after it, 'prev' rows before it). scope ties the
+    token to the dataset version, mode and ordering it was issued for, so a cursor from
+    before a reload is rejected instead of pointing into different rows.
+    """
+    scope: str
+    row_id: int
+    direction: str
+
+
+def clamp_per_page(per_page: Optional[int]) -> int:
+    """Page size requested by the client, capped at DATA_MAX_PER_PAGE."""
+    if per_page is None:
+        return DEFAULT_PER_PAGE
+    if per_page < 1:
+        raise ValueError("Invalid per_page (must be positive integer)")
+    return min(per_page, MAX_PER_PAGE)
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    payload: Dict[str, Any] = {"s": cursor.scope, "r": int(cursor.row_id), "d": cursor.direction}
+    raw = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str, scope: str) -> Cursor:
+    """Parses a token produced by encode_cursor; raises ValueError if it is malformed or was issued for another scope."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw.decode('utf-8'))
+        cursor = Cursor(str(payload["s"]), int(payload["r"]), str(payload["d"]))
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor.direction not in ('next', 'prev') or cursor.row_id < 0:
+        raise ValueError("Invalid cursor")
+    if cursor.scope != scope:
+        raise ValueError("Cursor does not match the requested dataset version, mode or ordering; restart from the first page")
+    return cursor
@@ -0,0 +1,52 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Hashable, NamedTuple, Optional, Tuple
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+
+
+class ResponseCache:
+    """
+    LRU cache of encoded response bodies with their strong ETag (a digest of the bytes),
+    bounded by total size (RESPONSE_CACHE_MB). Keys start with (dataset, version, ...), so a
+    reload makes old entries unreachable and invalidate() frees them.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.__max_bytes = max_bytes if max_bytes is not None else int(float(os.environ.get('RESPONSE_CACHE_MB', '64')) * 1024 * 1024)
+        self.__entries: "OrderedDict[Tuple[Hashable, ...], CachedResponse]" = OrderedDict()
+        self.__size = 0
+        self.__lock = threading.Lock()
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[CachedResponse]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                self.__entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Tuple[Hashable, ...], body: bytes) -> CachedResponse:
+        entry = CachedResponse(body, hashlib.sha256(body).hexdigest()[:32])
+        if len(body) > self.__max_bytes:
+            return entry
+        with self.__lock:
+            previous = self.__entries.pop(key, None)
+            if previous is not None:
+                self.__size -= len(previous.body)
+            self.__entries[key] = entry
+            self.__size += len(body)
+            while self.__size > self.__max_bytes:
+                _, evicted = self.__entries.popitem(last=False)
+                self.__size -= len(evicted.body)
+        return entry
+
+    def invalidate(self, dataset: str, version: Optional[int] = None) -> None:
+        """Drops every entry of the dataset older than version (all of them when version is None)."""
+        with self.__lock:
+            for key in [k for k in self.__entries if k[0] == dataset and (version is None or k[1] < version)]:
+                self.__size -= len(self.__entries.pop(key).body)
@@ -0,0 +1,137 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Any, Hashable, List, NamedTuple, Optional, Tuple
+
+from app.utils.filters import Predicate, build_mask
+
+
+class SortSpec(NamedTuple):
+    column: str
+    descending: bool = False
+
+
+class RowOrder(NamedTuple):
+    """
+    Row ids (positions in the served frame) of a sorted and/or filtered listing, plus the
+    inverse lookup row id -> position in the listing (-1 for rows filtered out), so a cursor
+    pointing at a row id resumes in O(1).
+    """
+    row_ids: np.ndarray
+    ranks: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.row_ids.shape[0])
+
+    def index_of(self, row_id: int) -> int:
+        if row_id >= self.ranks.shape[0] or self.ranks[row_id] < 0:
+            raise ValueError("Cursor row is not part of this listing; restart from the first page")
+        return int(self.ranks[row_id])
+
+
+def parse_sort(expression: Optional[str], columns: Optional[List[str]] = None) -> Optional[SortSpec]:
+    """Parses `column` or `column:asc|desc`; None when no sort was requested."""
+    if not expression or not expression.strip():
+        return None
+    column, _, direction = expression.strip().partition(':')
+    column, direction = column.strip(), (direction.strip().lower() or 'asc')
+    if direction not in ('asc', 'desc'):
+        raise ValueError(f"Invalid sort direction '{direction}' (expected 'asc' or 'desc')")
+    if columns is not None and column not in columns:
+        raise ValueError(f"Unknown sort column '{column}'")
+    return SortSpec(column, direction == 'desc')
+
+
+def _index_dtype(n: int) -> type:
+    return np.int32 if n < 2 ** 31 else np.int64
+
+
+def get_sort_keys(series: pd.Series) -> np.ndarray:
+    """
+    float64 keys whose ascending order is the column order: numbers as they are, bools as 0/1,
+    categories and strings by the rank of their text. Missing values become NaN and sort last.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        category_rank = np.argsort(np.argsort(categories.astype(str).to_numpy(), kind='stable'), kind='stable')
+        codes = series.cat.codes.to_numpy()
+        keys = category_rank[codes].astype(np.float64)
+        keys[codes < 0] = np.nan
+        return keys
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+    codes, _ = pd.factorize(series.astype('string'), sort=True)
+    keys = codes.astype(np.float64)
+    keys[codes < 0] = np.nan
+    return keys
+
+
+class RowIndexCache:
+    """
+    Sort permutations, predicate masks and the resulting listings of the served frames,
+    computed once per (dataset, version, mode) and reused by every page request.
+    Entries are LRU-bounded by ROW_INDEX_CACHE_ENTRIES; invalidate() drops a dataset's
+    entries when a new version is published.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.__max_entries = max_entries or int(os.environ.get('ROW_INDEX_CACHE_ENTRIES', '64'))
+        self.__entries: "OrderedDict[Tuple[Hashable, ...], Any]" = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __get_or_build(self, key: Tuple[Hashable, ...], build) -> Any:
+        with self.__lock:
+            if key in self.__entries:
+                self.__entries.move_to_end(key)
+                return self.__entries[key]
+        value = build()
+        with self.__lock:
+            self.__entries[key] = value
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+        return value
+
+    def invalidate(self, dataset: str, version: Optional[int] = None) -> None:
+        """Drops every entry of the dataset older than version (all of them when version is None)."""
+        with self.__lock:
+            for key in [k for k in self.__entries if k[0] == dataset and (version is None or k[1] < version)]:
+                del self.__entries[key]
+
+    def get_permutation(self, scope: Tuple[str, int, str], data: Any, sort: SortSpec) -> np.ndarray:
+        """Stable argsort of the column (ties keep row id order); NaN last in both directions."""
+        def build() -> np.ndarray:
+            keys = get_sort_keys(data[sort.column])
+            order = np.argsort(-keys if sort.descending else keys, kind='stable')
+            return order.astype(_index_dtype(len(order)), copy=False)
+        return self.__get_or_build(scope + ('sort', sort), build)
+
+    def get_mask(self, scope: Tuple[str, int, str], data: Any, predicate: Predicate) -> np.ndarray:
+        return self.__get_or_build(scope + ('mask', predicate.key), lambda: build_mask(data, [predicate]))
+
+    def get_order(self, scope: Tuple[str, int, str], data: Any, sort: Optional[SortSpec],
+                  predicates: List[Predicate]) -> Optional[RowOrder]:
+        """The listing for the sort and filters; None for the plain file order (row id == position)."""
+        if sort is None and not predicates:
+            return None
+
+        def build() -> RowOrder:
+            n = len(data)
+            mask = None
+            for predicate in predicates:
+                current = self.get_mask(scope, data, predicate)
+                mask = current if mask is None else mask & current
+            if sort is not None:
+                row_ids = self.get_permutation(scope, data, sort)
+                if mask is not None:
+                    row_ids = row_ids[mask[row_ids]]
+            else:
+                row_ids = np.flatnonzero(mask).astype(_index_dtype(n), copy=False)
+            ranks = np.full(n, -1, dtype=_index_dtype(n))
+            ranks[row_ids] = np.arange(len(row_ids), dtype=ranks.dtype)
+            return RowOrder(row_ids, ranks)
+        return self.__get_or_build(scope + ('order', sort, tuple(p.key for p in predicates)), build)
@@ -0,0 +1,99 @@
+import json
+import inspect
+import hashlib
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from typing import Any, Dict, NamedTuple, Optional
+
+CATEGORY_COLUMNS = ('name', 'city')
+BOOL_COLUMNS = ('loan_approved',)
+APPROVAL_COLUMN = 'loan_approved'
+# Yes/No labels of the approval flag per UI language: /data shows them and ingest reads them back
+BOOL_LABELS: Dict[str, Dict[bool, str]] = {
+    "en": {True: "Yes", False: "No"},
+    "pl": {True: "Tak", False: "Nie"},
+    "de": {True: "Ja", False: "Nein"},
+    "zh": {True: "是", False: "否"},
+    "ko": {True: "예", False: "아니오"},
+}
+# lower-case spellings accepted besides the labels ('아니요' is the other common Korean "no")
+TRUTHY_VALUES = list(dict.fromkeys(['true', '1', 'y'] + [labels[True].lower() for labels in BOOL_LABELS.values()]))
+FALSY_VALUES = list(dict.fromkeys(['false', '0', 'n'] + [labels[False].lower() for labels in BOOL_LABELS.values()] + ['아니요']))
+NUMERIC_COLUMNS = ('income', 'credit_score', 'loan_amount', 'years_employed', 'points')
+REQUIRED_COLUMNS = CATEGORY_COLUMNS + NUMERIC_COLUMNS + BOOL_COLUMNS
+
+
+class ApprovalIndex(NamedTuple):
+    """Row positions of approved and rejected loans, computed once per frame at ingest."""
+    approved: np.ndarray
+    rejected: np.ndarray
+
+
+def to_bool_series(series: pd.Series) -> pd.Series:
+    """
+    The one place raw approval flags are interpreted: real bools pass through, anything else
+    is matched case-insensitively against the multilingual truthy spellings.
+    """
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return series.astype(bool)
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.fillna(0) != 0
+    return series.astype(str).str.strip().str.lower().isin(TRUTHY_VALUES)
+
+
+def build_approval_index(df: Any) -> Optional[ApprovalIndex]:
+    if APPROVAL_COLUMN not in df.columns:
+        return None
+    mask = np.asarray(df[APPROVAL_COLUMN], dtype=bool)
+    return ApprovalIndex(np.flatnonzero(mask), np.flatnonzero(~mask))
+
+
+def compact_series(name: str, series: pd.Series) -> pd.Series:
+    """
+    Narrowest lossless dtype for one column: dictionary-encoded strings for the text columns,
+    real bool for the approval flag, the smallest signed int for integer columns and float32
+    only when every value survives the round trip unchanged (prognosis floats stay float64).
+    """
+    if name in BOOL_COLUMNS:
+        return to_bool_series(series)
+    if name in CATEGORY_COLUMNS:
+        return series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype('category')
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return series
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return pd.to_numeric(series, downcast='integer')
+    if pd.api.types.is_float_dtype(series.dtype) and series.dtype != np.float32:
+        values = series.to_numpy()
+        narrowed = values.astype(np.float32)
+        with np.errstate(invalid='ignore'):
+            if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+                return pd.Series(narrowed, index=series.index, name=series.name)
+    return series
+
+
+def apply_compact_schema(df: DataFrame) -> DataFrame:
+    """Returns the frame with every column converted by compact_series."""
+    return pd.DataFrame({col: compact_series(col, df[col]) for col in df.columns}, index=df.index, copy=False)
+
+
+def _schema_fingerprint() -> str:
+    """
+    Hash of everything the schema's output depends on besides the data: the column groups, the
+    accepted approval spellings and the conversion code. Sidecars (columnar cache, SQLite store)
+    record it, so any edit to these is a cache miss instead of stale converted values.
+    """
+    digest = hashlib.sha256(json.dumps([
+        CATEGORY_COLUMNS, BOOL_COLUMNS, NUMERIC_COLUMNS, TRUTHY_VALUES, FALSY_VALUES,
+    ], ensure_ascii=False).encode('utf-8'))
+    for function in (to_bool_series, compact_series, apply_compact_schema):
+        digest.update(inspect.getsource(function).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+SCHEMA_FINGERPRINT = _schema_fingerprint()
+
+
+def get_column_memory(df: DataFrame) -> Dict[str, Dict[str, Any]]:
+    usage = df.memory_usage(deep=True, index=False)
+    return {str(col): {"dtype": str(df[col].dtype), "bytes": int(usage[col])} for col in df.columns}
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Sequence
+
+SEARCH_COLUMNS = ('name', 'city')
+NGRAM = 3
+
+
+class _ColumnIndex:
+    """
+    Index of one text column. Distinct values are indexed once (lower-cased): a sorted copy
+    answers prefix queries by binary search and a trigram inverted index narrows substring
+    queries to the few values sharing all trigrams of the query. Rows are grouped by value,
+    so turning matched values into row ids is a slice per value.
+    """
+
+    def __init__(self, values: pd.Series):
+        categorical = values.astype('category') if not isinstance(values.dtype, pd.CategoricalDtype) else values
+        self.__values = np.array([str(v).lower() for v in categorical.cat.categories], dtype=object)
+        codes = categorical.cat.codes.to_numpy()
+        self.__rows_by_value = np.argsort(codes, kind='stable').astype(np.int64)
+        self.__offsets = np.searchsorted(codes[self.__rows_by_value], np.arange(len(self.__values) + 1))
+        self.__sorted_ids = np.argsort(self.__values.astype(str), kind='stable')
+        self.__sorted_values = self.__values[self.__sorted_ids].astype(str)
+        postings: Dict[str, List[int]] = {}
+        for value_id, value in enumerate(self.__values):
+            for gram in {value[i:i + NGRAM] for i in range(len(value) - NGRAM + 1)}:
+                postings.setdefault(gram, []).append(value_id)
+        self.__postings = {gram: np.asarray(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    def __match_prefix(self, query: str) -> np.ndarray:
+        lo = np.searchsorted(self.__sorted_values, query, side='left')
+        hi = np.searchsorted(self.__sorted_values, query + '\U0010ffff', side='left')
+        return self.__sorted_ids[lo:hi]
+
+    def __match_substring(self, query: str) -> np.ndarray:
+        if len(query) < NGRAM:
+            candidates = np.arange(len(self.__values))
+        else:
+            candidates = None
+            for gram in {query[i:i + NGRAM] for i in range(len(query) - NGRAM + 1)}:
+                ids = self.__postings.get(gram)
+                if ids is None:
+                    return np.empty(0, dtype=np.int64)
+                candidates = ids if candidates is None else np.intersect1d(candidates, ids, assume_unique=True)
+        return np.asarray([v for v in candidates if query in self.__values[v]], dtype=np.int64)
+
+    def search(self, query: str, match: str) -> np.ndarray:
+        """Row ids (unsorted) whose value starts with / contains the lower-cased query."""
+        value_ids = self.__match_prefix(query) if match == 'prefix' else self.__match_substring(query)
+        if len(value_ids) == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self.__rows_by_value[self.__offsets[v]:self.__offsets[v + 1]] for v in value_ids])
+
+    def get_memory_usage(self) -> int:
+        postings = sum(ids.nbytes for ids in self.__postings.values())
+        strings = sum(len(v) for v in self.__values) * 2
+        return int(self.__rows_by_value.nbytes + self.__offsets.nbytes + self.__sorted_ids.nbytes + postings + strings)
+
+
+class SearchIndex:
+    """Prefix/substring search over the text columns of one frame (DataFrame or frame-like view)."""
+
+    def __init__(self, data: Any, columns: Sequence[str] = SEARCH_COLUMNS):
+        self.__columns = {c: _ColumnIndex(data[c]) for c in columns if c in data.columns}
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.__columns)
+
+    def search(self, query: str, match: str = 'substring', columns: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Sorted, distinct row ids matching in any of the columns (all indexed columns by default)."""
+        if match not in ('prefix', 'substring'):
+            raise ValueError(f"Invalid match '{match}' (expected 'prefix' or 'substring')")
+        query = query.strip().lower()
+        if not query:
+            raise ValueError("Empty search query")
+        selected = self.columns if not columns else list(columns)
+        for column in selected:
+            if column not in self.__columns:
+                raise ValueError(f"Column '{column}' is not searchable (expected one of {', '.join(self.__columns)})")
+        hits = [self.__columns[c].search(query, match) for c in selected]
+        return np.unique(np.concatenate(hits)) if hits else np.empty(0, dtype=np.int64)
+
+    def get_memory_usage(self) -> int:
+        return sum(index.get_memory_usage() for index in self.__columns.values())
@@ -0,0 +1,380 @@
+import os
+import sys
+import json
+import math
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.aggregates import MomentAccumulator
+from app.utils.columnar_cache import file_sha256
+from app.utils.filters import Predicate, to_sql_where
+from app.utils.row_index import SortSpec
+from app.utils.schema import APPROVAL_COLUMN, BOOL_COLUMNS, NUMERIC_COLUMNS, SCHEMA_FINGERPRINT, ApprovalIndex, compact_series, to_bool_series
+
+STORE_FORMAT_VERSION = 2
+# every statistic column is indexed, so quantiles and modes read an ordered index instead of sorting the table
+INDEXED_COLUMNS = NUMERIC_COLUMNS + ('city', APPROVAL_COLUMN)
+
+
+def _quote(column: str) -> str:
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _sql_type(series: pd.Series) -> str:
+    if series.name in BOOL_COLUMNS or pd.api.types.is_bool_dtype(series.dtype):
+        return 'BOOLEAN'
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(series.dtype):
+        return 'REAL'
+    return 'TEXT'
+
+
+class _StoreRowIndexer:
+    def __init__(self, store: "SqliteStore"):
+        self.__store = store
+
+    def __getitem__(self, key: slice) -> DataFrame:
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            raise TypeError("SqliteStore only supports contiguous row slices")
+        start, stop, _ = key.indices(len(self.__store))
+        return self.__store.get_rows(start, stop)
+
+
+class SqliteStore:
+    """
+    Dataset kept in a local SQLite file instead of a DataFrame. Rows get a dense 1-based id
+    (the primary key), so a page is an index range scan; the numeric columns, city and
+    loan_approved are indexed so filtered statistics and sorted/filtered listings (get_listing)
+    run as SQL. Offers the frame-like subset
+    used by the controllers (columns, len(), store[column], store.iloc[start:stop], head())
+    and returns frames with the compact schema applied.
+    The file is built from the CSV on first use and rebuilt when the CSV changes.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.__local = threading.local()
+        conn = self.__connect()
+        info = conn.execute('PRAGMA table_info(data)').fetchall()
+        self.__types: Dict[str, str] = {row[1]: row[2] for row in info if row[1] != 'id'}
+        self.columns = pd.Index(list(self.__types))
+        self.__rows = int(conn.execute('SELECT COUNT(*) FROM data').fetchone()[0])
+        self.iloc = _StoreRowIndexer(self)
+        self.__approval_index: Optional[ApprovalIndex] = None
+
+    @classmethod
+    def open_csv(cls, csv_path: str, sep: str = ';', chunksize: int = 100000) -> "SqliteStore":
+        """Opens the store for a CSV, (re)building it when missing or stale. SQLITE_STORE_DIR relocates the files."""
+        base_dir = os.environ.get('SQLITE_STORE_DIR') or os.path.join(os.path.dirname(csv_path), '.sqlite')
+        db_path = os.path.join(base_dir, os.path.splitext(os.path.basename(csv_path))[0] + '.db')
+        if not cls.__is_fresh(db_path, csv_path, sep):
+            cls.__build(db_path, csv_path, sep, chunksize)
+        return cls(db_path)
+
+    @staticmethod
+    def __read_meta(db_path: str) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(db_path):
+            return None
+        try:
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+            try:
+                row = conn.execute("SELECT value FROM meta WHERE key = 'meta'").fetchone()
+            finally:
+                conn.close()
+            return json.loads(row[0]) if row else None
+        except (sqlite3.Error, ValueError):
+            return None
+
+    @classmethod
+    def __is_fresh(cls, db_path: str, csv_path: str, sep: str) -> bool:
+        meta = cls.__read_meta(db_path)
+        if meta is None or meta.get('format') != STORE_FORMAT_VERSION or meta.get('sep') != sep \
+                or meta.get('schema') != SCHEMA_FINGERPRINT:
+            return False
+        st = os.stat(csv_path)
+        source = meta.get('source', {})
+        if source.get('size') != st.st_size:
+            return False
+        return source.get('mtime_ns') == st.st_mtime_ns or source.get('sha256') == file_sha256(csv_path)
+
+    @staticmethod
+    def __build(db_path: str, csv_path: str, sep: str, chunksize: int) -> None:
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        tmp_path = f"{db_path}.tmp-{os.getpid()}"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.execute('PRAGMA journal_mode = OFF')
+            conn.execute('PRAGMA synchronous = OFF')
+            columns: List[str] = []
+            for chunk in pd.read_csv(csv_path, sep=sep, chunksize=chunksize):
+                for col in BOOL_COLUMNS:
+                    if col in chunk.columns:
+                        chunk[col] = to_bool_series(chunk[col])
+                if not columns:
+                    columns = [str(c) for c in chunk.columns]
+                    definitions = ', '.join(f"{_quote(c)} {_sql_type(chunk[c])}" for c in columns)
+                    conn.execute(f"CREATE TABLE data (id INTEGER PRIMARY KEY, {definitions})")
+                placeholders = ', '.join('?' for _ in columns)
+                rows = chunk[columns].astype(object).where(chunk[columns].notna(), None).itertuples(index=False, name=None)
+                conn.executemany(f"INSERT INTO data ({', '.join(_quote(c) for c in columns)}) VALUES ({placeholders})", rows)
+            if not columns:
+                raise ValueError(f"Empty CSV: {csv_path}")
+            for col in INDEXED_COLUMNS:
+                if col in columns:
+                    conn.execute(f"CREATE INDEX {_quote('idx_data_' + col)} ON data ({_quote(col)})")
+
+            st = os.stat(csv_path)
+            meta = {
+                'format': STORE_FORMAT_VERSION,
+                'sep': sep,
+                'schema': SCHEMA_FINGERPRINT,
+                'source': {'path': os.path.abspath(csv_path), 'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': file_sha256(csv_path)},
+            }
+            conn.execute('CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)')
+            conn.execute("INSERT INTO meta VALUES ('meta', ?)", (json.dumps(meta),))
+            conn.execute('ANALYZE')
+            conn.commit()
+        except Exception:
+            conn.close()
+            os.remove(tmp_path)
+            raise
+        conn.close()
+        os.replace(tmp_path, db_path)
+        print(f"[SqliteStore] Built {db_path} from {csv_path}", file=sys.stderr)
+
+    def __connect(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads; one read-only connection per thread
+        conn = getattr(self.__local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+            self.__local.conn = conn
+        return conn
+
+    def __check_column(self, column: str) -> None:
+        if column not in self.__types:
+            raise ValueError(f"Column '{column}' not found in dataset.")
+
+    def __check_numeric(self, column: str) -> None:
+        self.__check_column(column)
+        if self.__types[column] == 'TEXT':
+            raise ValueError(f"Column '{column}' is not numeric.")
+
+    def __where(self, column: Optional[str], predicates: Optional[List[Predicate]]) -> Tuple[str, List[Any]]:
+        for predicate in predicates or []:
+            self.__check_column(predicate.column)
+        clause, params = to_sql_where(predicates or [])
+        if column is not None:
+            clause = f"{clause} AND {_quote(column)} IS NOT NULL"
+        return clause, params
+
+    def __to_frame(self, rows: List[Tuple], columns: List[str]) -> DataFrame:
+        frame = pd.DataFrame.from_records(rows, columns=columns)
+        for col in columns:
+            if self.__types[col] == 'BOOLEAN':
+                frame[col] = frame[col].astype(bool)
+            frame[col] = compact_series(col, frame[col])
+        return frame
+
+    def __len__(self) -> int:
+        return self.__rows
+
+    @property
+    def empty(self) -> bool:
+        return self.__rows == 0
+
+    @property
+    def dtypes(self) -> pd.Series:
+        return self.head(1).dtypes
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, str):
+            return self.get_column(key)
+        return self.to_frame(list(key))
+
+    def get_column(self, column: str, predicates: Optional[List[Predicate]] = None) -> pd.Series:
+        self.__check_column(column)
+        where, params = self.__where(None, predicates)
+        rows = self.__connect().execute(f"SELECT {_quote(column)} FROM data WHERE {where} ORDER BY id", params).fetchall()
+        return self.__to_frame(rows, [column])[column]
+
+    def to_frame(self, columns: Optional[List[str]] = None) -> DataFrame:
+        columns = list(self.columns) if columns is None else columns
+        for col in columns:
+            self.__check_column(col)
+        rows = self.__connect().execute(f"SELECT {', '.join(_quote(c) for c in columns)} FROM data ORDER BY id").fetchall()
+        return self.__to_frame(rows, columns)
+
+    def get_rows(self, start: int, stop: int, columns: Optional[List[str]] = None) -> DataFrame:
+        """Rows [start, stop) by position (optionally only some columns), read with a primary-key range scan."""
+        columns = list(self.columns) if columns is None else [c for c in columns if c in self.__types]
+        rows = self.__connect().execute(
+            f"SELECT {', '.join(_quote(c) for c in columns)} FROM data WHERE id > ? AND id <= ? ORDER BY id", (start, stop)
+        ).fetchall()
+        frame = self.__to_frame(rows, columns)
+        frame.index = range(start, start + len(frame))
+        return frame
+
+    def take(self, positions: np.ndarray, columns: Optional[List[str]] = None) -> DataFrame:
+        """Rows at arbitrary positions, in the given order (optionally only some columns), read by primary key."""
+        columns = list(self.columns) if columns is None else [c for c in columns if c in self.__types]
+        ids = [int(p) + 1 for p in positions]
+        rows: Dict[int, Tuple] = {}
+        conn = self.__connect()
+        for offset in range(0, len(ids), 500):
+            batch = ids[offset:offset + 500]
+            query = f"SELECT id, {', '.join(_quote(c) for c in columns)} FROM data WHERE id IN ({', '.join('?' for _ in batch)})"
+            for row in conn.execute(query, batch):
+                rows[row[0]] = row[1:]
+        frame = self.__to_frame([rows[i] for i in ids], columns)
+        frame.index = np.asarray(positions)
+        return frame
+
+    @staticmethod
+    def __listing_order(sort: Optional[SortSpec], reverse: bool = False) -> str:
+        """ORDER BY of a listing as RowIndexCache sorts it: missing values last in both directions, ties by row id."""
+        direction = 'DESC' if reverse else 'ASC'
+        if sort is None:
+            return f"id {direction}"
+        q = _quote(sort.column)
+        return f"{q} IS NULL {direction}, {q} {'DESC' if sort.descending != reverse else 'ASC'}, id {direction}"
+
+    def __listing_bound(self, sort: Optional[SortSpec], row_id: int, reverse: bool = False) -> Tuple[str, List[Any]]:
+        """Keyset condition selecting the listing rows after row_id (before it when reverse)."""
+        pk = row_id + 1
+        id_op = '<' if reverse else '>'
+        if sort is None:
+            return f"id {id_op} ?", [pk]
+        q = _quote(sort.column)
+        row = self.__connect().execute(f"SELECT {q} FROM data WHERE id = ?", (pk,)).fetchone()
+        value = row[0] if row is not None else None
+        if value is None:
+            clause = f"({q} IS NULL AND id {id_op} ?)"
+            return (f"({q} IS NOT NULL OR {clause})" if reverse else clause), [pk]
+        clause = f"({q} {'<' if sort.descending != reverse else '>'} ? OR ({q} = ? AND id {id_op} ?))"
+        return (f"({q} IS NOT NULL AND {clause})" if reverse else f"({q} IS NULL OR {clause})"), [value, value, pk]
+
+    def count_rows(self, predicates: Optional[List[Predicate]] = None) -> int:
+        where, params = self.__where(None, predicates)
+        return int(self.__connect().execute(f"SELECT COUNT(*) FROM data WHERE {where}", params).fetchone()[0])
+
+    def get_listing_rank(self, sort: Optional[SortSpec], predicates: Optional[List[Predicate]], row_id: int) -> int:
+        """Position of row_id in the sorted/filtered listing, counted through the indexes."""
+        where, params = self.__where(None, predicates)
+        conn = self.__connect()
+        if conn.execute(f"SELECT 1 FROM data WHERE id = ? AND {where}", [row_id + 1] + params).fetchone() is None:
+            raise ValueError("Cursor row is not part of this listing; restart from the first page")
+        bound, bound_params = self.__listing_bound(sort, row_id, reverse=True)
+        return int(conn.execute(f"SELECT COUNT(*) FROM data WHERE {where} AND {bound}", params + bound_params).fetchone()[0])
+
+    def get_listing(self, sort: Optional[SortSpec], predicates: Optional[List[Predicate]], columns: Optional[List[str]],
+                    limit: int, offset: int = 0, after: Optional[int] = None, before: Optional[int] = None) -> DataFrame:
+        """
+        Up to limit rows of the sorted/filtered listing, read as WHERE / ORDER BY / LIMIT: from offset,
+        or from the keyset bound after (or before) a row id, so a cursor does not skip rows one by one.
+        Only the returned rows are read; the frame is indexed by row position.
+        """
+        columns = list(self.columns) if columns is None else [c for c in columns if c in self.__types]
+        where, params = self.__where(None, predicates)
+        reverse = before is not None
+        if after is not None or before is not None:
+            bound, bound_params = self.__listing_bound(sort, after if after is not None else before, reverse)
+            where, params = f"{where} AND {bound}", params + bound_params
+        rows = self.__connect().execute(
+            f"SELECT {', '.join(['id'] + [_quote(c) for c in columns])} FROM data WHERE {where} "
+            f"ORDER BY {self.__listing_order(sort, reverse)} LIMIT ? OFFSET ?", params + [limit, offset]
+        ).fetchall()
+        if reverse:
+            rows.reverse()
+        positions = np.asarray([row[0] - 1 for row in rows], dtype=np.int64)
+        if not columns:
+            return DataFrame(index=positions)
+        frame = self.__to_frame([row[1:] for row in rows], columns)
+        frame.index = positions
+        return frame
+
+    def head(self, n: int = 5) -> DataFrame:
+        return self.get_rows(0, min(n, self.__rows))
+
+    def get_moments(self, column: str, predicates: Optional[List[Predicate]] = None) -> MomentAccumulator:
+        """Count, mean, min, max and centred power sums in two SQL passes (mean first, then the moments)."""
+        self.__check_numeric(column)
+        where, params = self.__where(column, predicates)
+        conn = self.__connect()
+        q = _quote(column)
+        count, mean, vmin, vmax = conn.execute(f"SELECT COUNT({q}), AVG({q}), MIN({q}), MAX({q}) FROM data WHERE {where}", params).fetchone()
+        acc = MomentAccumulator()
+        if not count:
+            return acc
+        m2, m3, m4 = conn.execute(
+            f"SELECT TOTAL(({q} - ?) * ({q} - ?)), TOTAL(({q} - ?) * ({q} - ?) * ({q} - ?)), "
+            f"TOTAL(({q} - ?) * ({q} - ?) * ({q} - ?) * ({q} - ?)) FROM data WHERE {where}",
+            [mean] * 9 + params,
+        ).fetchone()
+        acc.count, acc.mean, acc.m2, acc.m3, acc.m4 = int(count), float(mean), float(m2), float(m3), float(m4)
+        acc.min, acc.max = float(vmin), float(vmax)
+        return acc
+
+    def get_sum(self, column: str, predicates: Optional[List[Predicate]] = None) -> Any:
+        self.__check_numeric(column)
+        where, params = self.__where(column, predicates)
+        return self.__connect().execute(f"SELECT COALESCE(SUM({_quote(column)}), 0) FROM data WHERE {where}", params).fetchone()[0]
+
+    def get_quantiles(self, column: str, qs: List[float], predicates: Optional[List[Predicate]] = None) -> List[float]:
+        """
+        Exact quantiles with linear interpolation (as pandas). All of them are read in one ordered
+        pass over the column's index: ROW_NUMBER() ranks the values and only the ranks on both
+        sides of every requested position are returned.
+        """
+        self.__check_numeric(column)
+        where, params = self.__where(column, predicates)
+        conn = self.__connect()
+        count = conn.execute(f"SELECT COUNT(*) FROM data WHERE {where}", params).fetchone()[0]
+        if not count:
+            return [np.nan for _ in qs]
+        positions = [(count - 1) * q for q in qs]
+        ranks = sorted({r for h in positions for r in (int(math.floor(h)), min(int(math.floor(h)) + 1, count - 1))})
+        q = _quote(column)
+        values = dict(conn.execute(
+            f"SELECT rank, value FROM (SELECT ROW_NUMBER() OVER (ORDER BY {q}) - 1 AS rank, {q} AS value "
+            f"FROM data WHERE {where}) WHERE rank IN ({', '.join('?' for _ in ranks)})",
+            params + ranks,
+        ).fetchall())
+        result = []
+        for h in positions:
+            lo = int(math.floor(h))
+            low = float(values[lo])
+            high = float(values[min(lo + 1, count - 1)])
+            result.append(low + (h - lo) * (high - low))
+        return result
+
+    def get_mode(self, column: str, predicates: Optional[List[Predicate]] = None) -> Any:
+        """Most frequent value; ties resolve to the smallest value, as pandas' mode().iloc[0]."""
+        self.__check_column(column)
+        where, params = self.__where(column, predicates)
+        q = _quote(column)
+        row = self.__connect().execute(
+            f"SELECT {q} FROM data WHERE {where} GROUP BY {q} ORDER BY COUNT(*) DESC, {q} ASC LIMIT 1", params
+        ).fetchone()
+        return row[0] if row else None
+
+    def get_approval_index(self) -> Optional[ApprovalIndex]:
+        """Approved/rejected row positions, read once through the loan_approved index."""
+        if APPROVAL_COLUMN not in self.__types:
+            return None
+        if self.__approval_index is None:
+            conn = self.__connect()
+            q = _quote(APPROVAL_COLUMN)
+            approved = [row[0] for row in conn.execute(f"SELECT id - 1 FROM data WHERE {q} = 1 ORDER BY id")]
+            rejected = [row[0] for row in conn.execute(f"SELECT id - 1 FROM data WHERE {q} = 0 OR {q} IS NULL ORDER BY id")]
+            self.__approval_index = ApprovalIndex(np.asarray(approved, dtype=np.int64), np.asarray(rejected, dtype=np.int64))
+        return self.__approval_index
+
+    def get_disk_usage(self) -> int:
+        return os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0
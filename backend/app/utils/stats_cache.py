@@ -0,0 +1,115 @@
+import os
+import inspect
+import functools
+import threading
+import numpy as np
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def freeze(value: Any) -> Any:
+    """
+    Read-only form of a statistic result, so one cached object can be handed to every caller
+    without copying: dicts become MappingProxyType views, lists tuples, numpy scalars Python
+    numbers and arrays non-writeable views.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    return value
+
+
+class StatsCache:
+    """
+    LRU memo of statistic results keyed by (dataset, version, mode, column, statistic, filters, options),
+    bounded by STATS_CACHE_ENTRIES. A result only changes when its dataset publishes a new
+    version, so invalidate() (registered as a reload listener) is the only eviction besides LRU.
+    Values are stored frozen (see freeze) and returned as they are, never copied.
+    Counts hits and misses for /stats/cache.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.__max_entries = max_entries or int(os.environ.get('STATS_CACHE_ENTRIES', '4096'))
+        self.__entries: "OrderedDict[Tuple[Hashable, ...], Any]" = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = threading.Lock()
+
+    def get_or_compute(self, key: Tuple[Hashable, ...], compute: Callable[[], Any],
+                       get_version: Optional[Callable[[], int]] = None) -> Any:
+        """
+        Cached value of key, computing it on a miss. key[1] is the dataset version the caller read;
+        when get_version reports a different version after computing (a reload raced the
+        computation) the value is returned but not stored.
+        """
+        with self.__lock:
+            if key in self.__entries:
+                self.__hits += 1
+                self.__entries.move_to_end(key)
+                return self.__entries[key]
+            self.__misses += 1
+        value = freeze(compute())
+        if get_version is not None and get_version() != key[1]:
+            return value
+        with self.__lock:
+            self.__entries[key] = value
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+        return value
+
+    def invalidate(self, dataset: str, version: Optional[int] = None) -> None:
+        """Drops every entry of the dataset older than version (all of them when version is None)."""
+        with self.__lock:
+            for key in [k for k in self.__entries if k[0] == dataset and (version is None or k[1] < version)]:
+                del self.__entries[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.__lock:
+            lookups = self.__hits + self.__misses
+            return {
+                'entries': len(self.__entries),
+                'max_entries': self.__max_entries,
+                'hits': self.__hits,
+                'misses': self.__misses,
+                'hit_rate': self.__hits / lookups if lookups else None,
+            }
+
+
+def memoized(stat: str):
+    """
+    Decorator for StatsCalculatorController methods taking (column, mode, dataset, filters) or
+    (mode, dataset, filters), plus optional keyword options such as eps that become part of the
+    key: routes the call through the instance's StatsCache (`stats_cache`) under the dataset
+    version read from `get_version(dataset)`. The wrapper's `cache_key(self, *args, **kwargs)`
+    returns the key a call would use, so results computed elsewhere can share entries.
+    """
+    def decorator(method: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(method)
+
+        def cache_key(self, *args: Any, **kwargs: Any) -> Tuple[Hashable, ...]:
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+            dataset = self.get_dataset_name(arguments.get('dataset'))
+            filters = tuple(sorted(f.strip() for f in arguments.get('filters') or [] if f.strip()))
+            mode = arguments.get('mode') if arguments.get('mode') in ('prognosis', 'merged') else 'normal'
+            options = tuple((k, v) for k, v in arguments.items() if k not in ('self', 'column', 'mode', 'dataset', 'filters'))
+            return dataset, self.get_version(dataset), mode, arguments.get('column'), stat, filters, options
+
+        @functools.wraps(method)
+        def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+            key = cache_key(self, *args, **kwargs)
+            return self.stats_cache.get_or_compute(key, lambda: method(self, *args, **kwargs),
+                                                   lambda: self.get_version(key[0]))
+        wrapper.cache_key = cache_key
+        return wrapper
+    return decorator
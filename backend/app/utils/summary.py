@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Union
+
+from app.utils.aggregates import MomentAccumulator
+
+SUMMARY_STATS = ('mean', 'median', 'mode', 'sum', 'deviation', 'skewness', 'kurtosis', 'Q1', 'Q2', 'Q3')
+
+
+def _lerp(a: np.ndarray, b: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Linear interpolation in the form numpy's quantile uses, so results match Series.quantile bit for bit."""
+    return np.where(t >= 0.5, b - (b - a) * (1 - t), a + (b - a) * t)
+
+
+def _to_scalar(value: Any, integer: bool) -> Union[float, int]:
+    return int(value) if integer else float(value)
+
+
+def sorted_quantile(ordered: np.ndarray, q: float) -> float:
+    """Linear-interpolated quantile (Series.quantile) of ascending, NaN-free values."""
+    if not len(ordered):
+        return np.nan
+    position = q * (len(ordered) - 1)
+    lo, hi = int(np.floor(position)), int(np.ceil(position))
+    return float(_lerp(ordered[lo], ordered[hi], np.float64(position - lo)))
+
+
+def sorted_median(ordered: np.ndarray) -> float:
+    n = len(ordered)
+    return float((ordered[(n - 1) // 2] + ordered[n // 2]) / 2) if n else np.nan
+
+
+def sorted_mode(ordered: np.ndarray) -> Optional[float]:
+    """Most frequent of ascending, NaN-free values; the smallest one on ties (Series.mode().iloc[0])."""
+    n = len(ordered)
+    if not n:
+        return None
+    starts = np.flatnonzero(np.concatenate(([True], ordered[1:] != ordered[:-1])))
+    runs = np.diff(np.append(starts, n))
+    return float(ordered[starts[int(np.argmax(runs))]])
+
+
+def summarize(frame: pd.DataFrame, columns: Optional[List[str]] = None) -> Dict[str, Dict[str, Union[float, int, None]]]:
+    """
+    The /summary table ({stat: {column: value}}) of the numeric columns of frame, computed on
+    one 2-D float64 array: one reduction for sums and means, one pass of centred powers for
+    the moments (deviation, skewness and kurtosis with the MomentAccumulator/pandas bias
+    corrections), and one column-wise sort shared by the quartiles, the median and the mode.
+    Missing values are skipped like pandas does.
+    """
+    columns = list(frame.columns) if columns is None else list(columns)
+    res: Dict[str, Dict[str, Union[float, int, None]]] = {stat: {} for stat in SUMMARY_STATS}
+    if not columns:
+        return res
+    integer = [pd.api.types.is_integer_dtype(frame[c].dtype) for c in columns]
+    values = np.empty((len(frame), len(columns)), dtype=np.float64)
+    for j, c in enumerate(columns):
+        values[:, j] = frame[c].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    missing = np.isnan(values)
+    counts = len(values) - missing.sum(axis=0)
+    sums = np.where(missing, 0.0, values).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+    d = np.where(missing, 0.0, values - means)
+    d2 = d * d
+    m2, m3, m4 = d2.sum(axis=0), (d2 * d).sum(axis=0), (d2 * d2).sum(axis=0)
+    del d, d2
+
+    # NaN sorts last, so the first counts[j] entries of every column are its values in order
+    ordered = np.sort(values, axis=0) if len(values) else np.full((1, len(columns)), np.nan)
+    last = np.maximum(counts - 1, 0)
+    cols = np.arange(len(columns))
+    quartiles = {}
+    for name, q in (('Q1', 0.25), ('Q2', 0.5), ('Q3', 0.75)):
+        position = q * last
+        lo = np.floor(position).astype(np.int64)
+        hi = np.ceil(position).astype(np.int64)
+        quartiles[name] = _lerp(ordered[lo, cols], ordered[hi, cols], position - lo)
+    medians = (ordered[last // 2, cols] + ordered[counts // 2, cols]) / 2
+
+    for j, c in enumerate(columns):
+        n = int(counts[j])
+        moments = MomentAccumulator()
+        moments.count, moments.mean, moments.m2, moments.m3, moments.m4 = n, float(means[j]), float(m2[j]), float(m3[j]), float(m4[j])
+        mode = sorted_mode(ordered[:n, j])
+        res['mean'][c] = moments.get_mean()
+        res['median'][c] = float(medians[j]) if n else np.nan
+        res['mode'][c] = _to_scalar(mode, integer[j]) if mode is not None else None
+        res['sum'][c] = _to_scalar(sums[j], integer[j])
+        res['deviation'][c] = moments.get_deviation()
+        res['skewness'][c] = moments.get_skewness()
+        res['kurtosis'][c] = moments.get_kurtosis()
+        for name in ('Q1', 'Q2', 'Q3'):
+            res[name][c] = float(quartiles[name][j]) if n else np.nan
+    return res
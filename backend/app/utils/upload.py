@@ -0,0 +1,97 @@
+import io
+import os
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from typing import BinaryIO, Callable, Optional
+
+from app.utils.schema import BOOL_COLUMNS, FALSY_VALUES, NUMERIC_COLUMNS, REQUIRED_COLUMNS, TRUTHY_VALUES
+
+_READ_BLOCK = 1 << 16
+
+
+class _TeeReader(io.RawIOBase):
+    """Raw reader over the request stream that copies every byte handed to the parser into a file."""
+
+    def __init__(self, stream: BinaryIO, sink: BinaryIO, max_bytes: Optional[int]):
+        self.__stream = stream
+        self.__sink = sink
+        self.__max_bytes = max_bytes
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self.__stream.read(min(len(buffer), _READ_BLOCK))
+        if not data:
+            return 0
+        self.bytes_read += len(data)
+        if self.__max_bytes is not None and self.bytes_read > self.__max_bytes:
+            raise ValueError(f"Upload exceeds the limit of {self.__max_bytes // (1024 * 1024)} MB")
+        self.__sink.write(data)
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def validate_chunk(chunk: DataFrame, first_row: int) -> None:
+    """
+    Checks one parsed chunk against the loan schema: required columns, numeric columns that
+    parse as numbers and approval flags in one of the known spellings. first_row is the
+    1-based line number of the chunk's first data row, used in error messages.
+    """
+    missing = [c for c in REQUIRED_COLUMNS if c not in chunk.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)} (expected ';'-separated {', '.join(REQUIRED_COLUMNS)})")
+    for col in NUMERIC_COLUMNS:
+        values = chunk[col]
+        if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+            continue
+        invalid = np.flatnonzero(pd.to_numeric(values, errors='coerce').isna().to_numpy() & values.notna().to_numpy())
+        if invalid.size:
+            pos = int(invalid[0])
+            raise ValueError(f"Row {first_row + pos}: column '{col}' must be numeric, got '{values.iloc[pos]}'")
+    for col in BOOL_COLUMNS:
+        values = chunk[col]
+        if pd.api.types.is_bool_dtype(values.dtype):
+            continue
+        lowered = values.astype(str).str.strip().str.lower()
+        invalid = np.flatnonzero(~lowered.isin(TRUTHY_VALUES + FALSY_VALUES).to_numpy())
+        if invalid.size:
+            pos = int(invalid[0])
+            raise ValueError(f"Row {first_row + pos}: column '{col}' must be a boolean, got '{values.iloc[pos]}'")
+
+
+def ingest_csv_stream(stream: BinaryIO, out_path: str, sep: str = ';', chunksize: int = 100000,
+                      max_bytes: Optional[int] = None, on_chunk: Optional[Callable[[DataFrame], None]] = None) -> int:
+    """
+    Copies an uploaded CSV stream to out_path while parsing and validating it chunk by chunk,
+    so an invalid upload fails at the first bad row and memory stays at one chunk.
+    Each validated chunk is handed to on_chunk. Returns the number of rows; on any error the
+    partial file is removed and a ValueError is raised.
+    """
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = f"{out_path}.part"
+    rows = 0
+    try:
+        with open(tmp_path, 'wb') as sink:
+            tee = _TeeReader(stream, sink, max_bytes)
+            text = io.TextIOWrapper(io.BufferedReader(tee), encoding='utf-8', newline='')
+            try:
+                for chunk in pd.read_csv(text, sep=sep, chunksize=chunksize):
+                    validate_chunk(chunk, rows + 2)
+                    if on_chunk is not None:
+                        on_chunk(chunk)
+                    rows += len(chunk)
+            except pd.errors.EmptyDataError:
+                raise ValueError("Uploaded CSV is empty")
+            except (pd.errors.ParserError, UnicodeDecodeError) as ex:
+                raise ValueError(f"Invalid CSV after row {rows + 1}: {ex}")
+        if rows == 0:
+            raise ValueError("Uploaded CSV has no data rows")
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return rows
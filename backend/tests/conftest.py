@@ -0,0 +1,55 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# the app loads its datasets on import, so the environment is fixed before anything imports it
+_TMP_DIR = tempfile.mkdtemp(prefix='loan-stats-tests-')
+os.environ.setdefault('DATA_RELOAD_INTERVAL', '0')
+os.environ.setdefault('UPLOAD_DIR', os.path.join(_TMP_DIR, 'uploads'))
+os.environ.setdefault('COLUMNAR_CACHE_DIR', os.path.join(_TMP_DIR, 'columnar'))
+os.environ.setdefault('SQLITE_STORE_DIR', os.path.join(_TMP_DIR, 'sqlite'))
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def app():
+    from app import app as flask_app
+    flask_app.config['TESTING'] = True
+    return flask_app
+
+
+@pytest.fixture()
+def client(app):
+    return app.test_client()
+
+
+LOAN_COLUMNS = ('name', 'city', 'income', 'credit_score', 'loan_amount', 'years_employed', 'points', 'loan_approved')
+LOAN_ROWS = [
+    ('Ann Lee', 'Austin', 52000, 710, 15000, 4, 55.0, 'True'),
+    ('Bob Ray', 'Boston', 61000, 640, 22000, 7, 48.5, 'False'),
+    ('Cid Moe', 'Austin', 47000, 580, 9000, 2, 40.0, 'False'),
+    ('Dee Fox', 'Denver', 88000, 790, 30000, 12, 71.5, 'True'),
+    ('Eve Kim', 'Boston', 39000, 620, 12000, 1, 35.0, 'False'),
+    ('Fay Orr', 'Denver', 75000, 705, 26000, 9, 66.0, 'True'),
+    ('Gus Pym', 'Austin', 58000, 675, 18000, 5, 52.5, 'True'),
+    ('Hal Roe', 'Boston', 43000, 600, 11000, 3, 38.0, 'False'),
+]
+
+
+def loan_csv(rows=LOAN_ROWS) -> bytes:
+    lines = [';'.join(LOAN_COLUMNS)] + [';'.join(str(v) for v in row) for row in rows]
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+@pytest.fixture()
+def upload(client):
+    """Uploads loan rows as a new dataset and returns the registration result (id, rows, storage, ...)."""
+    def upload_rows(rows=LOAN_ROWS, storage=None):
+        query = f"?storage={storage}" if storage else ""
+        response = client.post(f"/datasets{query}", data=loan_csv(rows), content_type='text/csv')
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()['result']
+    return upload_rows
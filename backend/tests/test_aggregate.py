@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+
+from app.controllers.AggregationController import AggregationControllerInstance
+from conftest import LOAN_COLUMNS, LOAN_ROWS
+
+ROWS = LOAN_ROWS + [('Ivy Ng', '', 50000, 650, 10000, 3, 44.0, 'True')]
+
+
+def _aggregate(client, dataset, **params):
+    query = '&'.join(f"{k}={v}" for k, v in params.items())
+    return client.get(f"/data/aggregate?dataset={dataset}&{query}")
+
+
+def _expected(by, column):
+    frame = pd.DataFrame(ROWS, columns=LOAN_COLUMNS).replace({'city': {'': None}})
+    frame['loan_approved'] = frame['loan_approved'] == 'True'
+    groups = frame.groupby(by, dropna=False, sort=True)[column]
+    return groups.agg(['mean', 'sum', 'min', 'max', 'count']).reset_index()
+
+
+def test_aggregate_matches_pandas(client, upload):
+    dataset = upload(ROWS)['id']
+
+    result = _aggregate(client, dataset, by='city', metrics='income:mean,income:sum,income:min,income:max,count').get_json()['result']
+
+    expected = _expected(['city'], 'income')
+    assert [r['city'] for r in result] == ['Austin', 'Boston', 'Denver', None]
+    assert [r['income:sum'] for r in result] == expected['sum'].tolist()
+    assert [r['income:mean'] for r in result] == pytest.approx(expected['mean'].tolist())
+    assert [r['count'] for r in result] == expected['count'].tolist()
+
+
+def test_roll_up_does_not_depend_on_request_order(client, upload):
+    coarse_first, fine_first = upload(ROWS)['id'], upload(ROWS)['id']
+
+    direct = _aggregate(client, coarse_first, by='loan_approved', metrics='income:sum,credit_score:max,count').get_json()['result']
+    _aggregate(client, fine_first, by='city,loan_approved', metrics='count')
+    rolled = _aggregate(client, fine_first, by='loan_approved', metrics='income:sum,credit_score:max,count').get_json()['result']
+
+    assert rolled == direct
+    assert sum(r['count'] for r in rolled) == len(ROWS)
+
+
+def test_rolled_up_partials_are_cached(client, upload):
+    dataset = upload(ROWS)['id']
+    AggregationControllerInstance.get_partials(['city', 'loan_approved'], dataset=dataset)
+
+    first, _ = AggregationControllerInstance.get_partials(['city'], dataset=dataset)
+    second, _ = AggregationControllerInstance.get_partials(['city'], dataset=dataset)
+
+    assert first is second
+
+
+def test_filters_apply_before_grouping(client, upload):
+    dataset = upload(ROWS)['id']
+
+    result = _aggregate(client, dataset, by='loan_approved', metrics='count', filter='credit_score>=650').get_json()['result']
+
+    assert {r['loan_approved']: r['count'] for r in result} == {True: 5}
+
+
+@pytest.mark.parametrize('params', [
+    {'metrics': 'count'},
+    {'by': 'city', 'metrics': ''},
+    {'by': 'salary', 'metrics': 'count'},
+    {'by': 'city', 'metrics': 'income:median'},
+    {'by': 'city', 'metrics': 'name:sum'},
+])
+def test_invalid_aggregate_is_rejected(client, upload, params):
+    response = _aggregate(client, upload(ROWS)['id'], **params)
+
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
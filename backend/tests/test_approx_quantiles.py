@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from app.controllers.FilesController import FilesControllerInstance
+from app.utils.aggregates import KLLSketch
+
+
+def _rank(values, value):
+    return np.searchsorted(np.sort(values), value, side='right') / len(values)
+
+
+def test_sketch_rank_error_is_within_eps():
+    values = np.random.default_rng(3).lognormal(10, 1, 100_000)
+    eps = 0.01
+    sketch = KLLSketch(KLLSketch.k_for_error(eps), seed=0)
+    sketch.update(values)
+
+    qs = [0.01, 0.25, 0.5, 0.75, 0.99]
+    for q, value in zip(qs, sketch.get_quantiles(qs)):
+        assert abs(_rank(values, value) - q) <= eps
+    assert sketch.get_memory_usage() < values.nbytes / 10
+
+
+def test_merged_sketches_cover_both_inputs():
+    rng = np.random.default_rng(5)
+    first, second = rng.normal(0, 1, 40_000), rng.normal(5, 1, 20_000)
+    k = KLLSketch.k_for_error(0.01)
+    sketch = KLLSketch(k, seed=0)
+    sketch.update(first)
+    other = KLLSketch(k, seed=1)
+    other.update(second)
+
+    sketch.merge(other)
+
+    values = np.concatenate([first, second])
+    assert abs(_rank(values, sketch.get_quantiles([0.5])[0]) - 0.5) <= 0.01
+
+
+@pytest.mark.parametrize('mode', ['normal', 'prognosis', 'merged'])
+def test_approx_quartiles_are_within_eps_of_exact(client, mode):
+    _, data = FilesControllerInstance.get_frame(None, mode)
+    values = data['income'].to_numpy(dtype=float)
+
+    response = client.get(f"/quartiles?column_name=income&mode={mode}&approx=true&eps=0.05")
+
+    assert response.status_code == 200, response.get_json()
+    result = response.get_json()['result']
+    for name, q in (('Q1', 0.25), ('Q2', 0.5), ('Q3', 0.75)):
+        assert abs(_rank(values, result[name]) - q) <= 0.05 + 1 / len(values)
+
+
+def test_approx_median(client):
+    _, data = FilesControllerInstance.get_frame(None, 'normal')
+    values = data['income'].to_numpy(dtype=float)
+
+    result = client.get("/median?column_name=income&approx=true").get_json()['result']
+
+    assert abs(_rank(values, result) - 0.5) <= 0.01 + 1 / len(values)
+
+
+def test_eps_is_ignored_without_approx(client):
+    exact = client.get("/median?column_name=income").get_json()['result']
+
+    assert client.get("/median?column_name=income&eps=5").get_json()['result'] == exact
+
+
+@pytest.mark.parametrize('eps', ['0', '0.9', 'abc', '0.00001'])
+@pytest.mark.parametrize('endpoint', ['/quartiles', '/median'])
+def test_invalid_eps_is_rejected(client, endpoint, eps):
+    response = client.get(f"{endpoint}?column_name=income&approx=true&eps={eps}")
+
+    assert response.status_code == 400
+    assert 'eps' in response.get_json()['error']
+
+
+@pytest.mark.parametrize('endpoint', ['/quantiles-distance', '/chernoff-faces'])
+def test_charts_accept_approx(client, endpoint):
+    response = client.get(f"{endpoint}?language=en&approx=true&eps=0.05")
+
+    assert response.status_code == 200
+    assert response.mimetype == 'image/png'
+    assert client.get(f"{endpoint}?language=en&approx=true&eps=2").status_code == 400
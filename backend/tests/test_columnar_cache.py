@@ -0,0 +1,75 @@
+import os
+import json
+
+import pandas as pd
+
+from app.utils import columnar_cache
+
+
+def _write_csv(path, rows):
+    pd.DataFrame(rows).to_csv(path, sep=';', index=False)
+
+
+def test_second_read_is_served_from_the_sidecar(tmp_path, monkeypatch):
+    monkeypatch.setenv('COLUMNAR_CACHE_DIR', str(tmp_path / 'cache'))
+    csv_path = tmp_path / 'data.csv'
+    _write_csv(csv_path, {'city': ['a', 'b', None], 'income': [1, 2, 3]})
+
+    first = columnar_cache.read_csv_cached(str(csv_path))
+    assert os.path.exists(tmp_path / 'cache' / 'data' / 'meta.json')
+    second = columnar_cache.read_csv_cached(str(csv_path))
+
+    assert list(second.columns) == ['city', 'income']
+    assert second['income'].tolist() == [1, 2, 3]
+    assert second['city'].iloc[:2].tolist() == ['a', 'b'] and pd.isna(second['city'].iloc[2])
+    assert sorted(os.listdir(tmp_path / 'cache')) == ['data']
+
+
+def test_touched_source_refreshes_meta_atomically(tmp_path, monkeypatch):
+    monkeypatch.setenv('COLUMNAR_CACHE_DIR', str(tmp_path / 'cache'))
+    csv_path = tmp_path / 'data.csv'
+    _write_csv(csv_path, {'income': [1, 2, 3]})
+    columnar_cache.read_csv_cached(str(csv_path))
+
+    st = os.stat(csv_path)
+    os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    columnar_cache.read_csv_cached(str(csv_path))
+
+    cache_dir = tmp_path / 'cache' / 'data'
+    with open(cache_dir / 'meta.json', encoding='utf-8') as f:
+        meta = json.load(f)
+    assert meta['source']['mtime_ns'] == os.stat(csv_path).st_mtime_ns
+    assert not [name for name in os.listdir(cache_dir) if '.tmp-' in name]
+
+
+def test_changed_source_rebuilds_the_sidecar(tmp_path, monkeypatch):
+    monkeypatch.setenv('COLUMNAR_CACHE_DIR', str(tmp_path / 'cache'))
+    csv_path = tmp_path / 'data.csv'
+    _write_csv(csv_path, {'income': [1, 2, 3]})
+    columnar_cache.read_csv_cached(str(csv_path))
+
+    _write_csv(csv_path, {'income': [4, 5, 6, 7]})
+    df = columnar_cache.read_csv_cached(str(csv_path))
+
+    assert df['income'].tolist() == [4, 5, 6, 7]
+    assert sorted(os.listdir(tmp_path / 'cache')) == ['data']
+
+
+def test_sidecar_of_another_schema_is_rebuilt(tmp_path, monkeypatch):
+    monkeypatch.setenv('COLUMNAR_CACHE_DIR', str(tmp_path / 'cache'))
+    csv_path = tmp_path / 'data.csv'
+    _write_csv(csv_path, {'flag': ['Tak', 'no']})
+
+    def to_upper(df):
+        return df.assign(flag=df['flag'].str.upper())
+
+    def to_lower(df):
+        return df.assign(flag=df['flag'].str.lower())
+
+    columnar_cache.read_csv_cached(str(csv_path), transform=to_upper, schema='old')
+    to_upper.__code__ = to_lower.__code__  # same transform name, different output
+    df = columnar_cache.read_csv_cached(str(csv_path), transform=to_upper, schema='new')
+
+    assert df['flag'].tolist() == ['tak', 'no']
+    with open(tmp_path / 'cache' / 'data' / 'meta.json', encoding='utf-8') as f:
+        assert json.load(f)['schema'] == 'new'
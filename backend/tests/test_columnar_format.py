@@ -0,0 +1,23 @@
+def test_columnar_data_matches_records(client, upload):
+    dataset = upload()['id']
+
+    records = client.get(f"/data?dataset={dataset}&per_page=4").get_json()['result']['data']
+    columnar = client.get(f"/data?dataset={dataset}&per_page=4&format=columnar").get_json()['result']['data']
+
+    assert set(columnar) == set(records[0])
+    assert [dict(zip(columnar, values)) for values in zip(*columnar.values())] == records
+
+
+def test_columnar_summary_and_datasets(client):
+    summary = client.get("/summary?format=columnar")
+    datasets = client.get("/datasets?format=columnar")
+
+    assert summary.status_code == 200 and datasets.status_code == 200
+    by_stat = client.get("/summary").get_json()['result']
+    table = summary.get_json()['result']
+    assert table['mean'] == [by_stat['mean'][column] for column in table['column']]
+    assert 'part_of_loan_approval' in datasets.get_json()['result']['name']
+
+
+def test_unknown_format_is_rejected(client):
+    assert client.get("/data?format=xml").status_code == 400
@@ -0,0 +1,46 @@
+from urllib.parse import quote
+
+import pytest
+
+from conftest import LOAN_ROWS
+
+
+def _data(client, dataset, **params):
+    query = '&'.join(f"{k}={quote(str(v))}" for k, v in params.items())
+    return client.get(f"/data?dataset={dataset}&per_page=100&{query}")
+
+
+def test_filters_narrow_the_listing(client, upload):
+    dataset = upload()['id']
+
+    result = _data(client, dataset, filter='credit_score>=650').get_json()['result']
+
+    expected = [row[0] for row in LOAN_ROWS if row[3] >= 650]
+    assert result['total'] == len(expected)
+    assert [row['name'] for row in result['data']] == expected
+
+
+def test_sort_keeps_file_order_for_ties(client, upload):
+    dataset = upload()['id']
+
+    result = _data(client, dataset, sort='city:asc').get_json()['result']
+
+    expected = [row[0] for row in sorted(LOAN_ROWS, key=lambda r: r[1])]
+    assert [row['name'] for row in result['data']] == expected
+
+
+def test_sort_and_filter_combine(client, upload):
+    dataset = upload()['id']
+
+    result = _data(client, dataset, sort='income:desc', filter='loan_approved=true').get_json()['result']
+
+    expected = [row[0] for row in sorted(LOAN_ROWS, key=lambda r: -r[2]) if row[7] == 'True']
+    assert [row['name'] for row in result['data']] == expected
+
+
+@pytest.mark.parametrize('params', [{'sort': 'missing:asc'}, {'sort': 'income:sideways'}, {'filter': 'missing>1'}, {'filter': 'income~1'}])
+def test_invalid_sort_or_filter_is_rejected(client, upload, params):
+    response = _data(client, upload()['id'], **params)
+
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
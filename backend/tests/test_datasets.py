@@ -0,0 +1,29 @@
+import os
+
+
+def test_registry_lists_the_bundled_datasets(client):
+    response = client.get("/datasets")
+
+    assert response.status_code == 200
+    datasets = {d['name']: d for d in response.get_json()['result']}
+    assert datasets['part_of_loan_approval']['default'] is True
+    assert 'loan_approval' in datasets
+
+
+def test_unknown_dataset_is_rejected(client):
+    response = client.get("/mean?column_name=income&dataset=missing")
+
+    assert response.status_code == 400
+    assert response.get_json() == {'success': False, 'error': "Unknown dataset 'missing'"}
+
+
+def test_missing_prognosis_is_generated_on_first_use(client, upload):
+    dataset = upload()
+    prognosis_path = os.path.join(os.environ['UPLOAD_DIR'], f"prognosis_{dataset['id']}.csv")
+    assert not os.path.exists(prognosis_path)
+
+    response = client.get(f"/data?dataset={dataset['id']}&mode=prognosis&per_page=100")
+
+    assert response.status_code == 200
+    assert os.path.exists(prognosis_path)
+    assert response.get_json()['result']['data']
@@ -0,0 +1,63 @@
+import io
+import json
+
+import pytest
+
+from conftest import LOAN_COLUMNS, LOAN_ROWS
+
+
+def _export(client, dataset, **params):
+    query = '&'.join(f"{k}={v}" for k, v in params.items())
+    return client.get(f"/data/export?dataset={dataset}&{query}")
+
+
+def test_csv_export(client, upload):
+    dataset = upload()['id']
+
+    response = _export(client, dataset, format='csv')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0] == ';'.join(LOAN_COLUMNS + ('dataset',))
+    assert lines[1] == 'Ann Lee;Austin;52000;710;15000;4;55.0;True;normal'
+    assert len(lines) == len(LOAN_ROWS) + 1
+
+
+def test_ndjson_export_matches_data_pages(client, upload):
+    dataset = upload()['id']
+
+    response = _export(client, dataset, format='ndjson', columns='name,income', sort='income:desc')
+
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    page = client.get(f"/data?dataset={dataset}&per_page=100&columns=name,income&sort=income:desc").get_json()['result']['data']
+    assert records == page
+
+
+def test_merged_ndjson_keeps_integers_of_normal_rows(client, upload):
+    dataset = upload()['id']
+
+    response = _export(client, dataset, format='ndjson', mode='merged')
+
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    normal = [r for r in records if r['dataset'] == 'normal']
+    assert [r['credit_score'] for r in normal] == [row[3] for row in LOAN_ROWS]
+    assert all(isinstance(r['credit_score'], int) and isinstance(r['income'], int) for r in normal)
+    assert any(r['dataset'] == 'prognosis' for r in records)
+
+
+def test_arrow_export(client, upload):
+    pa = pytest.importorskip('pyarrow')
+    dataset = upload()['id']
+
+    response = _export(client, dataset, format='arrow', mode='merged')
+
+    table = pa.ipc.open_stream(io.BytesIO(response.get_data())).read_all()
+    assert table.column('name').to_pylist()[:len(LOAN_ROWS)] == [row[0] for row in LOAN_ROWS]
+
+
+@pytest.mark.parametrize('params', [{'format': 'xml'}, {'columns': 'missing'}, {'sort': 'missing:asc'}])
+def test_invalid_export_is_rejected(client, upload, params):
+    response = _export(client, upload()['id'], **params)
+
+    assert response.status_code == 400
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.filters import Predicate, build_mask, parse_filters
+from app.utils.row_index import RowIndexCache
+
+
+def test_parse_filters():
+    predicates = parse_filters(['credit_score>=700', 'loan_approved=true', 'city in (Austin, Boston)'])
+
+    assert predicates == [
+        Predicate('credit_score', '>=', 700),
+        Predicate('loan_approved', '=', True),
+        Predicate('city', 'in', ('Austin', 'Boston')),
+    ]
+
+
+@pytest.mark.parametrize('expression', ['income', 'income>=', 'city in Austin', 'city in ()'])
+def test_malformed_filters_are_rejected(expression):
+    with pytest.raises(ValueError):
+        parse_filters([expression])
+
+
+def test_equal_values_of_different_types_have_different_keys():
+    one, true = parse_filters(['flag=1', 'flag=true'])
+
+    assert one.value == true.value
+    assert one.key != true.key
+    assert parse_filters(['flag in (1,2)'])[0].key != parse_filters(['flag in (true,2)'])[0].key
+    assert parse_filters(['flag=1'])[0].key == one.key
+
+
+class _CountingFrame:
+    def __init__(self, frame):
+        self.frame = frame
+        self.reads = 0
+
+    def __len__(self):
+        return len(self.frame)
+
+    def __getitem__(self, column):
+        self.reads += 1
+        return self.frame[column]
+
+
+def test_row_index_cache_keeps_typed_masks_apart():
+    data = _CountingFrame(pd.DataFrame({'flag': np.array([1, 0, 1])}))
+    cache = RowIndexCache(max_entries=8)
+    scope = ('loans', 1, 'normal')
+    one, true = parse_filters(['flag=1', 'flag=true'])
+
+    assert cache.get_mask(scope, data, one).tolist() == [True, False, True]
+    cache.get_mask(scope, data, true)
+    cache.get_mask(scope, data, one)
+
+    assert data.reads == 2
+    assert build_mask(data.frame, [one]).tolist() == [True, False, True]
@@ -0,0 +1,44 @@
+import os
+
+from app.controllers.FilesController import FilesControllerInstance
+from conftest import LOAN_ROWS, loan_csv
+
+
+def _rewrite(dataset, rows):
+    path = os.path.join(os.environ['UPLOAD_DIR'], f"{dataset}.csv")
+    with open(path, 'wb') as f:
+        f.write(loan_csv(rows))
+
+
+def test_reload_publishes_a_new_version(client, upload):
+    dataset = upload()
+    before = client.get(f"/mean?column_name=income&dataset={dataset['id']}").get_json()['result']
+
+    _rewrite(dataset['id'], [row[:2] + (row[2] * 2,) + row[3:] for row in LOAN_ROWS])
+    assert FilesControllerInstance.reload(dataset['id'])
+
+    assert FilesControllerInstance.get_version(dataset['id']) > dataset['version']
+    after = client.get(f"/mean?column_name=income&dataset={dataset['id']}").get_json()['result']
+    assert after == before * 2
+
+
+def test_reload_drops_cached_pages(client, upload):
+    dataset = upload()
+    first = client.get(f"/data?dataset={dataset['id']}&per_page=100")
+    assert first.status_code == 200
+
+    _rewrite(dataset['id'], LOAN_ROWS[:3])
+    assert FilesControllerInstance.reload(dataset['id'])
+
+    second = client.get(f"/data?dataset={dataset['id']}&per_page=100", headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert len(second.get_json()['result']['data']) == 3
+
+
+def test_failed_reload_keeps_the_current_snapshot(client, upload):
+    dataset = upload()
+    os.remove(os.path.join(os.environ['UPLOAD_DIR'], f"{dataset['id']}.csv"))
+
+    assert not FilesControllerInstance.reload(dataset['id'])
+    assert FilesControllerInstance.get_version(dataset['id']) == dataset['version']
+    assert client.get(f"/sum?column_name=income&dataset={dataset['id']}").get_json()['result'] == sum(r[2] for r in LOAN_ROWS)
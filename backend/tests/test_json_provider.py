@@ -0,0 +1,47 @@
+import json
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def test_numpy_and_pandas_values_are_encoded(app):
+    document = {
+        'int': np.int16(3), 'float': np.float32(1.5), 'bool': np.bool_(True),
+        'array': np.arange(3), 'series': pd.Series([1, 2]), 'missing': pd.NA,
+    }
+
+    assert json.loads(app.json.dumps(document)) == {
+        'int': 3, 'float': 1.5, 'bool': True, 'array': [0, 1, 2], 'series': [1, 2], 'missing': None,
+    }
+
+
+def test_non_finite_numbers_are_written_as_null(app):
+    encoded = app.json.dumps({'nan': float('nan'), 'inf': np.float64('inf'), 'values': np.array([1.0, np.nan])})
+
+    assert json.loads(encoded) == {'nan': None, 'inf': None, 'values': [1.0, None]}
+    assert 'NaN' not in encoded
+
+
+def test_raise_policy_rejects_non_finite_numbers(app, monkeypatch):
+    monkeypatch.setattr(type(app.json), 'nan_policy', 'raise')
+
+    assert app.json.dumps({'value': 1.5}) == '{"value":1.5}'
+    with pytest.raises(ValueError):
+        app.json.dumps({'value': float('nan')})
+
+
+def test_read_only_mappings_are_encoded(app, monkeypatch):
+    document = MappingProxyType({'Q1': 1.0, 'nested': MappingProxyType({'x': float('nan')})})
+
+    assert json.loads(app.json.dumps(document)) == {'Q1': 1.0, 'nested': {'x': None}}
+    monkeypatch.setattr(type(app.json), 'nan_policy', 'raise')
+    assert json.loads(app.json.dumps(MappingProxyType({'Q1': (1.0, 2.0)}))) == {'Q1': [1.0, 2.0]}
+
+
+def test_responses_use_the_provider(client):
+    response = client.get("/mean?column_name=income")
+
+    assert response.status_code == 200
+    assert isinstance(response.get_json()['result'], float)
@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+
+from app.utils.schema import BOOL_LABELS, to_bool_series
+
+
+@pytest.mark.parametrize('language', sorted(BOOL_LABELS))
+def test_approval_flags_are_localized(client, upload, language):
+    dataset = upload()['id']
+
+    rows = client.get(f"/data?dataset={dataset}&per_page=100&language={language}").get_json()['result']['data']
+
+    labels = BOOL_LABELS[language]
+    assert [row['loan_approved'] for row in rows] == [labels[True], labels[False], labels[False], labels[True],
+                                                      labels[False], labels[True], labels[True], labels[False]]
+    assert to_bool_series(pd.Series([row['loan_approved'] for row in rows])).tolist() == [r['loan_approved'] == labels[True] for r in rows]
+
+
+def test_merged_rows_carry_a_localized_dataset_label_and_a_code(client, upload):
+    dataset = upload()['id']
+
+    result = client.get(f"/data?dataset={dataset}&per_page=100&mode=merged&language=de").get_json()['result']
+
+    assert {row['dataset_code'] for row in result['data']} == {'normal', 'prognosis'}
+    assert {row['dataset'] for row in result['data']} == {'Normal', 'Prognose'}
+
+
+def test_without_language_the_raw_values_are_returned(client, upload):
+    dataset = upload()['id']
+
+    row = client.get(f"/data?dataset={dataset}&per_page=1").get_json()['result']['data'][0]
+
+    assert row['loan_approved'] is True
+    assert row['income'] == 52000
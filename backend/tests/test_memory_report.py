@@ -0,0 +1,12 @@
+def test_memory_report_lists_compact_dtypes(client, upload):
+    dataset = upload()
+
+    response = client.get("/datasets/memory")
+
+    assert response.status_code == 200
+    entry = next(e for e in response.get_json()['result'] if e['name'] == dataset['id'])
+    frame = entry['frames']['data']
+    assert frame['city']['dtype'] == 'category'
+    assert frame['loan_approved']['dtype'] == 'bool'
+    assert frame['credit_score']['dtype'] == 'int16'
+    assert entry['total_bytes'] >= sum(column['bytes'] for column in frame.values())
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.filters import build_mask, parse_filters
+from app.utils.merged_view import MergedView
+
+
+def _view():
+    normal = pd.DataFrame({'city': pd.Categorical(['a', 'b', 'a']), 'income': np.array([1, 2, 3], dtype=np.int32)})
+    prognosis = pd.DataFrame({'city': pd.Categorical(['c', 'a']), 'income': [4.5, 5.5]})
+    return normal, prognosis, MergedView(normal, prognosis)
+
+
+def test_columns_are_stitched_in_merged_order():
+    normal, prognosis, view = _view()
+
+    assert view['income'].tolist() == [1, 2, 3, 4.5, 5.5]
+    assert view['city'].tolist() == ['a', 'b', 'a', 'c', 'a']
+    assert view['dataset'].tolist() == ['normal'] * 3 + ['prognosis'] * 2
+    assert view.dtypes['income'] == np.float64
+
+
+def test_stitched_columns_are_not_kept():
+    _, _, view = _view()
+
+    first = view['income']
+    assert view['income'] is not first
+    assert set(view.get_column_memory()) == {'dataset'}
+
+
+def test_parts_reference_the_frames():
+    normal, prognosis, view = _view()
+
+    first, second = view.get_parts(['income', 'dataset'])
+
+    assert np.shares_memory(first['income'].to_numpy(), normal['income'].to_numpy())
+    assert second['income'].tolist() == [4.5, 5.5]
+    assert first['dataset'].tolist() == ['normal'] * 3 and second['dataset'].tolist() == ['prognosis'] * 2
+
+
+def test_masks_are_built_per_part():
+    _, _, view = _view()
+
+    assert build_mask(view, parse_filters(['city=a', 'income>=3'])).tolist() == [False, False, True, False, True]
+    assert build_mask(view, parse_filters(['dataset=prognosis'])).tolist() == [False] * 3 + [True] * 2
+
+
+def test_row_access_only_touches_the_requested_rows():
+    _, _, view = _view()
+
+    rows = view.iloc[2:4]
+    assert rows.index.tolist() == [2, 3]
+    assert rows['income'].tolist() == [3, 4.5]
+
+    taken = view.take(np.array([4, 0]), columns=['income', 'dataset'])
+    assert taken['income'].tolist() == [5.5, 1]
+    assert taken['dataset'].tolist() == ['prognosis', 'normal']
+    assert set(view.get_column_memory()) == {'dataset'}
+
+
+def test_merged_requests_keep_no_stitched_columns(client):
+    from app.controllers.FilesController import FilesControllerInstance
+
+    for url in ("/data/aggregate?by=city&metrics=income:mean&mode=merged",
+                "/sum?column_name=income&mode=merged&filter=credit_score%3E%3D600",
+                "/data?mode=merged&sort=income:desc&filter=credit_score%3E%3D600&language=en"):
+        assert client.get(url).status_code == 200, url
+
+    report = next(e for e in client.get("/datasets/memory").get_json()['result'] if e['name'] == FilesControllerInstance.DEFAULT_DATASET)
+    assert set(report['frames']['merged']) == {'dataset'}
+
+
+def test_merged_reductions_match_the_stitched_frame(client):
+    from app.controllers.FilesController import FilesControllerInstance
+
+    _, view = FilesControllerInstance.get_frame(None, 'merged')
+    frame = view.to_frame()
+    approved = frame[frame['credit_score'] >= 600]['income'].astype(np.float64)
+
+    def get(stat):
+        return client.get(f"/{stat}?column_name=income&mode=merged&filter=credit_score%3E%3D600").get_json()['result']
+
+    assert get('sum') == approved.sum()
+    assert get('mean') == pytest.approx(approved.mean(), rel=1e-12)
+    assert get('deviation') == pytest.approx(approved.std(), rel=1e-10)
+    assert get('skewness') == pytest.approx(approved.skew(), rel=1e-8)
+    assert get('kurtosis') == pytest.approx(approved.kurt(), rel=1e-8)
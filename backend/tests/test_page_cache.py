@@ -0,0 +1,45 @@
+def test_matching_etag_gets_304(client, upload):
+    dataset = upload()['id']
+    first = client.get(f"/data?dataset={dataset}")
+
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    second = client.get(f"/data?dataset={dataset}", headers={'If-None-Match': etag})
+
+    assert second.status_code == 304
+    assert second.get_data() == b''
+    assert second.headers['ETag'] == etag
+
+
+def test_other_etag_gets_the_page(client, upload):
+    dataset = upload()['id']
+
+    response = client.get(f"/data?dataset={dataset}", headers={'If-None-Match': '"stale"'})
+
+    assert response.status_code == 200
+    assert response.get_json()['success'] is True
+
+
+def test_equivalent_requests_share_one_entry(client, upload):
+    dataset = upload()['id']
+
+    capped = client.get(f"/data?dataset={dataset}&per_page=5000&mode=MERGED")
+    same = client.get(f"/data?dataset={dataset}&per_page=1000&mode=merged")
+
+    assert capped.headers['ETag'] == same.headers['ETag']
+    assert capped.get_json()['result']['per_page'] == 1000
+
+
+def test_different_pages_have_different_etags(client, upload):
+    dataset = upload()['id']
+
+    etags = {client.get(f"/data?dataset={dataset}&per_page=2&page={page}").headers['ETag'] for page in (1, 2, 3)}
+
+    assert len(etags) == 3
+
+
+def test_errors_are_not_cached(client, upload):
+    dataset = upload()['id']
+
+    assert client.get(f"/data?dataset={dataset}&page=99").status_code == 400
+    assert 'ETag' not in client.get(f"/data?dataset={dataset}&page=99").headers
@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from app.controllers.FilesController import FilesControllerInstance
+from app.utils.pagination import Cursor, clamp_per_page, decode_cursor, encode_cursor
+from conftest import LOAN_ROWS, loan_csv
+
+
+def _page(client, dataset, **params):
+    query = '&'.join(f"{k}={v}" for k, v in params.items())
+    return client.get(f"/data?dataset={dataset}&{query}")
+
+
+def test_cursor_round_trip():
+    cursor = Cursor('scope', 41, 'next')
+
+    assert decode_cursor(encode_cursor(cursor), 'scope') == cursor
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(cursor), 'other')
+    with pytest.raises(ValueError):
+        decode_cursor('not-a-cursor', 'scope')
+
+
+def test_per_page_is_clamped():
+    assert clamp_per_page(None) == 10
+    assert clamp_per_page(10 ** 9) == 1000
+    with pytest.raises(ValueError):
+        clamp_per_page(0)
+
+
+@pytest.mark.parametrize('sort', ['', 'income:desc'])
+def test_cursor_walk_visits_every_row_once(client, upload, sort):
+    dataset = upload()['id']
+    names, cursor = [], None
+    while True:
+        params = {'per_page': 3, 'sort': sort}
+        if cursor:
+            params['cursor'] = cursor
+        result = _page(client, dataset, **params).get_json()['result']
+        names += [row['name'] for row in result['data']]
+        cursor = result['next_cursor']
+        if cursor is None:
+            break
+
+    expected = [row[0] for row in sorted(LOAN_ROWS, key=lambda r: -r[2])] if sort else [row[0] for row in LOAN_ROWS]
+    assert names == expected
+
+    last = _page(client, dataset, per_page=3, sort=sort, page=3).get_json()['result']
+    previous = _page(client, dataset, per_page=3, sort=sort, cursor=last['prev_cursor']).get_json()['result']
+    assert [row['name'] for row in previous['data']] == expected[3:6]
+
+
+def test_cursor_from_another_ordering_is_rejected(client, upload):
+    dataset = upload()['id']
+    cursor = _page(client, dataset, per_page=3).get_json()['result']['next_cursor']
+
+    response = _page(client, dataset, per_page=3, sort='income:desc', cursor=cursor)
+
+    assert response.status_code == 400
+
+
+def test_cursor_expires_on_reload(client, upload):
+    dataset = upload()['id']
+    cursor = _page(client, dataset, per_page=3).get_json()['result']['next_cursor']
+    with open(os.path.join(os.environ['UPLOAD_DIR'], f"{dataset}.csv"), 'wb') as f:
+        f.write(loan_csv(LOAN_ROWS[::-1]))
+    assert FilesControllerInstance.reload(dataset)
+
+    response = _page(client, dataset, per_page=3, cursor=cursor)
+
+    assert response.status_code == 400
+    assert 'restart from the first page' in response.get_json()['error']
+
+
+@pytest.mark.parametrize('params', [{'per_page': 0}, {'per_page': 'x'}, {'page': 0}, {'cursor': 'garbage'}, {'page': 50}])
+def test_invalid_paging_is_rejected(client, upload, params):
+    assert _page(client, upload()['id'], **params).status_code == 400
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.controllers.FilesController import FilesControllerInstance
+from app.utils.aggregates import PartitionMoments
+from conftest import LOAN_ROWS
+
+STATS = (('mean', 'mean'), ('deviation', 'std'), ('skewness', 'skew'), ('kurtosis', 'kurt'))
+
+
+def _frames():
+    rng = np.random.default_rng(11)
+    first = pd.DataFrame({'income': rng.integers(20000, 150000, 300), 'points': rng.normal(50, 8, 300)})
+    second = pd.DataFrame({'income': rng.integers(20000, 150000, 120), 'points': rng.normal(60, 5, 120)})
+    second.loc[::7, 'points'] = np.nan
+    return first, second
+
+
+def _assert_moments(partition, frame):
+    for column in frame.columns:
+        moments = partition.get_moments(column)
+        series = frame[column]
+        assert moments.get_mean() == pytest.approx(series.mean(), rel=1e-12)
+        assert moments.get_deviation() == pytest.approx(series.std(), rel=1e-10)
+        assert moments.get_skewness() == pytest.approx(series.skew(), rel=1e-8)
+        assert moments.get_kurtosis() == pytest.approx(series.kurt(), rel=1e-8)
+
+
+def test_combined_partitions_match_the_concatenated_frame():
+    first, second = _frames()
+
+    combined = PartitionMoments.from_frame(first).combine(PartitionMoments.from_frame(second))
+
+    assert combined.rows == len(first) + len(second)
+    _assert_moments(combined, pd.concat([first, second], ignore_index=True))
+
+
+def test_combine_leaves_the_partitions_untouched():
+    first, second = _frames()
+    partition = PartitionMoments.from_frame(first)
+
+    partition.combine(PartitionMoments.from_frame(second))
+
+    _assert_moments(partition, first)
+
+
+def test_chunked_updates_match_one_pass():
+    first, _ = _frames()
+    partition = PartitionMoments.from_frame(first.iloc[:100])
+    partition.update(first.iloc[100:])
+
+    _assert_moments(partition, first)
+
+
+def test_combine_drops_columns_missing_from_either_side():
+    first, second = _frames()
+
+    combined = PartitionMoments.from_frame(first).combine(PartitionMoments.from_frame(second[['income']]))
+
+    assert combined.numeric_columns == ['income']
+    assert combined.get_moments('points') is None
+
+
+@pytest.mark.parametrize('mode', ['normal', 'prognosis', 'merged'])
+def test_endpoints_match_pandas(client, mode):
+    _, data = FilesControllerInstance.get_frame(None, mode)
+
+    for stat, method in STATS:
+        for column in ('income', 'credit_score', 'points'):
+            response = client.get(f"/{stat}?column_name={column}&mode={mode}")
+            assert response.status_code == 200, response.get_json()
+            expected = getattr(data[column].astype(np.float64), method)()
+            assert response.get_json()['result'] == pytest.approx(expected, rel=1e-9)
+
+
+def test_uploaded_dataset_moments_match_pandas(client, upload):
+    dataset = upload()['id']
+    incomes = pd.Series([row[2] for row in LOAN_ROWS], dtype=np.float64)
+
+    for stat, method in STATS:
+        result = client.get(f"/{stat}?column_name=income&dataset={dataset}").get_json()['result']
+        assert result == pytest.approx(getattr(incomes, method)(), rel=1e-9)
+
+
+def test_filtered_requests_read_the_rows(client, upload):
+    dataset = upload()['id']
+    austin = [row[2] for row in LOAN_ROWS if row[1] == 'Austin']
+
+    result = client.get(f"/mean?column_name=income&dataset={dataset}&filter=city=Austin").get_json()['result']
+
+    assert result == pytest.approx(np.mean(austin))
+
+
+def test_unknown_column_is_rejected(client):
+    assert client.get("/skewness?column_name=nope").status_code == 400
@@ -0,0 +1,35 @@
+import pytest
+
+
+def test_projection_limits_data_columns(client, upload):
+    dataset = upload()['id']
+
+    rows = client.get(f"/data?dataset={dataset}&columns=income,name&per_page=2").get_json()['result']['data']
+
+    assert rows == [{'income': 52000, 'name': 'Ann Lee'}, {'income': 61000, 'name': 'Bob Ray'}]
+
+
+def test_projection_can_include_the_dataset_column(client, upload):
+    dataset = upload()['id']
+
+    rows = client.get(f"/data?dataset={dataset}&columns=income,dataset&mode=merged&language=en&per_page=1").get_json()['result']['data']
+
+    assert rows == [{'income': 52000, 'dataset': 'Normal', 'dataset_code': 'normal'}]
+
+
+def test_projection_applies_to_exports(client, upload):
+    dataset = upload()['id']
+
+    lines = client.get(f"/data/export?dataset={dataset}&columns=city,points").get_data(as_text=True).splitlines()
+
+    assert lines[:2] == ['city;points', 'Austin;55.0']
+
+
+@pytest.mark.parametrize('url', ['/data?columns=income,salary', '/data/export?columns=salary'])
+def test_unknown_projected_columns_are_rejected(client, upload, url):
+    dataset = upload()['id']
+
+    response = client.get(f"{url}&dataset={dataset}")
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == "Unknown column 'salary'"
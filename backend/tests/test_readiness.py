@@ -0,0 +1,22 @@
+from app.controllers.FilesController import FilesControllerInstance
+
+
+def test_ready_once_the_default_dataset_is_loaded(client):
+    assert FilesControllerInstance.wait_until_ready(30)
+
+    response = client.get("/ready")
+
+    assert response.status_code == 200
+    assert response.get_json()['ready'] is True
+    assert response.get_json()['error'] is None
+
+
+def test_not_ready_when_the_default_dataset_failed(client, monkeypatch):
+    assert FilesControllerInstance.wait_until_ready(30)
+    monkeypatch.setattr(FilesControllerInstance, '_FilesController__startup_error', "Dataset 'part_of_loan_approval' could not be loaded")
+
+    response = client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.get_json()['ready'] is False
+    assert 'could not be loaded' in response.get_json()['error']
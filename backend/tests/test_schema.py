@@ -0,0 +1,58 @@
+import os
+import json
+
+import pandas as pd
+import pytest
+
+from app.controllers.FilesController import FilesControllerInstance
+from app.utils import schema
+from app.utils.schema import BOOL_LABELS, FALSY_VALUES, TRUTHY_VALUES, apply_compact_schema, to_bool_series
+
+
+@pytest.mark.parametrize('language', sorted(BOOL_LABELS))
+def test_every_localized_label_reads_back(language):
+    labels = BOOL_LABELS[language]
+
+    assert to_bool_series(pd.Series([labels[True], labels[False]])).tolist() == [True, False]
+    assert labels[True].lower() in TRUTHY_VALUES
+    assert labels[False].lower() in FALSY_VALUES
+
+
+def test_both_korean_spellings_of_no_are_falsy():
+    assert to_bool_series(pd.Series(['아니오', '아니요', '예'])).tolist() == [False, False, True]
+    assert {'아니오', '아니요'} <= set(FALSY_VALUES)
+
+
+def test_flags_are_normalized_case_insensitively():
+    assert to_bool_series(pd.Series([' TRUE ', 'yes', 'False', None])).tolist() == [True, True, False, False]
+    assert to_bool_series(pd.Series([1, 0, None])).tolist() == [True, False, False]
+
+
+def test_compact_schema():
+    frame = apply_compact_schema(pd.DataFrame({
+        'city': ['a', 'b'], 'credit_score': [700, 650], 'points': [1.5, 2.0], 'loan_approved': ['Tak', 'Nie'],
+    }))
+
+    assert isinstance(frame['city'].dtype, pd.CategoricalDtype)
+    assert frame['credit_score'].dtype == 'int16'
+    assert frame['points'].dtype == 'float32'
+    assert frame['loan_approved'].tolist() == [True, False]
+
+
+@pytest.mark.parametrize('values', ['TRUTHY_VALUES', 'FALSY_VALUES'])
+def test_spelling_edits_change_the_fingerprint(monkeypatch, values):
+    monkeypatch.setattr(schema, values, getattr(schema, values) + ['jo'])
+
+    assert schema._schema_fingerprint() != schema.SCHEMA_FINGERPRINT
+
+
+def test_fingerprint_is_stable():
+    assert schema._schema_fingerprint() == schema.SCHEMA_FINGERPRINT
+
+
+def test_reloaded_sidecar_records_the_fingerprint(upload):
+    dataset = upload()['id']
+    assert FilesControllerInstance.reload(dataset)
+
+    with open(os.path.join(os.environ['COLUMNAR_CACHE_DIR'], dataset, 'meta.json'), encoding='utf-8') as f:
+        assert json.load(f)['schema'] == schema.SCHEMA_FINGERPRINT
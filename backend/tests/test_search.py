@@ -0,0 +1,57 @@
+import pytest
+
+from conftest import LOAN_ROWS
+
+
+def _search(client, dataset, **params):
+    query = '&'.join(f"{k}={v}" for k, v in params.items())
+    return client.get(f"/data/search?dataset={dataset}&{query}")
+
+
+def test_substring_search_matches_name_and_city(client, upload):
+    dataset = upload()['id']
+
+    result = _search(client, dataset, q='os').get_json()['result']
+
+    expected = [i for i, row in enumerate(LOAN_ROWS) if 'os' in row[0].lower() or 'os' in row[1].lower()]
+    assert result['ids'] == expected
+    assert result['total'] == len(expected)
+
+
+def test_prefix_search_is_case_insensitive(client, upload):
+    dataset = upload()['id']
+
+    result = _search(client, dataset, q='AUS', match='prefix').get_json()['result']
+
+    assert result['ids'] == [i for i, row in enumerate(LOAN_ROWS) if row[1] == 'Austin']
+
+
+def test_search_can_be_limited_to_one_field(client, upload):
+    dataset = upload()['id']
+
+    by_name = _search(client, dataset, q='e', field='name', match='prefix').get_json()['result']['ids']
+
+    assert by_name == [i for i, row in enumerate(LOAN_ROWS) if row[0].lower().startswith('e')]
+
+
+def test_merged_ids_continue_after_the_normal_rows(client, upload):
+    dataset = upload()['id']
+
+    ids = _search(client, dataset, q='a', mode='merged', per_page=1000).get_json()['result']['ids']
+
+    assert ids == sorted(ids)
+    assert max(ids) >= len(LOAN_ROWS)
+
+
+def test_search_ids_address_data_rows(client, upload):
+    dataset = upload()['id']
+    ids = _search(client, dataset, q='Denver').get_json()['result']['ids']
+
+    rows = client.get(f"/data?dataset={dataset}&per_page=100").get_json()['result']['data']
+
+    assert {rows[i]['city'] for i in ids} == {'Denver'}
+
+
+@pytest.mark.parametrize('params', [{'q': ''}, {'q': 'a', 'field': 'income'}, {'q': 'a', 'per_page': 0}])
+def test_invalid_search_is_rejected(client, upload, params):
+    assert _search(client, upload()['id'], **params).status_code == 400
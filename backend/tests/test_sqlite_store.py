@@ -0,0 +1,113 @@
+from urllib.parse import quote
+
+import pytest
+
+from app.utils.sqlite_store import SqliteStore
+from conftest import LOAN_ROWS, loan_csv
+
+STATS = ['mean', 'sum', 'median', 'mode', 'deviation', 'skewness', 'kurtosis', 'quartiles']
+FILTERS = ['', 'credit_score>=620', 'city in (Austin,Denver)', 'loan_approved=true']
+
+
+@pytest.fixture(scope='module')
+def datasets(app):
+    client = app.test_client()
+    ids = {}
+    for storage in ('memory', 'sqlite'):
+        response = client.post(f"/datasets?storage={storage}", data=loan_csv(), content_type='text/csv')
+        assert response.status_code == 201
+        ids[storage] = response.get_json()['result']['id']
+    return ids
+
+
+def _get(client, stat, dataset, column, flt):
+    url = f"/{stat}?column_name={column}&dataset={dataset}"
+    if flt:
+        url += f"&filter={quote(flt)}"
+    response = client.get(url)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['result']
+
+
+@pytest.mark.parametrize('stat', STATS)
+@pytest.mark.parametrize('flt', FILTERS)
+@pytest.mark.parametrize('column', ['income', 'points'])
+def test_sqlite_matches_pandas(client, datasets, stat, flt, column):
+    expected = _get(client, stat, datasets['memory'], column, flt)
+    actual = _get(client, stat, datasets['sqlite'], column, flt)
+
+    assert actual == pytest.approx(expected, rel=1e-9, nan_ok=True)
+
+
+def test_sqlite_pages_match_pandas(client, datasets):
+    pages = [client.get(f"/data?dataset={datasets[s]}&per_page=3&page=2").get_json()['result']['data'] for s in ('memory', 'sqlite')]
+
+    assert pages[0] == pages[1]
+
+
+def test_sqlite_rejects_unknown_columns(client, datasets):
+    response = client.get(f"/median?column_name=missing&dataset={datasets['sqlite']}")
+
+    assert response.status_code == 400
+
+
+LISTING_ROWS = LOAN_ROWS + [
+    ('Ida Ash', 'Austin', 52000, 700, 14000, 4, '', 'True'),
+    ('Jon Bay', 'Denver', 61000, 655, 21000, 6, '', 'False'),
+]
+
+
+@pytest.fixture(scope='module')
+def listings(app):
+    client = app.test_client()
+    ids = {}
+    for storage in ('memory', 'sqlite'):
+        response = client.post(f"/datasets?storage={storage}", data=loan_csv(LISTING_ROWS), content_type='text/csv')
+        assert response.status_code == 201
+        ids[storage] = response.get_json()['result']['id']
+    return ids
+
+
+def _walk(client, dataset, sort, flt):
+    pages, cursor = [], None
+    while True:
+        url = f"/data?dataset={dataset}&per_page=3&sort={quote(sort)}&filter={quote(flt)}"
+        result = client.get(url + (f"&cursor={cursor}" if cursor else "")).get_json()['result']
+        pages.append(result)
+        cursor = result['next_cursor']
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize('sort', ['', 'points', 'points:desc', 'income:desc', 'city'])
+@pytest.mark.parametrize('flt', ['', 'credit_score>=620', 'city!=Austin'])
+def test_sqlite_listings_match_pandas(client, listings, monkeypatch, sort, flt):
+    expected = _walk(client, listings['memory'], sort, flt)
+    monkeypatch.setattr(SqliteStore, 'get_column', lambda *args, **kwargs: pytest.fail('listing read a whole column'))
+    actual = _walk(client, listings['sqlite'], sort, flt)
+
+    assert [p['data'] for p in actual] == [p['data'] for p in expected]
+    assert [(p['total'], p['page'], p['has_prev'], p['has_next']) for p in actual] == \
+        [(p['total'], p['page'], p['has_prev'], p['has_next']) for p in expected]
+
+    previous = client.get(f"/data?dataset={listings['sqlite']}&per_page=3&sort={quote(sort)}&filter={quote(flt)}"
+                          f"&cursor={actual[-1]['prev_cursor']}").get_json()['result']
+    assert previous['data'] == expected[-2]['data']
+    numbered = client.get(f"/data?dataset={listings['sqlite']}&per_page=3&page=2&sort={quote(sort)}&filter={quote(flt)}")
+    assert numbered.get_json()['result']['data'] == expected[1]['data']
+
+
+def test_sqlite_export_is_pushed_down(client, listings, monkeypatch):
+    url = "/data/export?format=ndjson&sort=points:desc&filter=credit_score%3E%3D620&dataset="
+    expected = client.get(url + listings['memory']).get_data()
+    monkeypatch.setattr(SqliteStore, 'get_column', lambda *args, **kwargs: pytest.fail('export read a whole column'))
+
+    assert client.get(url + listings['sqlite']).get_data() == expected
+
+
+def test_sqlite_filtered_cursor_stays_in_the_listing(client, listings):
+    cursor = client.get(f"/data?dataset={listings['sqlite']}&per_page=3&filter=city%3DAustin").get_json()['result']['next_cursor']
+    other = client.get(f"/data?dataset={listings['sqlite']}&per_page=3&filter=city%3DAustin&cursor={cursor}")
+
+    assert other.status_code == 200
+    assert all(row['city'] == 'Austin' for row in other.get_json()['result']['data'])
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from app.blueprints.StatsBlueprint import StatsCalculatorController
+from conftest import LOAN_ROWS
+
+STATS = ('mean', 'sum', 'quartiles', 'median', 'mode', 'skewness', 'kurtosis', 'deviation')
+
+
+def _batch(client, dataset, body):
+    return client.post(f"/stats/batch?dataset={dataset}", json=body)
+
+
+def test_batch_matches_the_single_endpoints(client, upload):
+    dataset = upload()['id']
+    specs = [{'stat': stat, 'column': column, 'mode': mode}
+             for stat in STATS for column in ('income', 'points') for mode in ('normal', 'merged')]
+
+    response = _batch(client, dataset, specs)
+
+    assert response.status_code == 200, response.get_json()
+    results = response.get_json()['result']
+    assert [(r['stat'], r['column'], r['mode']) for r in results] == [(s['stat'], s['column'], s['mode']) for s in specs]
+    for item in results:
+        assert item['success'], item
+        single = client.get(f"/{item['stat']}?column_name={item['column']}&mode={item['mode']}&dataset={dataset}")
+        expected = single.get_json()['result']
+        if isinstance(expected, dict):
+            assert item['result'] == pytest.approx(expected, rel=1e-12)
+        else:
+            assert item['result'] == pytest.approx(expected, rel=1e-9)
+
+
+def test_batch_with_filters(client, upload):
+    dataset = upload()['id']
+
+    results = _batch(client, dataset, [{'stat': 'sum', 'column': 'income', 'filter': 'city=Austin'}]).get_json()['result']
+
+    assert results[0]['result'] == sum(r[2] for r in LOAN_ROWS if r[1] == 'Austin')
+
+
+def test_requests_body_form_and_dataset_in_body(client, upload):
+    dataset = upload()['id']
+
+    response = client.post("/stats/batch", json={'dataset': dataset, 'requests': [{'stat': 'sum', 'column': 'income'}]})
+
+    assert response.status_code == 200
+    assert response.get_json()['result'][0]['result'] == sum(r[2] for r in LOAN_ROWS)
+
+
+def test_failing_items_do_not_fail_the_batch(client, upload):
+    dataset = upload()['id']
+
+    results = _batch(client, dataset, [{'stat': 'mean', 'column': 'nope'}, {'stat': 'sum', 'column': 'income'}]).get_json()['result']
+
+    assert not results[0]['success'] and 'error' in results[0]
+    assert results[1]['success'] and results[1]['result'] == sum(r[2] for r in LOAN_ROWS)
+
+
+def test_group_sorts_its_column_once(client, upload, monkeypatch):
+    dataset = upload()['id']
+    calls = []
+    sort = np.sort
+    monkeypatch.setattr(np, 'sort', lambda values, *args, **kwargs: calls.append(1) or sort(values, *args, **kwargs))
+
+    specs = [{'stat': stat, 'column': 'income'} for stat in ('quartiles', 'median', 'mode')]
+    specs.append({'stat': 'median', 'column': 'credit_score'})
+    results = _batch(client, dataset, specs).get_json()['result']
+
+    assert all(item['success'] for item in results)
+    assert len(calls) == 2
+
+
+def test_batch_shares_cache_entries_with_single_requests(client, upload):
+    dataset = upload()['id']
+    client.get(f"/median?column_name=income&dataset={dataset}")
+    before = StatsCalculatorController.get_cache_stats()
+
+    _batch(client, dataset, [{'stat': 'median', 'column': 'income'}, {'stat': 'median', 'column': 'income'}])
+
+    after = StatsCalculatorController.get_cache_stats()
+    assert after['hits'] - before['hits'] == 2
+    assert after['misses'] == before['misses']
+
+
+@pytest.mark.parametrize('body, error', [
+    ([], 'non-empty list'),
+    ({'stat': 'mean'}, 'non-empty list'),
+    ('mean', 'non-empty list'),
+    ([{'stat': 'average', 'column': 'income'}], "Request 0: unknown stat"),
+    ([{'stat': 'sum', 'column': 'income'}, {'stat': 'mean'}], "Request 1: missing column"),
+    (['mean'], "Request 0: expected an object"),
+    ([{'stat': 'sum', 'column': 'income'}] * 1001, 'Too many requests'),
+])
+def test_invalid_batches_are_rejected(client, upload, body, error):
+    dataset = upload()['id']
+
+    response = _batch(client, dataset, body)
+
+    assert response.status_code == 400
+    assert error in response.get_json()['error']
+
+
+def test_missing_body_is_rejected(client):
+    assert client.post("/stats/batch", data='not json', content_type='text/plain').status_code == 400
@@ -0,0 +1,93 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.controllers.FilesController import FilesControllerInstance
+from app.utils.stats_cache import StatsCache, freeze
+from app.blueprints.StatsBlueprint import StatsCalculatorController
+from conftest import LOAN_ROWS, loan_csv
+
+
+def test_freeze_makes_results_read_only():
+    frozen = freeze({'Q1': np.float64(1.5), 'values': [np.int64(2), 3]})
+
+    assert frozen == {'Q1': 1.5, 'values': (2, 3)}
+    assert type(frozen['Q1']) is float
+    with pytest.raises(TypeError):
+        frozen['Q1'] = 0.0
+
+
+def test_hit_returns_the_stored_object():
+    cache = StatsCache(max_entries=4)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'Q1': 1.0}
+
+    first = cache.get_or_compute(('loans', 1, 'normal', 'income', 'quartiles', (), ()), compute)
+    second = cache.get_or_compute(('loans', 1, 'normal', 'income', 'quartiles', (), ()), compute)
+
+    assert second is first
+    assert len(calls) == 1
+    assert cache.get_stats()['hits'] == 1
+    assert cache.get_stats()['misses'] == 1
+
+
+def test_value_is_not_stored_when_the_version_moved():
+    cache = StatsCache(max_entries=4)
+
+    value = cache.get_or_compute(('loans', 1, 'normal', 'income', 'mean', (), ()), lambda: 2.0, lambda: 2)
+
+    assert value == 2.0
+    assert cache.get_stats()['entries'] == 0
+
+
+def test_lru_bound():
+    cache = StatsCache(max_entries=2)
+    for version in range(3):
+        cache.get_or_compute(('loans', version, 'normal', 'income', 'mean', (), ()), lambda: 1.0)
+
+    assert cache.get_stats()['entries'] == 2
+
+
+def test_endpoint_hits_and_eps_in_key(client, upload):
+    dataset = upload()['id']
+    before = client.get("/stats/cache").get_json()['result']
+
+    for _ in range(2):
+        assert client.get(f"/quartiles?column_name=income&dataset={dataset}").status_code == 200
+    response = client.get(f"/quartiles?column_name=income&dataset={dataset}&approx=true&eps=0.05")
+    assert response.status_code == 200
+    after = client.get("/stats/cache").get_json()['result']
+
+    assert after['misses'] - before['misses'] == 2
+    assert after['hits'] - before['hits'] == 1
+    assert set(after) == {'entries', 'max_entries', 'hits', 'misses', 'hit_rate'}
+
+
+def test_cached_mapping_serializes(client, upload):
+    dataset = upload()['id']
+
+    first = client.get(f"/quartiles?column_name=income&dataset={dataset}").get_json()['result']
+    second = client.get(f"/quartiles?column_name=income&dataset={dataset}").get_json()['result']
+
+    assert first == second
+    assert first['Q2'] == 55000.0
+
+
+def test_reload_invalidates_entries(upload):
+    dataset = upload()
+    controller = StatsCalculatorController
+    controller.calculate_mean('income', 'normal', dataset['id'], [])
+    key = controller.calculate_mean.cache_key(controller, 'income', 'normal', dataset['id'], [])
+
+    with open(os.path.join(os.environ['UPLOAD_DIR'], f"{dataset['id']}.csv"), 'wb') as f:
+        f.write(loan_csv(LOAN_ROWS[:4]))
+    assert FilesControllerInstance.reload(dataset['id'])
+
+    misses = controller.get_cache_stats()['misses']
+    assert controller.calculate_mean('income', 'normal', dataset['id'], []) == sum(r[2] for r in LOAN_ROWS[:4]) / 4
+    assert controller.get_cache_stats()['misses'] == misses + 1
+    assert controller.calculate_mean.cache_key(controller, 'income', 'normal', dataset['id'], [])[1] > key[1]
@@ -0,0 +1,49 @@
+import uuid
+
+import pytest
+
+from app.controllers.FilesController import FilesControllerInstance
+from conftest import LOAN_ROWS, loan_csv
+
+
+@pytest.fixture()
+def streaming_dataset(tmp_path):
+    name = f"streaming_{uuid.uuid4().hex[:8]}"
+    path = tmp_path / f"{name}.csv"
+    path.write_bytes(loan_csv())
+    FilesControllerInstance.register_dataset(name, str(path), streaming=True)
+    return name
+
+
+def test_streaming_stats_come_from_the_aggregates(client, streaming_dataset):
+    response = client.get(f"/sum?column_name=income&dataset={streaming_dataset}")
+
+    assert response.status_code == 200
+    assert response.get_json()['result'] == sum(row[2] for row in LOAN_ROWS)
+
+
+@pytest.mark.parametrize('endpoint', ['/quartiles', '/median'])
+def test_streaming_quantiles_require_approx(client, streaming_dataset, endpoint):
+    response = client.get(f"{endpoint}?column_name=income&dataset={streaming_dataset}")
+
+    assert response.status_code == 400
+    assert 'approx=true' in response.get_json()['error']
+
+
+def test_streaming_quantiles_reject_an_eps_below_the_sketch_error(client, streaming_dataset):
+    response = client.get(f"/median?column_name=income&dataset={streaming_dataset}&approx=true&eps=0.001")
+
+    assert response.status_code == 400
+
+
+def test_streaming_quantiles_with_approx(client, streaming_dataset):
+    response = client.get(f"/quartiles?column_name=income&dataset={streaming_dataset}&approx=true")
+
+    assert response.status_code == 200
+    incomes = sorted(row[2] for row in LOAN_ROWS)
+    result = response.get_json()['result']
+    assert incomes[0] <= result['Q1'] <= result['Q2'] <= result['Q3'] <= incomes[-1]
+
+
+def test_streaming_dataset_has_no_rows(client, streaming_dataset):
+    assert client.get(f"/data?dataset={streaming_dataset}").status_code == 400
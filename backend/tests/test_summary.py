@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.summary import SUMMARY_STATS, sorted_median, sorted_mode, sorted_quantile, summarize
+
+
+def _frame():
+    rng = np.random.default_rng(7)
+    return pd.DataFrame({
+        'income': rng.integers(20000, 150000, 501).astype(np.int32),
+        'points': np.where(rng.random(501) < 0.1, np.nan, rng.normal(50, 8, 501)),
+        'score': rng.integers(300, 850, 501).astype(np.int16),
+    })
+
+
+def test_summarize_matches_pandas():
+    frame = _frame()
+
+    result = summarize(frame)
+
+    assert set(result) == set(SUMMARY_STATS)
+    for column in frame.columns:
+        series = frame[column]
+        assert result['mean'][column] == pytest.approx(series.mean(), rel=1e-12)
+        assert result['median'][column] == pytest.approx(series.median(), rel=1e-12)
+        assert result['mode'][column] == pytest.approx(series.mode().iloc[0])
+        assert result['sum'][column] == pytest.approx(series.sum(), rel=1e-12)
+        assert result['deviation'][column] == pytest.approx(series.std(), rel=1e-10)
+        assert result['skewness'][column] == pytest.approx(series.skew(), rel=1e-8)
+        assert result['kurtosis'][column] == pytest.approx(series.kurt(), rel=1e-8)
+        for name, q in (('Q1', 0.25), ('Q2', 0.5), ('Q3', 0.75)):
+            assert result[name][column] == pytest.approx(series.quantile(q), rel=1e-12)
+    assert isinstance(result['sum']['income'], int)
+
+
+def test_summarize_empty_column():
+    result = summarize(pd.DataFrame({'points': [np.nan, np.nan]}))
+
+    assert result['mode']['points'] is None
+    assert np.isnan(result['median']['points'])
+
+
+def test_sorted_helpers():
+    ordered = np.array([1.0, 2.0, 2.0, 5.0])
+
+    assert sorted_quantile(ordered, 0.25) == pd.Series(ordered).quantile(0.25)
+    assert sorted_median(ordered) == 2.0
+    assert sorted_mode(ordered) == 2.0
+
+
+def test_summary_endpoint(client, upload):
+    dataset = upload()['id']
+
+    result = client.get(f"/summary?dataset={dataset}").get_json()['result']
+
+    assert result['sum']['income'] == 463000
+    assert result['Q2']['credit_score'] == 657.5
+
+
+def test_summary_rejects_bad_filters(client):
+    assert client.get("/summary?filter=salary>1").status_code == 400
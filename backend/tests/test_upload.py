@@ -0,0 +1,69 @@
+import os
+
+from conftest import LOAN_COLUMNS, LOAN_ROWS, loan_csv
+
+
+def _post(client, body, storage=None):
+    query = f"?storage={storage}" if storage else ""
+    return client.post(f"/datasets{query}", data=body, content_type='text/csv')
+
+
+def _uploads():
+    directory = os.environ['UPLOAD_DIR']
+    return set(os.listdir(directory)) if os.path.isdir(directory) else set()
+
+
+def test_upload_registers_a_dataset(client):
+    response = _post(client, loan_csv())
+
+    assert response.status_code == 201
+    result = response.get_json()['result']
+    assert result['rows'] == len(LOAN_ROWS)
+    assert result['storage'] == 'memory' and result['streaming'] is False
+    names = [d['name'] for d in client.get("/datasets").get_json()['result']]
+    assert result['id'] in names
+    assert client.get(f"/sum?column_name=income&dataset={result['id']}").get_json()['result'] == sum(r[2] for r in LOAN_ROWS)
+
+
+def test_upload_into_sqlite(client):
+    response = _post(client, loan_csv(), storage='sqlite')
+
+    assert response.status_code == 201
+    assert response.get_json()['result']['storage'] == 'sqlite'
+
+
+def test_missing_columns_are_rejected(client):
+    before = _uploads()
+    response = _post(client, b"name;city\nAnn;Austin\n")
+
+    assert response.status_code == 400
+    assert response.get_json()['error'].startswith('Missing columns: income')
+    assert _uploads() == before
+
+
+def test_bad_rows_are_reported_with_their_line(client):
+    rows = list(LOAN_ROWS)
+    rows[2] = rows[2][:2] + ('lots',) + rows[2][3:]
+    response = _post(client, loan_csv(rows))
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == "Row 4: column 'income' must be numeric, got 'lots'"
+
+
+def test_unknown_approval_flags_are_rejected(client):
+    rows = [LOAN_ROWS[0][:-1] + ('maybe',)]
+    response = _post(client, loan_csv(rows))
+
+    assert response.status_code == 400
+    assert "column 'loan_approved' must be a boolean" in response.get_json()['error']
+
+
+def test_empty_uploads_are_rejected(client):
+    assert _post(client, b"").status_code == 400
+    assert _post(client, (';'.join(LOAN_COLUMNS) + '\n').encode()).status_code == 400
+
+
+def test_unknown_storage_is_rejected(client):
+    response = _post(client, loan_csv(), storage='redis')
+
+    assert response.status_code == 400
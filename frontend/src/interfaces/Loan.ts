@@ -24,6 +24,8 @@ export interface PaginatedData {
   total: number;
   per_page: number;
   page: number;
+  next_cursor?: string | null;
+  prev_cursor?: string | null;
 }
 
 export type LoansResponse = ApiResponse<Loan[]>;